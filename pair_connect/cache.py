@@ -0,0 +1,143 @@
+"""
+Per-model cache generations.
+
+Every tracked model has a generation token in the configured cache backend, replaced whenever
+one of its rows is saved or deleted or one of its many-to-many relations changes. Keys built
+from the generations of the models a value was read from stop matching as soon as any of them
+changes, in every worker sharing the cache.
+
+Generations are random tokens rather than counters, so values held outside the cache, such as
+in-process snapshots, can never match a generation issued after the cache was flushed.
+
+Anywhere a model is expected, a name such as 'users.skill_index' may be given instead, for
+state that is not a single model, like in-process indexes, and is renewed or bumped explicitly.
+"""
+import functools
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+GENERATION_KEY = 'generation:{label}'
+
+_ignored_update_fields = {}
+_missing = object()
+
+
+def _key(model):
+    label = model if isinstance(model, str) else model._meta.label_lower
+    return GENERATION_KEY.format(label=label)
+
+
+def _new_generation():
+    return uuid.uuid4().hex[:12]
+
+
+def get_generations(*models):
+    """Returns the current generation of each model, in order, in one cache round trip."""
+    keys = [_key(model) for model in models]
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_generation(), timeout=None)
+        generations.update(cache.get_many(missing))
+    return tuple(generations[key] for key in keys)
+
+
+def renew(*models):
+    """
+    Starts new generations for the given models right away and returns them, in order. For
+    changes that are already committed; use bump() inside transactions.
+    """
+    generations = {_key(model): _new_generation() for model in models}
+    cache.set_many(generations, timeout=None)
+    return tuple(generations.values())
+
+
+def bump(*models):
+    """
+    Starts new generations for the given models.
+
+    They are replaced again when the transaction commits, so values cached by readers inside
+    the transaction, which may have seen uncommitted rows, are never served afterwards.
+    """
+    models = set(models)
+    renew(*models)
+    transaction.on_commit(lambda: renew(*models))
+
+
+def make_key(prefix, models, *parts):
+    """Builds a cache key for a value identified by `parts` and read from `models`."""
+    generations = '.'.join(get_generations(*models))
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f'{prefix}:{generations}:{digest}'
+
+
+def _bump_on_save(sender, update_fields=None, **kwargs):
+    ignored = _ignored_update_fields.get(sender)
+    if ignored and update_fields and set(update_fields) <= ignored:
+        return
+    bump(sender)
+
+
+def _bump_on_delete(sender, **kwargs):
+    bump(sender)
+
+
+def _bump_on_m2m_change(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump(type(instance), model)
+
+
+def track(*models, ignore_update_fields=()):
+    """
+    Bumps the models' generations on post_save, post_delete and changes to their
+    many-to-many fields. Called from AppConfig.ready().
+
+    :param ignore_update_fields: saves limited to these fields, such as last_login, keep
+        the generation
+    """
+    for model in models:
+        label = model._meta.label_lower
+        if ignore_update_fields:
+            _ignored_update_fields[model] = set(ignore_update_fields)
+        post_save.connect(_bump_on_save, sender=model, dispatch_uid=f'generation_save:{label}')
+        post_delete.connect(_bump_on_delete, sender=model, dispatch_uid=f'generation_delete:{label}')
+        for field in model._meta.many_to_many:
+            m2m_changed.connect(
+                _bump_on_m2m_change,
+                sender=field.remote_field.through,
+                dispatch_uid=f'generation_m2m:{label}.{field.name}',
+            )
+
+
+def memoize(*models, key=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Caches a function's results until any of `models` changes.
+
+    :param key: callable receiving the function's arguments and returning what identifies
+        the result, e.g. lambda self, limit: (self.session.id, limit) for a service method.
+        Defaults to the arguments themselves.
+    :param timeout: cache timeout, the backend default when omitted
+    """
+    def decorator(func):
+        prefix = f'memoize:{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = key(*args, **kwargs) if key else (args, sorted(kwargs.items()))
+            cache_key = make_key(prefix, models, parts)
+            result = cache.get(cache_key, _missing)
+            if result is _missing:
+                result = func(*args, **kwargs)
+                cache.set(cache_key, result, timeout=timeout)
+            return result
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
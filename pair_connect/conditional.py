@@ -0,0 +1,76 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Answers list and detail reads with ETag and Last-Modified headers, and with 304 Not
+    Modified when the client's copy is still current.
+
+    Freshness comes from a MAX(updated_at)/COUNT(*) probe over the rows the view would
+    render, so an unchanged response is never loaded or serialized. Models keep updated_at
+    current through save(), touch() and the signals that call it on many-to-many changes.
+    The ETag is authoritative: Last-Modified only has one second precision.
+    """
+
+    last_modified_field = 'updated_at'
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_freshness(self, detail=False):
+        queryset = self.get_conditional_queryset().order_by()
+        if detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset.aggregate(last_modified=Max(self.last_modified_field), count=Count('pk'))
+
+    def get_etag(self, freshness):
+        last_modified = freshness['last_modified']
+        version = ':'.join(str(part) for part in (
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+            self.request.user.pk,
+            freshness['count'],
+            last_modified.isoformat() if last_modified else '',
+        ))
+        return f'W/"{hashlib.md5(version.encode()).hexdigest()}"'
+
+    @staticmethod
+    def get_last_modified_timestamp(freshness):
+        last_modified = freshness['last_modified']
+        if last_modified is None:
+            return None
+        if timezone.is_naive(last_modified):
+            last_modified = timezone.make_aware(last_modified)
+        return int(last_modified.timestamp())
+
+    def conditional_get(self, request, handler, detail, *args, **kwargs):
+        freshness = self.get_freshness(detail)
+        if detail and not freshness['count']:
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(freshness)
+        last_modified = self.get_last_modified_timestamp(freshness)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Responses depend on the user, and polling clients must revalidate every time
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(request, super().list, False, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(request, super().retrieve, True, *args, **kwargs)
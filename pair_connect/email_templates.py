@@ -0,0 +1,33 @@
+"""
+Startup warming for email templates.
+
+The cached template loader compiles each template once per process. Loading the email
+templates when an app is ready moves that compile, and the search through every template
+directory, out of the first request that sends an email.
+"""
+import os
+
+from django.template.loader import get_template
+
+EMAIL_TEMPLATE_DIR = 'emails'
+EMAIL_TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def find_email_templates(templates_dir):
+    """Returns the template names of the emails under `templates_dir`, e.g. 'emails/x.html'."""
+    emails_dir = os.path.join(templates_dir, EMAIL_TEMPLATE_DIR)
+    if not os.path.isdir(emails_dir):
+        return []
+    return sorted(
+        f'{EMAIL_TEMPLATE_DIR}/{name}'
+        for name in os.listdir(emails_dir)
+        if name.endswith(EMAIL_TEMPLATE_EXTENSIONS)
+    )
+
+
+def warm_email_templates(templates_dir):
+    """Compiles the email templates under `templates_dir` into the cached loader."""
+    names = find_email_templates(templates_dir)
+    for name in names:
+        get_template(name)
+    return names
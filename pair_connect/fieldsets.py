@@ -0,0 +1,66 @@
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_field_names(value):
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Lets clients trim a serializer's output with ?fields=a,b or ?omit=c,d on read requests.
+
+    Only the serializer a view renders reads the query string; serializers nested inside it
+    keep all their fields. Callers can also pass fields= or omit= directly.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if fields is None and omit is None and request is not None and request.method in SAFE_METHODS:
+            fields = parse_field_names(request.query_params.get(FIELDS_PARAM))
+            omit = parse_field_names(request.query_params.get(OMIT_PARAM))
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+
+def requested_fields(request, serializer_class):
+    """
+    Returns the names of the fields serializer_class renders for this request, or None when
+    the client did not ask for a sparse fieldset.
+    """
+    params = request.query_params
+    if request.method not in SAFE_METHODS or (FIELDS_PARAM not in params and OMIT_PARAM not in params):
+        return None
+    return rendered_fields(request, serializer_class)
+
+
+def rendered_fields(request, serializer_class):
+    """Returns the names of the fields serializer_class renders for this request."""
+    serializer = serializer_class(context={'request': request})
+    return {name for name, field in serializer.fields.items() if not field.write_only}
+
+
+def only_serialized(queryset, fields, columns, required=('id',)):
+    """
+    Restricts a queryset to the columns and joins the given serializer fields read.
+
+    :param fields: serializer field names to render
+    :param columns: {serializer field name: model field paths it reads}, "stack__name" style
+        paths are loaded with select_related
+    :param required: model fields always loaded, e.g. ones read by to_representation
+    """
+    paths = set(required)
+    for field in fields:
+        paths.update(columns.get(field, ()))
+    related = {path.split('__')[0] for path in paths if '__' in path}
+    return queryset.select_related(*related).only(*paths, *related)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Cursor pagination used by every list endpoint.
+
+    Views set `cursor_ordering` to a unique, stable ordering such as ('-schedule_date_time', 'id');
+    views over small lookup tables opt out with `pagination_class = None`.
+    """
+
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering:
+            return tuple(ordering)
+        return super().get_ordering(request, queryset, view)
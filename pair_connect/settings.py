@@ -44,7 +44,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'pair_connect.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', 20)),
 }
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 100))
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -82,8 +85,15 @@ TEMPLATES = [
             os.path.join(BASE_DIR, 'users', 'templates'),
             os.path.join(BASE_DIR, 'projects', 'templates'),
         ],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Explicit so compiled templates are reused in every environment; email templates
+            # are warmed into it by the apps' ready()
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -111,6 +121,13 @@ DATABASES = {
 if 'DATABASE_URL' in os.environ:
     DATABASES['default'] = dj_database_url.config(conn_max_age=600, ssl_require=True)
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND') or 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': os.getenv('CACHE_LOCATION') or 'pair-connect',
+    }
+}
+
 STATIC_URL = '/static/'
 
 CLOUDINARY_STORAGE = {
@@ -173,7 +190,7 @@ DJOSER = {
     'SERIALIZERS': {
         'user_create': 'users.serializers.CustomUserCreateSerializer',
         'user': 'users.serializers.CustomUserSerializer',
-        'current_user': 'users.serializers.CustomUserSerializer',
+        'current_user': 'users.serializers.CurrentUserSerializer',
     },
     'EMAIL': {
         'activation': 'users.email_service.ActivationEmail',
@@ -197,5 +214,22 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))
+EMAIL_OUTBOX_WORKERS = int(os.getenv('EMAIL_OUTBOX_WORKERS', 4))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_RETRY_SECONDS = int(os.getenv('EMAIL_OUTBOX_RETRY_SECONDS', 60))
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', 300))
+INTEREST_DIGEST_INTERVAL_SECONDS = int(os.getenv('INTEREST_DIGEST_INTERVAL_SECONDS', 3600))
+
+DEVELOPER_SUGGESTION_ENGINE = os.getenv('DEVELOPER_SUGGESTION_ENGINE', 'index')
+SKILL_INDEX_MAX_AGE = int(os.getenv('SKILL_INDEX_MAX_AGE', 300))
+SKILLS_TAXONOMY_MAX_AGE = int(os.getenv('SKILLS_TAXONOMY_MAX_AGE', 3600))
+SUGGESTED_DEVELOPERS_MAX_LIMIT = 50
+SUGGESTION_BATCH_MAX_SESSIONS = 50
+SESSION_INVITE_MAX_DEVELOPERS = 50
+SUGGESTED_DEVELOPERS_CACHE_TIMEOUT = int(os.getenv('SUGGESTED_DEVELOPERS_CACHE_TIMEOUT', 600))
+SUGGESTED_SESSIONS_MAX_PAGE_SIZE = 50
+ANONYMOUS_RESPONSE_CACHE_TIMEOUT = int(os.getenv('ANONYMOUS_RESPONSE_CACHE_TIMEOUT', 60))
+FAST_READ_SERIALIZATION = os.getenv('FAST_READ_SERIALIZATION', 'true').lower() == 'true'
 
 django_heroku.settings(locals())
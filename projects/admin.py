@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project, Session, InterestedParticipant
+from .models import Project, Session, InterestedParticipant, OutboxEmail
 
 
 class ProjectAdmin(admin.ModelAdmin):
@@ -62,3 +62,14 @@ class InterestedParticipantAdmin(admin.ModelAdmin):
 admin.site.register(Project, ProjectAdmin)
 admin.site.register(Session, SessionAdmin)
 admin.site.register(InterestedParticipant, InterestedParticipantAdmin)
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'subject', 'status', 'attempts', 'available_at', 'created_at', 'sent_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('subject', 'to')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
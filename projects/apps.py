@@ -1,6 +1,17 @@
+import os
+
 from django.apps import AppConfig
 
 
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        from pair_connect.cache import track
+        from pair_connect.email_templates import warm_email_templates
+        from . import signals  # noqa: F401
+        from .models import InterestedParticipant, Project, Session
+
+        track(Project, Session, InterestedParticipant)
+        warm_email_templates(os.path.join(self.path, 'templates'))
@@ -0,0 +1,70 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db.models import DateTimeField, ExpressionWrapper, F
+
+from .models import Session
+
+
+class SessionIntervalIndex:
+    """
+    Per-developer index of the sessions they are confirmed for, as host or participant.
+
+    Each developer's sessions are kept sorted by start time together with the running
+    maximum of their end times, so checking whether a developer is busy during a window
+    is a binary search instead of a query per developer.
+    """
+
+    def __init__(self, intervals=()):
+        """
+        :param intervals: iterable of (user_id, start, end)
+        """
+        grouped = defaultdict(list)
+        for user_id, start, end in intervals:
+            grouped[user_id].append((start, end))
+
+        self._starts = {}
+        self._max_ends = {}
+        for user_id, user_intervals in grouped.items():
+            user_intervals.sort()
+            max_ends, latest = [], None
+            for _, end in user_intervals:
+                latest = end if latest is None or end > latest else latest
+                max_ends.append(latest)
+            self._starts[user_id] = [start for start, _ in user_intervals]
+            self._max_ends[user_id] = max_ends
+
+    @classmethod
+    def for_window(cls, start, end, exclude_session_ids=()):
+        """
+        Builds the index from every active session overlapping [start, end) in one query.
+        """
+        sessions = Session.objects.annotate(
+            end_time=ExpressionWrapper(F('schedule_date_time') + F('duration'), output_field=DateTimeField())
+        ).filter(
+            active=True,
+            schedule_date_time__lt=end,
+            end_time__gt=start,
+        ).exclude(
+            id__in=list(exclude_session_ids)
+        ).values_list('id', 'host_id', 'schedule_date_time', 'end_time', 'participants')
+
+        intervals = set()
+        for session_id, host_id, session_start, session_end, participant_id in sessions:
+            for user_id in (host_id, participant_id):
+                if user_id is not None:
+                    intervals.add((user_id, session_id, session_start, session_end))
+        return cls((user_id, session_start, session_end) for user_id, _, session_start, session_end in intervals)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def is_busy(self, user_id, start, end):
+        starts = self._starts.get(user_id)
+        if not starts:
+            return False
+        position = bisect_left(starts, end)
+        return position > 0 and self._max_ends[user_id][position - 1] > start
+
+    def busy_user_ids(self, start, end):
+        return {user_id for user_id in self._starts if self.is_busy(user_id, start, end)}
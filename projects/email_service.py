@@ -1,91 +1,196 @@
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
 from django.conf import settings
 
+from .models import OutboxEmail
+
 
 class EmailService:
-    @staticmethod
-    def send_invite_email(session, developer):
-        try:
-            owner = session.project.owner
-            subject = f"¡{owner.username} te invita a una sesión de programación!"
+    """
+    Renders notification emails and queues them in the outbox.
 
-            context = {
-                'developer_name': developer.username,
-                'owner_name': owner.username,
-                'session_description': session.description,
-                'session_date': session.schedule_date_time.strftime("%d-%m-%Y %H:%M"),
-                'session_link': f"http://localhost:5173/sessions/{session.id}/",
-            }
+    Nothing is sent inside the request: the send_outbox_emails command delivers queued
+    emails, so callers should queue them in the same transaction as the change they announce.
+    """
 
-            html_content = render_to_string('emails/invite_developer_email.html', context)
-            text_content = render_to_string('emails/invite_developer_email.txt', context)
+    INVITE = 'invite'
+    INTEREST_NOTIFICATION = 'interest_notification'
+    CONFIRMATION = 'confirmation'
+    INTEREST_DIGEST = 'interest_digest'
 
+    @staticmethod
+    def build_emails(template, subject, context, recipients):
+        """
+        Renders one email per recipient, loading and compiling the templates once.
+
+        :param context: values shared by every recipient
+        :param recipients: iterable of (context for this recipient, list of addresses)
+        """
+        html_template = get_template(f'emails/{template}.html')
+        text_template = get_template(f'emails/{template}.txt')
+
+        emails = []
+        for recipient_context, to in recipients:
+            recipient_context = {**context, **recipient_context}
             email = EmailMultiAlternatives(
                 subject,
-                text_content,
+                text_template.render(recipient_context),
                 settings.DEFAULT_FROM_EMAIL,
-                [developer.email]
+                to
             )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+            email.attach_alternative(html_template.render(recipient_context), "text/html")
+            emails.append(email)
+        return emails
 
-        except Exception as e:
-            raise Exception(f"Error sending invite email: {str(e)}")
+    @staticmethod
+    def build_email(template, subject, context, to):
+        return EmailService.build_emails(template, subject, context, [({}, to)])[0]
 
     @staticmethod
-    def send_interest_notification_email(session, interested_user):
+    def deliver(messages, connection=None):
+        """
+        Sends prepared messages over one connection instead of one connection per message.
+
+        Messages go through send_messages one at a time so each gets its own outcome. After a
+        failure the connection is reopened before the next message, since the server may have
+        dropped it.
+
+        :return: one entry per message, None when it was sent or the exception it raised
+        """
+        connection = connection or get_connection()
+        errors = []
         try:
-            subject = f"¡{interested_user.username} está interesadx en tu sesión!"
+            connection.open()
+            for message in messages:
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    errors.append(e)
+                    connection.close()
+                    connection.open()
+                else:
+                    errors.append(None)
+        except Exception as e:
+            errors.extend([e] * (len(messages) - len(errors)))
+        finally:
+            connection.close()
+        return errors
 
-            context = {
-                'owner_name': session.project.owner.username,
-                'interested_user': interested_user.username,
-                'session_name': session.name,
+    @staticmethod
+    def build_invite_emails(session, developers):
+        owner = session.project.owner
+        subject = f"¡{owner.username} te invita a una sesión de programación!"
+
+        context = {
+            'owner_name': owner.username,
+            'session_description': session.description,
+            'session_date': session.schedule_date_time.strftime("%d-%m-%Y %H:%M"),
+            'session_link': f"http://localhost:5173/sessions/{session.id}/",
+        }
+        return EmailService.build_emails(
+            'invite_developer_email',
+            subject,
+            context,
+            [({'developer_name': developer.username}, [developer.email]) for developer in developers],
+        )
+
+    @staticmethod
+    def build_invite_email(session, developer):
+        return EmailService.build_invite_emails(session, [developer])[0]
+
+    @staticmethod
+    def build_interest_notification_email(session, interested_user):
+        subject = f"¡{interested_user.username} está interesadx en tu sesión!"
+
+        context = {
+            'owner_name': session.project.owner.username,
+            'interested_user': interested_user.username,
+            'session_name': session.name,
+
+            'session_link': f"http://localhost:5173/projects/{session.project.id}/sessions/{session.id}/",
+        }
+        return EmailService.build_email(
+            'interest_notification_email', subject, context, [session.project.owner.email]
+        )
 
-                'session_link': f"http://localhost:5173/projects/{session.project.id}/sessions/{session.id}/",
+    @staticmethod
+    def build_interest_digest_emails(digests):
+        """
+        :param digests: list of (owner, [(session, [interested users])]), one email per owner
+        """
+        subject = "¡Hay nuevxs interesadxs en tus sesiones!"
+
+        recipients = []
+        for owner, sessions in digests:
+            context = {
+                'owner_name': owner.username,
+                'interest_count': sum(len(users) for _, users in sessions),
+                'sessions': [
+                    {
+                        'name': session.name,
+                        'link': f"http://localhost:5173/projects/{session.project_id}/sessions/{session.id}/",
+                        'interested_users': [user.username for user in users],
+                    }
+                    for session, users in sessions
+                ],
             }
+            recipients.append((context, [owner.email]))
+        return EmailService.build_emails('interest_digest_email', subject, {}, recipients)
 
-            html_content = render_to_string('emails/interest_notification_email.html', context)
-            text_content = render_to_string('emails/interest_notification_email.txt', context)
+    @staticmethod
+    def build_confirmation_email(session, developer):
+        subject = f"¡Has sido confirmadx para la sesión de {session.name}!"
+
+        context = {
+            'developer_name': developer.username,
+            'session_name': session.name,
+            'session_description': session.description,
+            'session_date': session.schedule_date_time.strftime("%d-%m-%Y %H:%M"),
+            'session_link': f"http://localhost:5173/sessions/{session.id}/",
+        }
+        return EmailService.build_email('confirmation_email', subject, context, [developer.email])
 
-            email = EmailMultiAlternatives(
-                subject,
-                text_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [session.project.owner.email]
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+    @staticmethod
+    def send_invite_email(session, developer):
+        try:
+            email = EmailService.build_invite_email(session, developer)
+            return OutboxEmail.objects.enqueue(email, EmailService.INVITE)
 
         except Exception as e:
-            raise Exception(f"Error sending interest notification email: {str(e)}")
+            raise Exception(f"Error queueing invite email: {str(e)}")
 
+    @staticmethod
+    def send_invite_emails(session, developers):
+        try:
+            emails = EmailService.build_invite_emails(session, developers)
+            return OutboxEmail.objects.enqueue_many(emails, EmailService.INVITE)
+
+        except Exception as e:
+            raise Exception(f"Error queueing invite emails: {str(e)}")
 
     @staticmethod
-    def send_confirmation_email(session, developer):
+    def send_interest_notification_email(session, interested_user):
         try:
-            subject = f"¡Has sido confirmadx para la sesión de {session.name}!"
+            email = EmailService.build_interest_notification_email(session, interested_user)
+            return OutboxEmail.objects.enqueue(email, EmailService.INTEREST_NOTIFICATION)
 
-            context = {
-                'developer_name': developer.username,
-                'session_name': session.name,
-                'session_description': session.description,
-                'session_date': session.schedule_date_time.strftime("%d-%m-%Y %H:%M"),
-                'session_link': f"http://localhost:5173/sessions/{session.id}/",
-            }
+        except Exception as e:
+            raise Exception(f"Error queueing interest notification email: {str(e)}")
 
-            html_content = render_to_string('emails/confirmation_email.html', context)
-            text_content = render_to_string('emails/confirmation_email.txt', context)
+    @staticmethod
+    def send_interest_digest_emails(digests):
+        try:
+            emails = EmailService.build_interest_digest_emails(digests)
+            return OutboxEmail.objects.enqueue_many(emails, EmailService.INTEREST_DIGEST)
 
-            email = EmailMultiAlternatives(
-                subject,
-                text_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [developer.email]
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+        except Exception as e:
+            raise Exception(f"Error queueing interest digest emails: {str(e)}")
+
+    @staticmethod
+    def send_confirmation_email(session, developer):
+        try:
+            email = EmailService.build_confirmation_email(session, developer)
+            return OutboxEmail.objects.enqueue(email, EmailService.CONFIRMATION)
 
         except Exception as e:
-            raise Exception(f"Error sending confirmation email: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error queueing confirmation email: {str(e)}")
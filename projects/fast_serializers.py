@@ -0,0 +1,206 @@
+"""
+Read-only fast path for the hottest list endpoints.
+
+Builds the same dicts SessionSerializer, ProjectListSerializer and ProjectSerializer render,
+key order and omitted keys included, straight from values() rows with many-to-many ids and
+names aggregated into arrays by the database, so no serializer or model instance is created
+per row.
+"""
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import connection
+from django.db.models import OuterRef
+from rest_framework import serializers
+
+from pair_connect.fieldsets import FIELDS_PARAM, OMIT_PARAM
+from skills.models import ProgLanguage
+from users.models import CustomUser
+
+from .models import Project, Session
+
+CLOUDINARY_BASE_URL = "https://res.cloudinary.com/dwzqcmaod/image/upload/"
+SUGGESTION_FIELDS = ("participant_count", "is_full", "is_participant", "is_interested")
+
+_datetime_field = serializers.DateTimeField()
+_duration_field = serializers.DurationField()
+_photo_field = CustomUser._meta.get_field("photo")
+_image_field = Project._meta.get_field("image")
+
+
+def can_use_fast_path(request):
+    """
+    The fast path renders full representations only, so sparse and summary requests skip it,
+    and aggregates with ArraySubquery, so it is only taken on PostgreSQL.
+    """
+    params = request.query_params
+    return (
+        settings.FAST_READ_SERIALIZATION
+        and connection.vendor == "postgresql"
+        and not {FIELDS_PARAM, OMIT_PARAM, "view"} & set(params)
+    )
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _language_names(owner):
+    return ArraySubquery(
+        ProgLanguage.objects.filter(**{owner: OuterRef("pk")}).order_by("id").values("name")
+    )
+
+
+def _photo(photo):
+    # ModelField renders the stored value, which CustomUserSerializer then turns into a URL
+    if photo is None:
+        return None
+    if photo:
+        photo_url = str(photo)
+        return photo_url if photo_url.startswith("http") else f"{CLOUDINARY_BASE_URL}{photo_url}"
+    return _photo_field.get_prep_value(photo)
+
+
+def serialize_users(user_ids):
+    """Returns {user id: CustomUserSerializer data} for the given users."""
+    rows = CustomUser.objects.filter(id__in=user_ids).values(
+        "id", "username", "email", "name", "photo", "about_me", "telephone", "linkedin_link",
+        "github_link", "discord_link", "stack_id", "stack__name", "level_id", "level__name",
+    ).annotate(
+        language_ids=ArraySubquery(
+            ProgLanguage.objects.filter(customuser=OuterRef("pk")).order_by("id").values("id")
+        ),
+        language_names=_language_names("customuser"),
+    )
+
+    users = {}
+    for row in rows:
+        data = {
+            "id": row["id"],
+            "username": _text(row["username"]),
+            "email": _text(row["email"]),
+            "name": _text(row["name"]),
+            "photo": _photo(row["photo"]),
+            "about_me": _text(row["about_me"]),
+            "telephone": _text(row["telephone"]),
+            "linkedin_link": _text(row["linkedin_link"]),
+            "github_link": _text(row["github_link"]),
+            "discord_link": _text(row["discord_link"]),
+            "stack": row["stack_id"],
+        }
+        if row["stack_id"] is not None:
+            data["stack_name"] = _text(row["stack__name"])
+        data["level"] = row["level_id"]
+        data["prog_language"] = row["language_ids"]
+        data["language_names"] = row["language_names"]
+        if row["level_id"] is not None:
+            data["level_name"] = _text(row["level__name"])
+        users[row["id"]] = data
+    return users
+
+
+def serialize_sessions(session_ids, extra_fields=None):
+    """
+    Returns SessionSerializer data for the given sessions, in the order of session_ids.
+
+    :param extra_fields: {session id: {field: value}} rendered after the serializer fields,
+        as SuggestedSessionSerializer does for its annotations
+    """
+    rows = Session.objects.filter(id__in=session_ids).values(
+        "id", "name", "description", "schedule_date_time", "duration", "stack_id", "stack__name",
+        "level_id", "level__name", "project_id", "project__name", "project__image", "host_id",
+        "host__username", "host__photo", "session_link", "participant_limit", "public",
+    ).annotate(
+        language_names=_language_names("session"),
+        participant_ids=ArraySubquery(
+            Session.participants.through.objects.filter(
+                session_id=OuterRef("pk")
+            ).order_by("customuser_id").values("customuser_id")
+        ),
+    )
+    rows = {row["id"]: row for row in rows}
+    users = serialize_users({user_id for row in rows.values() for user_id in row["participant_ids"]})
+
+    sessions = []
+    for session_id in session_ids:
+        row = rows.get(session_id)
+        if row is None:
+            continue
+        data = {
+            "id": row["id"],
+            "name": _text(row["name"]),
+            "description": _text(row["description"]),
+            "schedule_date_time": _datetime_field.to_representation(row["schedule_date_time"]),
+            "duration": _duration_field.to_representation(row["duration"]),
+        }
+        if row["stack_id"] is not None:
+            data["stack_name"] = _text(row["stack__name"])
+        if row["level_id"] is not None:
+            data["level_name"] = _text(row["level__name"])
+        data["language_names"] = row["language_names"]
+        data["project_id"] = row["project_id"]
+        data["project_name"] = _text(row["project__name"])
+        image = row["project__image"]
+        data["project_image_url"] = f"{CLOUDINARY_BASE_URL}{image}" if image else None
+        data["owner_id"] = row["host_id"]
+        if row["host_id"] is not None:
+            data["owner_name"] = _text(row["host__username"])
+            if row["host__photo"] is not None:
+                data["owner_avatar_url"] = row["host__photo"].url
+        data["participants"] = [users[user_id] for user_id in row["participant_ids"]]
+        data["session_link"] = _text(row["session_link"])
+        data["participant_limit"] = row["participant_limit"]
+        data["public"] = row["public"]
+        if extra_fields:
+            data.update(extra_fields.get(session_id, {}))
+        data["is_private"] = not row["public"]
+        sessions.append(data)
+    return sessions
+
+
+def serialize_projects(project_ids, include_sessions=False):
+    """
+    Returns ProjectListSerializer data for the given projects, in the order of project_ids,
+    or ProjectSerializer data when include_sessions is set.
+    """
+    rows = Project.objects.filter(id__in=project_ids).values(
+        "id", "name", "description", "image", "stack__name", "level__name", "owner_id",
+        "owner__username", "owner__photo",
+    ).annotate(
+        language_names=_language_names("project"),
+    )
+    rows = {row["id"]: row for row in rows}
+
+    sessions_by_project = {}
+    if include_sessions:
+        session_projects = dict(
+            Session.objects.filter(project_id__in=project_ids).order_by("id").values_list("id", "project_id")
+        )
+        for session in serialize_sessions(list(session_projects)):
+            sessions_by_project.setdefault(session_projects[session["id"]], []).append(session)
+
+    projects = []
+    for project_id in project_ids:
+        row = rows.get(project_id)
+        if row is None:
+            continue
+        image = row["image"]
+        data = {
+            "id": row["id"],
+            "name": _text(row["name"]),
+            "description": _text(row["description"]),
+            "image": None if image is None else _image_field.get_prep_value(image),
+            "stack_name": _text(row["stack__name"]),
+            "language_names": row["language_names"],
+            "level_name": _text(row["level__name"]),
+        }
+        if image is not None:
+            data["image_url"] = _text(image.url)
+        data["owner_id"] = row["owner_id"]
+        if row["owner_id"] is not None:
+            data["owner_name"] = _text(row["owner__username"])
+        photo = row["owner__photo"]
+        data["owner_avatar_url"] = f"{CLOUDINARY_BASE_URL}{photo}" if row["owner_id"] is not None and photo else None
+        if include_sessions:
+            data["sessions"] = sessions_by_project.get(project_id, [])
+        projects.append(data)
+    return projects
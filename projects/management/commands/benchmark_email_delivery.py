@@ -0,0 +1,65 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from projects.email_service import EmailService
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares messages/sec of one connection per message against EmailService.deliver. "
+        "Uses the locmem backend unless --smtp points at a local SMTP server, "
+        "e.g. `python -m smtpd -n -c DebuggingServer localhost:1025`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=200)
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument(
+            '--smtp',
+            metavar='HOST:PORT',
+            default=None,
+            help="Send through a plain SMTP server instead of the locmem backend.",
+        )
+
+    def handle(self, *args, **options):
+        messages = [
+            EmailService.build_email(
+                'confirmation_email',
+                f"¡Has sido confirmadx para la sesión {number}!",
+                {
+                    'developer_name': f'benchmark-{number}',
+                    'session_name': f'Benchmark session {number}',
+                    'session_description': 'Pair programming benchmark session.',
+                    'session_date': '01-01-2030 12:00',
+                    'session_link': f"http://localhost:5173/sessions/{number}/",
+                },
+                [f'benchmark-{number}@example.com'],
+            )
+            for number in range(options['messages'])
+        ]
+        connect = self.connection_factory(options['smtp'])
+
+        cases = [
+            ('connection per message', lambda: [connect().send_messages([message]) for message in messages]),
+            ('batched (EmailService.deliver)', lambda: EmailService.deliver(messages, connection=connect())),
+        ]
+        rates = []
+        for name, send in cases:
+            started = time.perf_counter()
+            for _ in range(options['runs']):
+                send()
+            rates.append(len(messages) * options['runs'] / (time.perf_counter() - started))
+            self.stdout.write(f"{name}: {rates[-1]:,.0f} messages/s")
+        self.stdout.write(f"batched speedup: {rates[1] / rates[0]:.1f}x")
+
+    @staticmethod
+    def connection_factory(smtp):
+        if not smtp:
+            return lambda: get_connection('django.core.mail.backends.locmem.EmailBackend')
+        host, port = smtp.rsplit(':', 1)
+        return lambda: get_connection(
+            'django.core.mail.backends.smtp.EmailBackend',
+            host=host, port=int(port), use_tls=False, use_ssl=False, username='', password='',
+        )
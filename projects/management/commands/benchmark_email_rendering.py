@@ -0,0 +1,94 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Engine, engines
+from django.template.loader import get_template
+
+EMAIL_TYPES = {
+    'invite': ('emails/invite_developer_email', {
+        'developer_name': 'developer',
+        'owner_name': 'host',
+        'session_description': 'Pair programming on the matching engine.',
+        'session_date': '01-01-2030 12:00',
+        'session_link': 'http://localhost:5173/sessions/1/',
+    }),
+    'interest_notification': ('emails/interest_notification_email', {
+        'owner_name': 'host',
+        'interested_user': 'developer',
+        'session_name': 'Matching engine',
+        'session_link': 'http://localhost:5173/projects/1/sessions/1/',
+    }),
+    'interest_digest': ('emails/interest_digest_email', {
+        'owner_name': 'host',
+        'interest_count': 3,
+        'sessions': [
+            {
+                'name': f'Matching engine {number}',
+                'link': f'http://localhost:5173/projects/1/sessions/{number}/',
+                'interested_users': ['developer', 'reviewer', 'tester'][:number],
+            }
+            for number in (1, 2)
+        ],
+    }),
+    'confirmation': ('emails/confirmation_email', {
+        'developer_name': 'developer',
+        'session_name': 'Matching engine',
+        'session_description': 'Pair programming on the matching engine.',
+        'session_date': '01-01-2030 12:00',
+        'session_link': 'http://localhost:5173/sessions/1/',
+    }),
+    'activation': ('emails/activation_email', {
+        'user': {'username': 'developer'},
+        'activation_url': 'http://localhost:5173/activate/MQ/token/',
+    }),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports renders/sec of the HTML and text variants of each email type, through the "
+        "configured cached loader and through loaders that recompile on every render."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=500, help="Renders per email type.")
+        parser.add_argument(
+            '--min-rate',
+            type=float,
+            default=None,
+            help="Fail when any email type renders slower than this many emails/sec through the cache.",
+        )
+
+    def handle(self, *args, **options):
+        renders = options['renders']
+        uncached = Engine(
+            dirs=list(engines['django'].template_dirs),
+            loaders=['django.template.loaders.filesystem.Loader'],
+        )
+        slow = []
+        for email_type, (template, context) in EMAIL_TYPES.items():
+            names = (f'{template}.html', f'{template}.txt')
+            cached_rate = self.renders_per_second(
+                lambda: [get_template(name).render(context) for name in names], renders
+            )
+            uncached_rate = self.renders_per_second(
+                lambda: [uncached.get_template(name).render(Context(context)) for name in names], renders
+            )
+            self.stdout.write(
+                f"{email_type}: cached {cached_rate:,.0f} emails/s, "
+                f"recompiled {uncached_rate:,.0f} emails/s ({cached_rate / uncached_rate:.1f}x)"
+            )
+            if options['min_rate'] is not None and cached_rate < options['min_rate']:
+                slow.append(email_type)
+
+        if slow:
+            raise CommandError(
+                f"Rendering below {options['min_rate']:,.0f} emails/s: {', '.join(slow)}"
+            )
+
+    @staticmethod
+    def renders_per_second(render, renders):
+        started = time.perf_counter()
+        for _ in range(renders):
+            render()
+        return renders / (time.perf_counter() - started)
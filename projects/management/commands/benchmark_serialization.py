@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from projects.fast_serializers import serialize_projects, serialize_sessions
+from projects.models import Project, Session
+from projects.serializers import ProjectListSerializer, SessionSerializer
+from skills.models import Level, ProgLanguage, Stack
+from users.models import CustomUser
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compares rows/sec of the serializer and values-based fast paths for session and project lists."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            default=None,
+            help="Benchmark N generated sessions inside a transaction that is rolled back afterwards.",
+        )
+        parser.add_argument('--limit', type=int, default=500, help="Rows rendered per run.")
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if not options['synthetic']:
+            self.benchmark(options['limit'], options['runs'])
+            return
+        try:
+            with transaction.atomic():
+                self.create_sessions(options['synthetic'])
+                self.benchmark(options['limit'], options['runs'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_sessions(self, count):
+        stack, _ = Stack.objects.get_or_create(name='Backend')
+        level, _ = Level.objects.get_or_create(name='Junior')
+        languages = [ProgLanguage.objects.get_or_create(name=name)[0] for name in ('Python', 'Rust', 'Go')]
+        host = CustomUser.objects.create_user(username='benchmark-host', email='benchmark-host@example.com')
+        developers = CustomUser.objects.bulk_create(
+            CustomUser(username=f'benchmark-{number}', email=f'benchmark-{number}@example.com', stack=stack, level=level)
+            for number in range(50)
+        )
+        projects = Project.objects.bulk_create(
+            Project(owner=host, name=f'Benchmark project {number}', stack=stack, level=level)
+            for number in range(max(count // 10, 1))
+        )
+        sessions = Session.objects.bulk_create(
+            Session(
+                project=projects[number % len(projects)], host=host, stack=stack, level=level,
+                schedule_date_time=datetime.now() + timedelta(hours=number),
+            )
+            for number in range(count)
+        )
+        Session.languages.through.objects.bulk_create(
+            Session.languages.through(session_id=session.id, proglanguage_id=language.id)
+            for session in sessions for language in languages[:2]
+        )
+        Session.participants.through.objects.bulk_create(
+            Session.participants.through(session_id=session.id, customuser_id=developer.id)
+            for number, session in enumerate(sessions)
+            for developer in developers[number % 47:number % 47 + 3]
+        )
+        Project.languages.through.objects.bulk_create(
+            Project.languages.through(project_id=project.id, proglanguage_id=language.id)
+            for project in projects for language in languages
+        )
+
+    def benchmark(self, limit, runs):
+        renderer = JSONRenderer()
+        session_ids = list(Session.objects.order_by('id').values_list('id', flat=True)[:limit])
+        project_ids = list(Project.objects.order_by('id').values_list('id', flat=True)[:limit])
+
+        cases = [
+            (
+                'sessions',
+                len(session_ids),
+                lambda: SessionSerializer(
+                    Session.objects.filter(id__in=session_ids).order_by('id').for_serializer(), many=True
+                ).data,
+                lambda: serialize_sessions(session_ids),
+            ),
+            (
+                'projects',
+                len(project_ids),
+                lambda: ProjectListSerializer(
+                    Project.objects.filter(id__in=project_ids).order_by('id').for_serializer(include_sessions=False),
+                    many=True,
+                ).data,
+                lambda: serialize_projects(project_ids),
+            ),
+        ]
+        for name, rows, serializer_path, fast_path in cases:
+            if not rows:
+                self.stdout.write(f"{name}: no rows to render")
+                continue
+            identical = renderer.render(serializer_path()) == renderer.render(fast_path())
+            serializer_rate = self.rows_per_second(serializer_path, rows, runs)
+            fast_rate = self.rows_per_second(fast_path, rows, runs)
+            self.stdout.write(
+                f"{name}: {rows} rows, serializer {serializer_rate:,.0f} rows/s, "
+                f"fast path {fast_rate:,.0f} rows/s ({fast_rate / serializer_rate:.1f}x), "
+                f"identical output: {'yes' if identical else 'NO'}"
+            )
+
+    @staticmethod
+    def rows_per_second(render, rows, runs):
+        started = time.perf_counter()
+        for _ in range(runs):
+            render()
+        return rows * runs / (time.perf_counter() - started)
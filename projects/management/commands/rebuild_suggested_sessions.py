@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from projects.services import SuggestedSessionFeedService
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the materialized suggested sessions feed for every user."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            rows = SuggestedSessionFeedService.rebuild_all()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} suggested sessions in {elapsed:.2f}s."))
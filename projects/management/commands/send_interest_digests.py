@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from projects.services import InterestDigestService
+
+
+class Command(BaseCommand):
+    help = "Queues one email per opted-in host listing the users newly interested in their sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Queue the pending digests and exit.")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.INTEREST_DIGEST_INTERVAL_SECONDS,
+            help="Seconds between digests.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            digests, interests = InterestDigestService.queue_digests()
+            if digests:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Queued {digests} digests covering {interests} interested users."
+                ))
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
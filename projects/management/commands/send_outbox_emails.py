@@ -0,0 +1,37 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from projects import outbox
+
+
+class Command(BaseCommand):
+    help = "Sends the emails queued in the outbox, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no email is due.")
+        parser.add_argument("--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=settings.EMAIL_OUTBOX_WORKERS)
+        parser.add_argument(
+            "--poll-interval", type=float, default=5.0, help="Seconds to sleep when no email is due."
+        )
+        parser.add_argument("--metrics", action="store_true", help="Print the queue metrics and exit.")
+
+    def handle(self, *args, **options):
+        if options["metrics"]:
+            self.stdout.write(json.dumps(outbox.get_metrics()))
+            return
+
+        while True:
+            started = time.perf_counter()
+            sent, failed = outbox.drain(options["batch_size"], options["workers"])
+            if sent or failed:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {sent} emails, {failed} failed, in {elapsed:.2f}s."
+                ))
+            if options["once"]:
+                return
+            time.sleep(options["poll_interval"])
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-17 05:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_merge_20241007_2008'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuggestedSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', models.IntegerField()),
+                ('schedule_date_time', models.DateTimeField()),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suggestions', to='projects.session')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suggested_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'priority', 'schedule_date_time', 'session'], name='suggested_session_feed_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'session'), name='unique_user_suggested_session')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0017_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interestedparticipant',
+            name='pending_digest',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations
+from django.db.models import Case, IntegerField, Q, When
+from django.utils import timezone
+
+# Frozen copy of projects.services.STACK_COMPATIBILITY: user stack to the session stacks it suits.
+STACK_COMPATIBILITY = {
+    'Fullstack': ['Fullstack', 'Frontend', 'Backend'],
+    'Frontend': ['Frontend', 'Fullstack'],
+    'Backend': ['Backend', 'Fullstack'],
+}
+
+
+def backfill_suggested_sessions(apps, schema_editor):
+    """Fills the feed for the future sessions, as SuggestedSessionFeedService.rebuild_all does."""
+    Session = apps.get_model('projects', 'Session')
+    SuggestedSession = apps.get_model('projects', 'SuggestedSession')
+    CustomUser = apps.get_model('users', 'CustomUser')
+    Stack = apps.get_model('skills', 'Stack')
+
+    stack_ids = dict(Stack.objects.values_list('name', 'id'))
+    stack_names = {stack_id: name for name, stack_id in stack_ids.items()}
+
+    SuggestedSession.objects.all().delete()
+    sessions = Session.objects.filter(schedule_date_time__gte=timezone.now()).order_by('id')
+    for session in sessions.iterator():
+        stack_name = stack_names.get(session.stack_id)
+        compatible_stacks = [
+            stack_ids[user_stack] for user_stack, session_stacks in STACK_COMPATIBILITY.items()
+            if stack_name in session_stacks and user_stack in stack_ids
+        ]
+        level_match = Q(level_id=session.level_id) if session.level_id else Q(level__isnull=True)
+
+        developers = CustomUser.objects.filter(
+            prog_language__in=session.languages.values('id')
+        ).exclude(
+            id=session.host_id
+        ).annotate(
+            priority=Case(
+                When(level_match & Q(stack_id__in=compatible_stacks), then=1),
+                When(Q(stack_id__in=compatible_stacks), then=2),
+                default=3,
+                output_field=IntegerField()
+            )
+        ).values_list('id', 'priority').distinct()
+
+        SuggestedSession.objects.bulk_create(
+            (
+                SuggestedSession(
+                    user_id=user_id,
+                    session_id=session.id,
+                    priority=priority,
+                    schedule_date_time=session.schedule_date_time,
+                )
+                for user_id, priority in developers
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0018_interestedparticipant_pending_digest'),
+        ('skills', '0003_alter_stack_name'),
+        ('users', '0007_customuser_interest_digest'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_suggested_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,166 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from pair_connect.fieldsets import rendered_fields, requested_fields
+
+from . import response_cache
+from .fast_serializers import can_use_fast_path, serialize_projects, serialize_sessions
+from .models import Project, Session
+from .serializers import SessionSummarySerializer
+
+SUMMARY_VIEW = "summary"
+
+
+def is_summary_request(request):
+    return request.method in SAFE_METHODS and request.query_params.get("view") == SUMMARY_VIEW
+
+
+def session_fields_for(request, serializer_class, summary=False):
+    """
+    Returns the fields Session.objects.for_serializer() should load for serializer_class,
+    None for all of them. Summaries never load the nested participants.
+    """
+    if summary:
+        return rendered_fields(request, serializer_class)
+    return requested_fields(request, serializer_class)
+
+
+def session_queryset_for(request, sessions, serializer_class, summary=False):
+    """
+    Prepares `sessions` for serializer_class: summaries get count annotations and skip the
+    nested participants, full representations get the usual prefetches.
+    """
+    if summary:
+        sessions = sessions.with_counts()
+    return sessions.for_serializer(session_fields_for(request, serializer_class, summary))
+
+
+class SessionListMixin:
+    """
+    Session list views accept ?view=summary, which swaps the nested participants for
+    participant_count and interested_count annotations. Full representations are listed
+    through the values-based fast path.
+
+    Views build their filtered queryset in get_sessions(), which lists nothing by default.
+    """
+
+    summary_serializer_class = SessionSummarySerializer
+
+    def get_sessions(self):
+        return Session.objects.none()
+
+    def is_summary(self):
+        return is_summary_request(self.request)
+
+    def get_serializer_class(self):
+        if self.is_summary():
+            return self.summary_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        return session_queryset_for(
+            self.request, self.get_sessions(), self.get_serializer_class(), summary=self.is_summary()
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not can_use_fast_path(request):
+            return super().list(request, *args, **kwargs)
+
+        sessions = self.filter_queryset(self.get_sessions()).only("id", "schedule_date_time")
+        page = self.paginate_queryset(sessions)
+        data = serialize_sessions([session.id for session in (sessions if page is None else page)])
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class ProjectListMixin:
+    """
+    Lists projects through the values-based fast path. Views decide whether the nested
+    sessions are rendered in include_sessions(); by default they are left out.
+    """
+
+    def include_sessions(self):
+        return False
+
+    def list(self, request, *args, **kwargs):
+        if not can_use_fast_path(request):
+            return super().list(request, *args, **kwargs)
+
+        projects = self.filter_queryset(Project.objects.only("id", "date_created"))
+        page = self.paginate_queryset(projects)
+        data = serialize_projects(
+            [project.id for project in (projects if page is None else page)],
+            include_sessions=self.include_sessions(),
+        )
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Serves anonymous JSON reads from a shared cache keyed by path and query string.
+
+    Entries expire after ANONYMOUS_RESPONSE_CACHE_TIMEOUT and are invalidated by any write to
+    projects, sessions or what they render, see projects.signals. A response is only stored
+    when contains_private_sessions() says none of the rendered rows carries a private session.
+    Views that do not override it are never cached.
+    """
+
+    def contains_private_sessions(self, object_ids):
+        return True
+
+    def is_cacheable(self, request):
+        return (
+            request.method == "GET"
+            and not request.user.is_authenticated
+            and isinstance(request.accepted_renderer, JSONRenderer)
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.rendered_object_ids = [obj.pk for obj in page]
+        return page
+
+    def cached_get(self, request, handler, detail, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        key = response_cache.make_key(request)
+        cached = response_cache.get_response(key)
+        if cached is not None:
+            return self.cached_response(request, cached)
+
+        self.rendered_object_ids = [kwargs[self.lookup_url_kwarg or self.lookup_field]] if detail else None
+        response = handler(request, *args, **kwargs)
+        object_ids = self.rendered_object_ids
+        if response.status_code == 200 and object_ids is not None and not self.contains_private_sessions(object_ids):
+            response.add_post_render_callback(lambda rendered: response_cache.set_response(key, rendered))
+        return response
+
+    @staticmethod
+    def cached_response(request, cached):
+        headers = cached["headers"]
+        response = get_conditional_response(
+            request,
+            etag=headers.get("ETag"),
+            last_modified=parse_http_date_safe(headers.get("Last-Modified", "")),
+        )
+        if response is None:
+            response = HttpResponse(cached["content"], content_type=cached["content_type"])
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_get(request, super().list, False, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_get(request, super().retrieve, True, *args, **kwargs)
+
@@ -1,23 +1,67 @@
 from datetime import timedelta
 from cloudinary.models import CloudinaryField
-from django.db import models
-from skills.models import Stack, ProgLanguage, Level
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from skills.models import Stack, ProgLanguage, Level, languages_by_id
 from django.contrib.auth import get_user_model
+from pair_connect.fieldsets import only_serialized
 
 User = get_user_model()
 
 
+class ProjectQuerySet(models.QuerySet):
+    SERIALIZER_COLUMNS = {
+        'id': ('id',),
+        'name': ('name',),
+        'description': ('description',),
+        'image': ('image',),
+        'image_url': ('image',),
+        'stack_name': ('stack__name',),
+        'level_name': ('level__name',),
+        'owner_id': ('owner',),
+        'owner_name': ('owner__username',),
+        'owner_avatar_url': ('owner__photo',),
+    }
+
+    def for_serializer(self, include_sessions=True, fields=None):
+        """
+        Loads everything ProjectSerializer renders in a fixed number of queries, optionally
+        with the nested sessions and their participants. With `fields`, only what those
+        serializer fields read is loaded.
+        """
+        if fields is None:
+            projects = self.select_related('owner', 'stack', 'level').prefetch_related(languages_by_id('languages'))
+        else:
+            include_sessions = include_sessions and 'sessions' in fields
+            projects = only_serialized(self, fields, self.SERIALIZER_COLUMNS)
+            if 'language_names' in fields:
+                projects = projects.prefetch_related(languages_by_id('languages'))
+        if include_sessions:
+            projects = projects.prefetch_related(
+                models.Prefetch('sessions', queryset=Session.objects.for_serializer().order_by('id'))
+            )
+        return projects
+
+    def touch(self):
+        """Bumps updated_at without loading the projects or sending save signals."""
+        return self.update(updated_at=timezone.now())
+
+
 class Project(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     name = models.CharField(max_length=255)
     description = models.TextField(null=True, blank=True)
     image = CloudinaryField('image', null=True, blank=True, default="https://res.cloudinary.com/dwzqcmaod/image/upload/v1728120693/neon2_r6qoo1.png")
     date_created = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     active = models.BooleanField(default=False)
     stack = models.ForeignKey(Stack, on_delete=models.CASCADE)
     languages = models.ManyToManyField(ProgLanguage)
     level = models.ForeignKey(Level, on_delete=models.CASCADE)
 
+    objects = ProjectQuerySet.as_manager()
+
     def image_url(self):
         return self.image.url if self.image else None
 
@@ -25,6 +69,87 @@ class Project(models.Model):
         return self.name
 
 
+class SessionQuerySet(models.QuerySet):
+    SERIALIZER_COLUMNS = {
+        'id': ('id',),
+        'name': ('name',),
+        'description': ('description',),
+        'schedule_date_time': ('schedule_date_time',),
+        'duration': ('duration',),
+        'stack_name': ('stack__name',),
+        'level_name': ('level__name',),
+        'project_id': ('project__id',),
+        'project_name': ('project__name',),
+        'project_image_url': ('project__image',),
+        'owner_id': ('host',),
+        'owner_name': ('host__username',),
+        'owner_avatar_url': ('host__photo',),
+        'session_link': ('session_link',),
+        'participant_limit': ('participant_limit',),
+        'public': ('public',),
+        'active': ('active',),
+    }
+
+    def for_serializer(self, fields=None):
+        """
+        Loads everything SessionSerializer renders, nested participants included, in a fixed
+        number of queries however many sessions are listed. With `fields`, only what those
+        serializer fields read is loaded.
+        """
+        if fields is None:
+            return self.select_related('host', 'project', 'stack', 'level').prefetch_related(
+                languages_by_id('languages'),
+                models.Prefetch('participants', queryset=User.objects.for_serializer().order_by('id')),
+            )
+
+        # to_representation always reads public for is_private
+        sessions = only_serialized(self, fields, self.SERIALIZER_COLUMNS, required=('id', 'public'))
+        if 'language_names' in fields:
+            sessions = sessions.prefetch_related(languages_by_id('languages'))
+        if 'participants' in fields:
+            sessions = sessions.prefetch_related(
+                models.Prefetch('participants', queryset=User.objects.for_serializer().order_by('id'))
+            )
+        return sessions
+
+    def with_counts(self):
+        """Annotates participant_count and interested_count with subqueries."""
+        participants = Session.participants.through.objects.filter(
+            session_id=models.OuterRef('pk')
+        ).order_by().values('session_id').annotate(count=models.Count('*')).values('count')
+        interested = InterestedParticipant.objects.filter(
+            session_id=models.OuterRef('pk')
+        ).order_by().values('session_id').annotate(count=models.Count('*')).values('count')
+        return self.annotate(
+            participant_count=Coalesce(models.Subquery(participants, output_field=models.IntegerField()), 0),
+            interested_count=Coalesce(models.Subquery(interested, output_field=models.IntegerField()), 0),
+        )
+
+    def with_roles(self, user):
+        """
+        Annotates is_host, is_participant and is_interested for `user` with subqueries, so
+        filtering on them never duplicates sessions the way joins would.
+        """
+        return self.annotate(
+            is_host=models.ExpressionWrapper(models.Q(host_id=user.id), output_field=models.BooleanField()),
+            is_participant=models.Exists(
+                Session.participants.through.objects.filter(session_id=models.OuterRef('pk'), customuser_id=user.id)
+            ),
+            is_interested=models.Exists(
+                InterestedParticipant.objects.filter(session_id=models.OuterRef('pk'), user_id=user.id)
+            ),
+        )
+
+    def touch(self):
+        """
+        Bumps updated_at on the sessions and on their projects, which render them nested,
+        without loading either or sending save signals.
+        """
+        now = timezone.now()
+        Project.objects.filter(id__in=self.values('project_id')).update(updated_at=now)
+        return self.update(updated_at=now)
+
+
 class Session(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='sessions')
     name = models.CharField(max_length=255, default="Default Session Name")
@@ -40,6 +165,9 @@ class Session(models.Model):
     active = models.BooleanField(default=True)
     public = models.BooleanField(default=True)
     participants = models.ManyToManyField(User, related_name='sessions_joined', blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = SessionQuerySet.as_manager()
 
     def __str__(self):
         return f"Session: {self.description}"
@@ -49,7 +177,119 @@ class InterestedParticipant(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     session = models.ForeignKey(Session, on_delete=models.CASCADE)
     date_created_interested = models.DateTimeField(auto_now_add=True)
+    pending_digest = models.BooleanField(default=False, db_index=True)
 
     def __str__(self):
         return f"{self.user.username} is interested in session {self.session.id}"
 
+
+
+class SuggestedSession(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='suggested_sessions')
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='suggestions')
+    priority = models.IntegerField()
+    schedule_date_time = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'session'], name='unique_user_suggested_session'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'priority', 'schedule_date_time', 'session'], name='suggested_session_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"Session {self.session_id} suggested to user {self.user_id} with priority {self.priority}"
+
+
+class OutboxEmailQuerySet(models.QuerySet):
+    def enqueue(self, message, kind):
+        """Stores a rendered EmailMultiAlternatives for the outbox worker to send."""
+        return self.enqueue_many([message], kind)[0]
+
+    def enqueue_many(self, messages, kind):
+        """Stores rendered messages of one kind with a single INSERT."""
+        return self.bulk_create(
+            OutboxEmail(
+                kind=kind,
+                subject=message.subject,
+                body=message.body,
+                html_body=next(
+                    (content for content, mimetype in message.alternatives if mimetype == 'text/html'), None
+                ),
+                from_email=message.from_email,
+                to=list(message.to),
+            )
+            for message in messages
+        )
+
+    def claim(self, batch_size, lease_seconds):
+        """
+        Takes up to batch_size due emails for one delivery attempt.
+
+        Rows locked by another worker are skipped, and claimed rows are leased rather than
+        marked, so emails held by a worker that dies become due again when the lease ends.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                self.filter(status=OutboxEmail.PENDING, available_at__lte=now)
+                .order_by('available_at', 'id')
+                .select_for_update(skip_locked=True)[:batch_size]
+            )
+            self.filter(id__in=[email.id for email in emails]).update(
+                available_at=now + timedelta(seconds=lease_seconds), attempts=models.F('attempts') + 1
+            )
+        for email in emails:
+            email.attempts += 1
+        return emails
+
+    def metrics(self):
+        now = timezone.now()
+        pending = self.filter(status=OutboxEmail.PENDING).aggregate(
+            depth=models.Count('id'),
+            retrying=models.Count('id', filter=models.Q(attempts__gt=0)),
+            oldest=models.Min('created_at'),
+        )
+        return {
+            'queue_depth': pending['depth'],
+            'retrying': pending['retrying'],
+            'failed': self.filter(status=OutboxEmail.FAILED).count(),
+            'oldest_pending_age_seconds': (
+                round((now - pending['oldest']).total_seconds(), 1) if pending['oldest'] else None
+            ),
+        }
+
+
+class OutboxEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(null=True, blank=True)
+    from_email = models.CharField(max_length=255, null=True, blank=True)
+    to = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxEmailQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} email to {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,107 @@
+"""
+Delivery of the emails queued in OutboxEmail.
+
+Workers claim due emails in batches, send them from a thread pool that reuses one mail server
+connection per thread, and record each outcome. Failed sends are retried with exponential
+backoff until EMAIL_OUTBOX_MAX_ATTEMPTS, after which the email is marked failed and left for
+an admin to inspect.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.utils import timezone
+
+from .email_service import EmailService
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 6 * 60 * 60
+
+
+def build_message(outbox_email):
+    message = EmailMultiAlternatives(
+        outbox_email.subject,
+        outbox_email.body,
+        outbox_email.from_email,
+        outbox_email.to,
+    )
+    if outbox_email.html_body:
+        message.attach_alternative(outbox_email.html_body, "text/html")
+    return message
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt of an email that failed `attempts` times."""
+    return min(settings.EMAIL_OUTBOX_RETRY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+def _send(outbox_emails):
+    """Runs in a pool thread, so it must not touch the database."""
+    return EmailService.deliver([build_message(outbox_email) for outbox_email in outbox_emails])
+
+
+def split(items, parts):
+    """Splits items into at most `parts` contiguous chunks of nearly equal size."""
+    size = -(-len(items) // parts) if items else 1
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def record_outcome(outbox_email, error):
+    now = timezone.now()
+    if error is None:
+        outbox_email.status = OutboxEmail.SENT
+        outbox_email.sent_at = now
+        outbox_email.last_error = ''
+    else:
+        outbox_email.last_error = str(error)
+        if outbox_email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            outbox_email.status = OutboxEmail.FAILED
+            logger.error("Giving up on outbox email %s: %s", outbox_email.id, error)
+        else:
+            outbox_email.available_at = now + timedelta(seconds=retry_delay(outbox_email.attempts))
+            logger.warning("Outbox email %s failed, retrying later: %s", outbox_email.id, error)
+    outbox_email.save(update_fields=['status', 'sent_at', 'last_error', 'available_at'])
+
+
+def process_batch(executor, workers, batch_size=None):
+    """
+    Claims and sends one batch of due emails.
+
+    The batch is split between the pool threads, and each thread sends its share over a
+    single mail server connection.
+
+    :return: (sent, failed) counts for the batch
+    """
+    emails = OutboxEmail.objects.claim(
+        batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE, settings.EMAIL_OUTBOX_LEASE_SECONDS
+    )
+    errors = [error for chunk_errors in executor.map(_send, split(emails, workers)) for error in chunk_errors]
+    sent = failed = 0
+    for outbox_email, error in zip(emails, errors):
+        record_outcome(outbox_email, error)
+        if error is None:
+            sent += 1
+        else:
+            failed += 1
+    return sent, failed
+
+
+def drain(batch_size=None, workers=None):
+    """Sends batches until no email is due. Returns the total (sent, failed) counts."""
+    total_sent = total_failed = 0
+    workers = workers or settings.EMAIL_OUTBOX_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            sent, failed = process_batch(executor, workers, batch_size)
+            if not sent and not failed:
+                return total_sent, total_failed
+            total_sent += sent
+            total_failed += failed
+
+
+def get_metrics():
+    return OutboxEmail.objects.metrics()
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from pair_connect import cache as model_cache
+from skills.models import Level, ProgLanguage, Stack
+from users.models import CustomUser
+
+from .models import InterestedParticipant, Project, Session
+
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+# Everything project and session responses render, nested rows included
+RENDERED_MODELS = (Project, Session, InterestedParticipant, CustomUser, Stack, Level, ProgLanguage)
+
+
+def make_key(request):
+    """
+    Builds the cache key for an anonymous read from its path and query string.
+
+    The key embeds the generations of every model the response renders, so any write to
+    them makes older responses unreachable at once.
+    """
+    return model_cache.make_key(
+        'anonymous_responses', RENDERED_MODELS, request.accepted_media_type, request.get_full_path()
+    )
+
+
+def get_response(key):
+    return cache.get(key)
+
+
+def set_response(key, response):
+    cache.set(key, {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'headers': {header: response[header] for header in CACHED_HEADERS if response.has_header(header)},
+    }, timeout=settings.ANONYMOUS_RESPONSE_CACHE_TIMEOUT)
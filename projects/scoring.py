@@ -0,0 +1,134 @@
+import math
+import threading
+
+import numpy as np
+
+from users.skill_index import language_ids
+
+LANGUAGE_WEIGHT = 0.6
+LEVEL_WEIGHT = 0.25
+STACK_WEIGHT = 0.15
+COMPATIBLE_STACK_SCORE = 0.5
+
+
+class SkillMatrix:
+    """
+    Column-oriented snapshot of a DeveloperSkillIndex for vectorized scoring.
+
+    Every developer is a row; stack and level ids are integer columns and languages are a
+    bit vector per developer, pre-multiplied by an inverse-frequency weight per language and
+    stored column-major, so a weighted Jaccard overlap against a session only sums the
+    session's language columns.
+    """
+
+    MISSING = -1
+
+    def __init__(self, index):
+        profiles = index.profiles()
+        self.version = (id(index), index.built_at, index.version)
+        self.size = len(profiles)
+
+        self.user_ids = np.fromiter((user_id for user_id, _ in profiles), dtype=np.int64, count=self.size)
+        self.stack_ids = np.fromiter(
+            (self._id(profile[0]) for _, profile in profiles), dtype=np.int64, count=self.size
+        )
+        self.level_ids = np.fromiter(
+            (self._id(profile[1]) for _, profile in profiles), dtype=np.int64, count=self.size
+        )
+
+        rows, languages = [], []
+        for row, (_, profile) in enumerate(profiles):
+            for language_id in language_ids(profile[2]):
+                rows.append(row)
+                languages.append(language_id)
+        self.columns = {language_id: column for column, language_id in enumerate(sorted(set(languages)))}
+
+        bits = np.zeros((self.size, len(self.columns)), dtype=bool)
+        if rows:
+            bits[np.array(rows), np.array([self.columns[language_id] for language_id in languages])] = True
+
+        frequency = bits.sum(axis=0)
+        self.missing_language_weight = math.log1p(self.size)
+        self.language_weights = np.log1p(self.size / (1.0 + frequency)).astype(np.float32)
+        self.weighted_languages = np.asfortranarray(bits * self.language_weights)
+        self.row_weights = self.weighted_languages.sum(axis=1, dtype=np.float32)
+
+    @classmethod
+    def _id(cls, value):
+        return cls.MISSING if value is None else value
+
+    def score(self, session_language_ids, stack_id, compatible_stack_ids, level_ids, excluded_user_ids=()):
+        """
+        Scores every developer against a session at once.
+
+        :param session_language_ids: ids of the session's languages
+        :param stack_id: the session stack id, scored as an exact match
+        :param compatible_stack_ids: stack ids allowed for the session, None for any stack
+        :param level_ids: level ids counted as a level match
+        :param excluded_user_ids: developers that must not be suggested
+        :return: (scores, overlap) arrays aligned with user_ids; excluded developers score -inf
+        """
+        columns, missing_weight = [], 0.0
+        for language_id in set(session_language_ids):
+            column = self.columns.get(language_id)
+            if column is None:
+                missing_weight += self.missing_language_weight
+            else:
+                columns.append(column)
+        query_weight = np.float32(self.language_weights[columns].sum() + missing_weight)
+
+        if columns:
+            intersection = self.weighted_languages[:, columns].sum(axis=1, dtype=np.float32)
+        else:
+            intersection = np.zeros(self.size, dtype=np.float32)
+        union = self.row_weights + query_weight
+        union -= intersection
+        overlap = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+        scores = overlap * np.float32(LANGUAGE_WEIGHT)
+        scores += np.float32(STACK_WEIGHT * COMPATIBLE_STACK_SCORE)
+        np.add(scores, np.float32(STACK_WEIGHT * (1 - COMPATIBLE_STACK_SCORE)), out=scores,
+               where=self.stack_ids == stack_id)
+        np.add(scores, np.float32(LEVEL_WEIGHT), out=scores,
+               where=self._matches(self.level_ids, [self._id(level_id) for level_id in level_ids]))
+
+        if compatible_stack_ids is None:
+            eligible = self.stack_ids != self.MISSING
+        else:
+            eligible = self._matches(self.stack_ids, compatible_stack_ids)
+        if excluded_user_ids:
+            eligible &= ~np.isin(self.user_ids, np.fromiter(excluded_user_ids, dtype=np.int64))
+        scores[~eligible] = -np.inf
+        return scores, overlap
+
+    @staticmethod
+    def _matches(values, accepted):
+        accepted = list(accepted)
+        if len(accepted) > 8:
+            return np.isin(values, accepted)
+        matches = np.zeros(len(values), dtype=bool)
+        for value in accepted:
+            matches |= values == value
+        return matches
+
+    def top(self, scores, limit=None):
+        """Returns row numbers of the best scored developers, highest score first, ties by user id."""
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if limit is not None and limit < len(candidates):
+            threshold = np.partition(scores[candidates], len(candidates) - limit)[len(candidates) - limit]
+            candidates = candidates[scores[candidates] >= threshold]
+        order = np.lexsort((self.user_ids[candidates], -scores[candidates]))
+        rows = candidates[order]
+        return rows if limit is None else rows[:limit]
+
+
+_matrix_lock = threading.Lock()
+_matrix = None
+
+
+def get_skill_matrix(index):
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None or _matrix.version != (id(index), index.built_at, index.version):
+            _matrix = SkillMatrix(index)
+        return _matrix
@@ -1,33 +1,32 @@
 from rest_framework import serializers
 
-from skills.models import Level, ProgLanguage, Stack
+from pair_connect.fieldsets import DynamicFieldsMixin
+from skills.serializers import TaxonomyRelatedField
 from users.models import CustomUser
 from users.serializers import CustomUserSerializer
 
 from .models import InterestedParticipant, Project, Session
 
 
-class SessionSerializer(serializers.ModelSerializer):
+class SessionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     name = serializers.CharField(max_length=255)
     owner_id = serializers.PrimaryKeyRelatedField(source="host", read_only=True)
     owner_name = serializers.CharField(source="host.username", read_only=True)
     owner_avatar_url = serializers.ReadOnlyField(source="host.photo.url")
-    stack_id = serializers.PrimaryKeyRelatedField(
-        source="stack", queryset=Stack.objects.all(), write_only=True
-    )
+    stack_id = TaxonomyRelatedField("stacks", source="stack", write_only=True)
     stack_name = serializers.CharField(source="stack.name", read_only=True)
-    level_id = serializers.PrimaryKeyRelatedField(
+    level_id = TaxonomyRelatedField(
+        "levels",
         source="level",
-        queryset=Level.objects.all(),
         required=False,
         allow_null=True,
         write_only=True,
     )
     level_name = serializers.CharField(source="level.name", read_only=True)
-    language_ids = serializers.PrimaryKeyRelatedField(
+    language_ids = TaxonomyRelatedField(
+        "languages",
         many=True,
         source="languages",
-        queryset=ProgLanguage.objects.all(),
         write_only=True,
     )
     language_names = serializers.SlugRelatedField(
@@ -106,7 +105,8 @@ class SessionSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation["is_private"] = not instance.public
+        if "is_private" in self.fields:
+            representation["is_private"] = not instance.public
         return representation
 
     def get_project_image_url(self, obj):
@@ -132,9 +132,23 @@ class SessionDetailSerializer(SessionSerializer):
         ]
 
     def get_participant_count(self, obj):
+        participant_count = getattr(obj, "participant_count", None)
+        if participant_count is not None:
+            return participant_count
         return obj.participants.count()
 
 
+class SessionSummarySerializer(SessionSerializer):
+    participant_count = serializers.IntegerField(read_only=True)
+    interested_count = serializers.IntegerField(read_only=True)
+
+    class Meta(SessionSerializer.Meta):
+        fields = [field for field in SessionSerializer.Meta.fields if field != "participants"] + [
+            "participant_count",
+            "interested_count",
+        ]
+
+
 class SessionParticipantSerializer(serializers.ModelSerializer):
     participants = serializers.SlugRelatedField(
         queryset=CustomUser.objects.all(), slug_field="username", many=True
@@ -145,24 +159,18 @@ class SessionParticipantSerializer(serializers.ModelSerializer):
         fields = ["participants"]
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     owner_name = serializers.CharField(source="owner.username", read_only=True)
     owner_id = serializers.PrimaryKeyRelatedField(source="owner", read_only=True)
     owner_avatar_url = serializers.SerializerMethodField()
     image_url = serializers.CharField(source="image.url", read_only=True)
-    stack = serializers.PrimaryKeyRelatedField(
-        queryset=Stack.objects.all(), write_only=True
-    )
+    stack = TaxonomyRelatedField("stacks", write_only=True)
     stack_name = serializers.CharField(source="stack.name", read_only=True)
-    languages = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=ProgLanguage.objects.all(), write_only=True
-    )
+    languages = TaxonomyRelatedField("languages", many=True, write_only=True)
     language_names = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="name", source="languages"
     )
-    level = serializers.PrimaryKeyRelatedField(
-        queryset=Level.objects.all(), write_only=True
-    )
+    level = TaxonomyRelatedField("levels", write_only=True)
     level_name = serializers.CharField(source="level.name", read_only=True)
     sessions = SessionSerializer(many=True, read_only=True)
 
@@ -203,16 +211,6 @@ class ProjectSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-    def validate_stack(self, value):
-        if not Stack.objects.filter(id=value.id).exists():
-            raise serializers.ValidationError("Selected stack does not exist.")
-        return value
-
-    def validate_level(self, value):
-        if not Level.objects.filter(id=value.id).exists():
-            raise serializers.ValidationError("Selected level does not exist.")
-        return value
-
     def validate_languages(self, value):
         if not value:
             raise serializers.ValidationError("At least one language must be selected.")
@@ -225,6 +223,72 @@ class ProjectSerializer(serializers.ModelSerializer):
         return None
 
 
+class ProjectListSerializer(ProjectSerializer):
+    class Meta(ProjectSerializer.Meta):
+        fields = [field for field in ProjectSerializer.Meta.fields if field != "sessions"]
+
+
+class SuggestedDeveloperSerializer(CustomUserSerializer):
+    match_score = serializers.ReadOnlyField()
+
+    class Meta(CustomUserSerializer.Meta):
+        fields = CustomUserSerializer.Meta.fields + ("match_score",)
+
+
+class SuggestedSessionSerializer(SessionSerializer):
+    participant_count = serializers.ReadOnlyField()
+    is_full = serializers.ReadOnlyField()
+    is_participant = serializers.ReadOnlyField()
+    is_interested = serializers.ReadOnlyField()
+
+    class Meta(SessionSerializer.Meta):
+        fields = SessionSerializer.Meta.fields + [
+            "participant_count",
+            "is_full",
+            "is_participant",
+            "is_interested",
+        ]
+
+
+class SuggestedSessionSummarySerializer(SessionSummarySerializer):
+    is_full = serializers.ReadOnlyField()
+    is_participant = serializers.ReadOnlyField()
+    is_interested = serializers.ReadOnlyField()
+
+    class Meta(SessionSummarySerializer.Meta):
+        fields = SessionSummarySerializer.Meta.fields + [
+            "is_full",
+            "is_participant",
+            "is_interested",
+        ]
+
+
+class UserSessionSerializer(SessionSerializer):
+    is_host = serializers.ReadOnlyField()
+    is_participant = serializers.ReadOnlyField()
+    is_interested = serializers.ReadOnlyField()
+
+    class Meta(SessionSerializer.Meta):
+        fields = SessionSerializer.Meta.fields + [
+            "is_host",
+            "is_participant",
+            "is_interested",
+        ]
+
+
+class UserSessionSummarySerializer(SessionSummarySerializer):
+    is_host = serializers.ReadOnlyField()
+    is_participant = serializers.ReadOnlyField()
+    is_interested = serializers.ReadOnlyField()
+
+    class Meta(SessionSummarySerializer.Meta):
+        fields = SessionSummarySerializer.Meta.fields + [
+            "is_host",
+            "is_participant",
+            "is_interested",
+        ]
+
+
 class InterestedParticipantSerializer(serializers.ModelSerializer):
     class Meta:
         model = InterestedParticipant
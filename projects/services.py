@@ -1,9 +1,38 @@
-from django.db.models import Q, Case, When, IntegerField
+import base64
+import heapq
+import json
+from collections import defaultdict
+from datetime import datetime
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Q, Case, When, IntegerField, BooleanField, Count, Exists, F, Field, Func, OuterRef, Value, Prefetch
+)
+from django.db.models.lookups import GreaterThan
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from users.models import CustomUser
+from skills.taxonomy import get_taxonomy
+from users.skill_index import get_skill_index, language_mask
 from .email_service import EmailService
-from projects.models import Session, Project, InterestedParticipant
+from .availability import SessionIntervalIndex
+from . import suggestion_cache
+from .scoring import get_skill_matrix
+from projects.models import Session, Project, InterestedParticipant, SuggestedSession
+
+STACK_COMPATIBILITY = {
+    'Fullstack': ['Fullstack', 'Frontend', 'Backend'],
+    'Frontend': ['Frontend', 'Fullstack'],
+    'Backend': ['Backend', 'Fullstack'],
+}
+
+
+class RowValue(Func):
+    """A row constructor such as (a, b, c), compared element by element with another row."""
+    function = ''
+    template = '(%(expressions)s)'
+    arg_joiner = ', '
+    output_field = Field()
 
 
 class SessionService:
@@ -18,28 +47,314 @@ class SessionService:
 
     def validate_and_assign_stack(self):
         try:
-            project_stack = self.session.project.stack
-            session_stack = self.session.stack
+            taxonomy = get_taxonomy()
+            project_stack_id = self.session.project.stack_id
+            project_stack_name = taxonomy.stack_name(project_stack_id)
 
-            if project_stack.name != 'Fullstack':
-                if not session_stack or session_stack != project_stack:
+            if project_stack_name != 'Fullstack':
+                if not self.session.stack_id or self.session.stack_id != project_stack_id:
                     raise ValidationError(
-                        f"Invalid stack. For this project, the session must use stack {project_stack.name}.")
+                        f"Invalid stack. For this project, the session must use stack {project_stack_name}.")
             else:
-                if session_stack.name not in ['Fullstack', 'Backend', 'Frontend']:
+                if taxonomy.stack_name(self.session.stack_id) not in ['Fullstack', 'Backend', 'Frontend']:
                     raise ValidationError("Invalid stack choice. You can only choose Fullstack, Backend, or Frontend.")
         except Exception as e:
             raise ValidationError(f"Error validating or assigning stack: {e}")
 
 
 class DeveloperSuggestionService:
+    ENGINES = ('index', 'sql', 'vector')
+    SUGGESTION_LIMIT = 5
+    TIER_WEIGHT = 1000
+    SHARED_LANGUAGE_WEIGHT = 10
+    STACK_MATCH_WEIGHT = 1
+
     def __init__(self, session):
         self.session = session
 
-    def get_suggested_developers(self):
+    def get_suggested_developers(self, limit=SUGGESTION_LIMIT, engine=None, available_only=False, availability=None):
+        """
+            Suggests developers for the session with the selected engine.
+        Args:
+            limit (int, optional): Maximum number of developers to return.
+            engine (str, optional): One of ENGINES. Defaults to settings.DEVELOPER_SUGGESTION_ENGINE.
+            available_only (bool, optional): Skip developers hosting or joining another session
+                that overlaps this one.
+            availability (SessionIntervalIndex, optional): Index used for the availability check.
+                Defaults to one built for this session's time window.
+        Returns:
+            list: Suggested developers annotated with match_score.
+        """
+        engine = engine or settings.DEVELOPER_SUGGESTION_ENGINE
+        if engine not in self.ENGINES:
+            raise ValidationError(f"Unknown suggestion engine: {engine}")
+
+        cache_key = suggestion_cache.make_key(self.session.id, limit, engine, available_only)
+        ranking = suggestion_cache.get_ranking(cache_key)
+        if ranking is not None:
+            return self.load_developers(ranking)
+
+        busy_user_ids = self.get_busy_user_ids(availability) if available_only else set()
+        if engine == 'sql':
+            developers = list(self.get_ranked_developers(limit=limit, busy_user_ids=busy_user_ids))
+        else:
+            excluded_user_ids = self.get_excluded_user_ids() | busy_user_ids
+            if engine == 'vector':
+                developers = self.get_vector_developers(limit=limit, excluded_user_ids=excluded_user_ids)
+            else:
+                developers = self.get_indexed_developers(limit=limit, excluded_user_ids=excluded_user_ids)
+
+        suggestion_cache.set_ranking(
+            cache_key, [(developer.id, {'match_score': developer.match_score}) for developer in developers]
+        )
+        return developers
+
+    @staticmethod
+    def load_developers(ranking):
+        """
+            Loads the developers of a ranking in one query, keeping its order.
+        Args:
+            ranking (list): (developer_id, annotations) pairs, best first.
+        Returns:
+            list: Developers with the annotations set as attributes. Developers deleted since
+                the ranking was computed are skipped.
+        """
+        developers = CustomUser.objects.for_serializer().in_bulk([developer_id for developer_id, _ in ranking])
+
+        suggested_developers = []
+        for developer_id, annotations in ranking:
+            developer = developers.get(developer_id)
+            if developer is None:
+                continue
+            for name, value in annotations.items():
+                setattr(developer, name, value)
+            suggested_developers.append(developer)
+        return suggested_developers
+
+    def get_session_window(self):
+        start = self.session.schedule_date_time
+        return start, start + self.session.duration
+
+    def get_busy_user_ids(self, availability=None):
+        start, end = self.get_session_window()
+        if availability is None:
+            availability = SessionIntervalIndex.for_window(start, end, exclude_session_ids=[self.session.id])
+        return availability.busy_user_ids(start, end)
+
+    def get_excluded_user_ids(self):
+        excluded_user_ids = set(
+            InterestedParticipant.objects.filter(session_id=self.session.id).values_list('user_id', flat=True)
+        )
+        excluded_user_ids.update(participant.id for participant in self.session.participants.all())
+        if self.session.host_id:
+            excluded_user_ids.add(self.session.host_id)
+        return excluded_user_ids
+
+    def get_indexed_developers(self, limit=SUGGESTION_LIMIT, excluded_user_ids=None, index=None):
+        """
+            Ranks candidate developers with the in-memory skill index.
+        The ranking is the same as get_ranked_developers, but candidates are found by
+        intersecting id sets instead of joining the language table.
+        Args:
+            limit (int, optional): Maximum number of developers to return. None returns every candidate.
+            excluded_user_ids (set, optional): Ids that must not be suggested. Defaults to the session's
+                host, participants and interested users.
+            index (DeveloperSkillIndex, optional): Index to rank from. Defaults to the worker index.
+        Returns:
+            list: Developers annotated with match_tier, shared_languages, stack_match and match_score.
+        """
+        try:
+            if excluded_user_ids is None:
+                excluded_user_ids = self.get_excluded_user_ids()
+            ranking = self.rank_from_index(index or get_skill_index(), excluded_user_ids, limit)
+            return self.load_developers(ranking)
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise ValidationError(f"An unexpected error occurred: {str(e)}")
+
+    def get_vector_developers(self, limit=SUGGESTION_LIMIT, excluded_user_ids=None, index=None):
+        """
+            Scores every candidate developer at once with NumPy.
+        The score combines a weighted Jaccard overlap between the developer's languages and the
+        session languages (rarer languages weigh more) with level and stack terms.
+        Args:
+            limit (int, optional): Maximum number of developers to return. None returns every candidate.
+            excluded_user_ids (set, optional): Ids that must not be suggested. Defaults to the session's
+                host, participants and interested users.
+            index (DeveloperSkillIndex, optional): Index to score from. Defaults to the worker index.
+        Returns:
+            list: Developers annotated with match_score and language_overlap, best first.
+        """
         try:
-            session_stack_name = self.session.stack.name
-            session_level_name = self.session.level.name if self.session.level else None
+            if excluded_user_ids is None:
+                excluded_user_ids = self.get_excluded_user_ids()
+            ranking = self.score_from_index(index or get_skill_index(), excluded_user_ids, limit)
+            return self.load_developers(ranking)
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise ValidationError(f"An unexpected error occurred: {str(e)}")
+
+    def score_from_index(self, index, excluded_user_ids, limit=SUGGESTION_LIMIT):
+        taxonomy = get_taxonomy()
+        compatible_stacks = STACK_COMPATIBILITY.get(taxonomy.stack_name(self.session.stack_id))
+        matrix = get_skill_matrix(index)
+
+        scores, overlap = matrix.score(
+            session_language_ids=[language.id for language in self.session.languages.all()],
+            stack_id=self.session.stack_id,
+            compatible_stack_ids=None if compatible_stacks is None else index.stack_ids(compatible_stacks),
+            level_ids=index.level_ids(taxonomy.level_name(self.session.level_id)),
+            excluded_user_ids=excluded_user_ids,
+        )
+        return [
+            (
+                int(matrix.user_ids[row]),
+                {
+                    'match_score': round(float(scores[row]), 4),
+                    'language_overlap': round(float(overlap[row]), 4),
+                },
+            )
+            for row in matrix.top(scores, limit)
+        ]
+
+    def rank_from_index(self, index, excluded_user_ids, limit=SUGGESTION_LIMIT):
+        taxonomy = get_taxonomy()
+        session_stack_id = self.session.stack_id
+        session_level_name = taxonomy.level_name(self.session.level_id)
+        session_language_ids = {language.id for language in self.session.languages.all()}
+        session_languages = language_mask(session_language_ids)
+        compatible_stacks = STACK_COMPATIBILITY.get(taxonomy.stack_name(session_stack_id))
+
+        if compatible_stacks is None:
+            candidates = index.developers() - index.developers(stack_ids={None})
+        else:
+            candidates = index.developers(stack_ids=index.stack_ids(compatible_stacks))
+        candidates -= excluded_user_ids
+
+        if session_language_ids:
+            language_matches = candidates & index.developers(language_ids=session_language_ids)
+        else:
+            language_matches = candidates & index.developers_with_languages()
+        level_matches = index.developers(level_ids=index.level_ids(session_level_name))
+
+        tiers = (
+            (1, language_matches & level_matches),
+            (2, language_matches - level_matches),
+            (3, candidates - language_matches),
+        )
+
+        def annotate(developer_id, match_tier):
+            stack_id, _, languages = index.profile(developer_id)
+            shared_languages = (languages & session_languages).bit_count()
+            stack_match = int(stack_id == session_stack_id)
+            return {
+                'match_tier': match_tier,
+                'shared_languages': shared_languages,
+                'stack_match': stack_match,
+                'match_score': (4 - match_tier) * self.TIER_WEIGHT
+                + shared_languages * self.SHARED_LANGUAGE_WEIGHT
+                + stack_match * self.STACK_MATCH_WEIGHT,
+            }
+
+        def order(item):
+            return -item[1]['match_score'], item[0]
+
+        ranking = []
+        for match_tier, developer_ids in tiers:
+            remaining = None if limit is None else limit - len(ranking)
+            if remaining is not None and remaining <= 0:
+                break
+            scored = [(developer_id, annotate(developer_id, match_tier)) for developer_id in developer_ids]
+            if remaining is None:
+                ranking.extend(sorted(scored, key=order))
+            else:
+                ranking.extend(heapq.nsmallest(remaining, scored, key=order))
+        return ranking
+
+    def get_ranked_developers(self, limit=SUGGESTION_LIMIT, busy_user_ids=()):
+        """
+            Ranks candidate developers for the session in a single ordered query.
+        Every candidate is annotated with:
+            match_tier: 1 when level and languages match, 2 when only languages match, 3 otherwise.
+            shared_languages: number of session languages the developer knows.
+            stack_match: 1 when the developer uses exactly the session stack.
+            match_score: the combined score used for ordering.
+        Args:
+            limit (int, optional): Maximum number of developers to return. None returns every candidate.
+            busy_user_ids (iterable, optional): Additional developer ids to leave out.
+        Returns:
+            QuerySet: Developers ordered by descending match_score.
+        Raises:
+            ValidationError: If the session cannot be ranked.
+        """
+        try:
+            taxonomy = get_taxonomy()
+            session_level_name = taxonomy.level_name(self.session.level_id)
+            compatible_stacks = STACK_COMPATIBILITY.get(taxonomy.stack_name(self.session.stack_id))
+
+            session_languages = Session.languages.through.objects.filter(session_id=self.session.id)
+            interested_user_ids = InterestedParticipant.objects.filter(session_id=self.session.id).values('user_id')
+            participant_user_ids = Session.participants.through.objects.filter(
+                session_id=self.session.id
+            ).values('customuser_id')
+
+            developers = CustomUser.objects.filter(is_staff=False, stack__isnull=False).exclude(
+                id__in=interested_user_ids
+            ).exclude(
+                id__in=participant_user_ids
+            )
+            if self.session.host_id:
+                developers = developers.exclude(id=self.session.host_id)
+            if busy_user_ids:
+                developers = developers.exclude(id__in=list(busy_user_ids))
+            if compatible_stacks is not None:
+                developers = developers.filter(stack__name__in=compatible_stacks)
+
+            language_match = Q(shared_languages__gt=0) | (
+                ~Exists(session_languages) & Q(language_count__gt=0)
+            )
+
+            developers = developers.annotate(
+                shared_languages=Count(
+                    'prog_language',
+                    filter=Q(prog_language__in=session_languages.values('proglanguage_id')),
+                    distinct=True,
+                ),
+                language_count=Count('prog_language', distinct=True),
+            ).annotate(
+                match_tier=Case(
+                    When(language_match & Q(level__name=session_level_name), then=Value(1)),
+                    When(language_match, then=Value(2)),
+                    default=Value(3),
+                    output_field=IntegerField(),
+                ),
+                stack_match=Case(
+                    When(stack_id=self.session.stack_id, then=Value(1)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+            ).annotate(
+                match_score=(4 - F('match_tier')) * self.TIER_WEIGHT
+                + F('shared_languages') * self.SHARED_LANGUAGE_WEIGHT
+                + F('stack_match') * self.STACK_MATCH_WEIGHT
+            ).order_by('-match_score', 'id')
+
+            if limit is not None:
+                developers = developers[:limit]
+            return developers
+
+        except Exception as e:
+            raise ValidationError(f"An unexpected error occurred: {str(e)}")
+
+    def get_phased_developers(self):
+        try:
+            taxonomy = get_taxonomy()
+            session_stack_name = taxonomy.stack_name(self.session.stack_id)
+            session_level_name = taxonomy.level_name(self.session.level_id)
             session_language_names = list(self.session.languages.values_list('name', flat=True))
 
             interested_user_ids = InterestedParticipant.objects.filter(session=self.session).values_list('user_id',
@@ -117,6 +432,107 @@ class DeveloperSuggestionService:
             raise ValidationError(f"An unexpected error occurred: {str(e)}")
 
 
+class BatchDeveloperSuggestionService:
+    ENGINES = ('index', 'vector')
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+
+    @classmethod
+    def for_host(cls, host, session_ids=None):
+        """
+            Loads the sessions to suggest developers for.
+        Args:
+            host (CustomUser): The user asking for suggestions.
+            session_ids (list, optional): Sessions to include, ignoring those hosted by someone
+                else. Defaults to the host's upcoming sessions.
+        """
+        sessions = Session.objects.filter(host=host).select_related('stack', 'level').prefetch_related(
+            'languages',
+            Prefetch('participants', queryset=CustomUser.objects.only('id')),
+        )
+        if session_ids is None:
+            sessions = sessions.filter(schedule_date_time__gte=timezone.now())
+        else:
+            sessions = sessions.filter(id__in=session_ids)
+        return cls(sessions.order_by('schedule_date_time', 'id'))
+
+    def get_suggested_developers(self, limit=DeveloperSuggestionService.SUGGESTION_LIMIT, engine=None,
+                                 available_only=False):
+        """
+            Ranks developers for every session in one pass over the shared candidate pool.
+        Sessions with a cached ranking are served from the cache. For the others, the skill
+        index, their interested users and, when requested, the availability index are loaded
+        once and reused for each session.
+        Args:
+            limit (int, optional): Maximum number of developers per session.
+            engine (str, optional): 'index' or 'vector'. Defaults to settings.DEVELOPER_SUGGESTION_ENGINE,
+                falling back to 'index' when that is the per-request SQL engine.
+            available_only (bool, optional): Skip developers with an overlapping session.
+        Returns:
+            dict: Session id to a list of (developer_id, annotations), best first.
+        """
+        try:
+            engine = engine or settings.DEVELOPER_SUGGESTION_ENGINE
+            if engine == 'sql':
+                engine = 'index'
+            if engine not in self.ENGINES:
+                raise ValidationError(f"Unknown suggestion engine: {engine}")
+
+            rankings, cache_keys, pending = {}, {}, []
+            for session in self.sessions:
+                cache_keys[session.id] = suggestion_cache.make_key(session.id, limit, engine, available_only)
+                ranking = suggestion_cache.get_ranking(cache_keys[session.id])
+                if ranking is None:
+                    pending.append(session)
+                else:
+                    rankings[session.id] = ranking
+            if not pending:
+                return rankings
+
+            session_ids = [session.id for session in pending]
+            index = get_skill_index()
+
+            interested_user_ids = defaultdict(set)
+            for session_id, user_id in InterestedParticipant.objects.filter(
+                session_id__in=session_ids
+            ).values_list('session_id', 'user_id'):
+                interested_user_ids[session_id].add(user_id)
+
+            availability = None
+            if available_only:
+                windows = [DeveloperSuggestionService(session).get_session_window() for session in pending]
+                availability = SessionIntervalIndex.for_window(
+                    min(start for start, _ in windows), max(end for _, end in windows)
+                )
+
+            for session in pending:
+                service = DeveloperSuggestionService(session)
+                excluded_user_ids = interested_user_ids[session.id] | {
+                    participant.id for participant in session.participants.all()
+                }
+                if session.host_id:
+                    excluded_user_ids.add(session.host_id)
+                if availability is not None:
+                    excluded_user_ids |= service.get_busy_user_ids(availability)
+
+                if engine == 'vector':
+                    ranking = service.score_from_index(index, excluded_user_ids, limit)
+                else:
+                    ranking = service.rank_from_index(index, excluded_user_ids, limit)
+                rankings[session.id] = [
+                    (developer_id, {'match_score': annotations['match_score']})
+                    for developer_id, annotations in ranking
+                ]
+                suggestion_cache.set_ranking(cache_keys[session.id], rankings[session.id])
+            return rankings
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise ValidationError(f"An unexpected error occurred: {str(e)}")
+
+
 class InvitationService:
     def __init__(self, session, developer):
         self.session = session
@@ -129,18 +545,110 @@ class InvitationService:
             raise ValidationError(f"Failed to send invitation: {str(e)}")
 
 
+class BulkInvitationService:
+    INVITED = 'invited'
+    FAILED = 'failed'
+
+    def __init__(self, session, developer_ids):
+        """
+        Args:
+            session (Session): The session to invite to, with project__owner selected.
+            developer_ids (list): Developers to invite, without duplicates.
+        """
+        self.session = session
+        self.developer_ids = developer_ids
+
+    def load_developers(self):
+        """Loads every requested developer in one query, flagging current participants."""
+        return CustomUser.objects.filter(id__in=self.developer_ids).annotate(
+            is_participant=Exists(
+                Session.participants.through.objects.filter(
+                    session_id=self.session.id, customuser_id=OuterRef('pk')
+                )
+            )
+        ).only('id', 'username', 'email').in_bulk()
+
+    def send_invitations(self):
+        """
+            Queues one invitation per developer with a single INSERT.
+        Returns:
+            list: One {'developer_id', 'status'[, 'error']} result per requested developer, in order.
+        """
+        developers = self.load_developers()
+        invited = []
+        results = []
+        for developer_id in self.developer_ids:
+            developer = developers.get(developer_id)
+            if developer is None:
+                error = "Developer not found"
+            elif developer.is_participant:
+                error = "Developer is already a participant"
+            else:
+                invited.append(developer)
+                results.append({'developer_id': developer_id, 'status': self.INVITED})
+                continue
+            results.append({'developer_id': developer_id, 'status': self.FAILED, 'error': error})
+
+        try:
+            EmailService.send_invite_emails(self.session, invited)
+        except Exception as e:
+            raise ValidationError(f"Failed to send invitations: {str(e)}")
+        return results
+
+
 class InterestNotificationService:
     def __init__(self, session, interested_user):
         self.session = session
         self.interested_user = interested_user
 
     def send_notification(self):
+        """Queues the owner's email now, or leaves the interest for their next digest if they opted in."""
         try:
-            EmailService.send_interest_notification_email(self.session, self.interested_user)
+            if self.session.project.owner.interest_digest:
+                InterestedParticipant.objects.filter(
+                    session=self.session, user=self.interested_user
+                ).update(pending_digest=True)
+            else:
+                EmailService.send_interest_notification_email(self.session, self.interested_user)
         except Exception as e:
             raise ValidationError(f"Failed to send interest notification: {str(e)}")
 
 
+class InterestDigestService:
+    @staticmethod
+    def queue_digests():
+        """
+            Queues one email per project owner listing the new interested users of each of their
+        sessions, and clears the pending interests it included. Interests locked by a concurrent
+        run are left for the next one.
+        Returns:
+            tuple: (digests queued, interests included)
+        """
+        with transaction.atomic():
+            interests = list(
+                InterestedParticipant.objects.filter(pending_digest=True)
+                .select_related('user', 'session__project__owner')
+                .order_by('session__project__owner_id', 'session_id', 'date_created_interested', 'id')
+                .select_for_update(skip_locked=True, of=('self',))
+            )
+            digests = {}
+            for interest in interests:
+                owner = interest.session.project.owner
+                sessions = digests.setdefault(owner.id, (owner, {}))[1]
+                sessions.setdefault(interest.session.id, (interest.session, []))[1].append(interest.user)
+
+            try:
+                EmailService.send_interest_digest_emails([
+                    (owner, list(sessions.values())) for owner, sessions in digests.values()
+                ])
+            except Exception as e:
+                raise ValidationError(f"Failed to send interest digests: {str(e)}")
+            InterestedParticipant.objects.filter(
+                id__in=[interest.id for interest in interests]
+            ).update(pending_digest=False)
+        return len(digests), len(interests)
+
+
 class ConfirmationNotificationService:
     def __init__(self, session, developer):
         self.session = session
@@ -154,33 +662,115 @@ class ConfirmationNotificationService:
 
 
 class SessionSuggestionService:
+    FEED_LIMIT = 10
+
     def __init__(self, user):
         self.user = user
 
-    def get_suggested_sessions(self):
+    def get_feed(self, include_unavailable=False, prefetch=True, fields=None):
+        """
+        Reads the user's materialized feed, kept up to date by SuggestedSessionFeedService.
+
+        Sessions are annotated with participant_count, interested_count, is_full,
+        is_participant and is_interested in the same statement; unless include_unavailable is
+        set, full sessions and those the user already joined or showed interest in are left
+        out. Without prefetch, only ids and annotations are loaded, for the values-based fast
+        path; with it, `fields` limits what is loaded as in Session.objects.for_serializer().
+        """
+        sessions = Session.objects.filter(
+            suggestions__user=self.user,
+            suggestions__schedule_date_time__gte=timezone.now(),
+        ).annotate(
+            feed_priority=F('suggestions__priority'),
+            feed_schedule_date_time=F('suggestions__schedule_date_time'),
+        ).alias(
+            feed_session_id=F('suggestions__session_id'),
+        )
+        sessions = self.annotate_membership(sessions)
+        if not include_unavailable:
+            sessions = sessions.filter(is_full=False, is_participant=False, is_interested=False)
+        sessions = sessions.order_by('feed_priority', 'feed_schedule_date_time', 'feed_session_id')
+        return sessions.for_serializer(fields) if prefetch else sessions.only('id')
+
+    def annotate_membership(self, sessions):
+        return sessions.with_roles(self.user).with_counts().annotate(
+            is_full=Case(
+                When(participant_limit__gt=0, participant_count__gte=F('participant_limit'), then=True),
+                default=False,
+                output_field=BooleanField()
+            )
+        )
+
+    def get_suggested_sessions(self, include_unavailable=False, prefetch=True, fields=None):
+        try:
+            return self.get_feed(include_unavailable, prefetch, fields)[:self.FEED_LIMIT]
+
+        except Exception as e:
+            raise ValidationError(f"Error retrieving suggested sessions: {str(e)}")
+
+    def get_suggested_sessions_page(self, cursor=None, page_size=FEED_LIMIT, include_unavailable=False, prefetch=True,
+                                    fields=None):
+        """
+        Seeks through the feed past `cursor` on (priority, schedule_date_time, session id).
+        The cursor is compared as one row value on the feed table's columns, which PostgreSQL
+        turns into an index condition on suggested_session_feed_idx, so later pages cost the
+        same as the first.
+
+        :return: (sessions, next_cursor), next_cursor is None on the last page
+        """
+        sessions = self.get_feed(include_unavailable, prefetch, fields)
+        if cursor:
+            priority, schedule_date_time, session_id = self.decode_cursor(cursor)
+            sessions = sessions.filter(GreaterThan(
+                RowValue('feed_priority', 'feed_schedule_date_time', 'feed_session_id'),
+                RowValue(Value(priority), Value(schedule_date_time), Value(session_id)),
+            ))
+        sessions = list(sessions[:page_size + 1])
+        next_cursor = None
+        if len(sessions) > page_size:
+            last = sessions[page_size - 1]
+            next_cursor = self.encode_cursor((last.feed_priority, last.feed_schedule_date_time, last.id))
+        return sessions[:page_size], next_cursor
+
+    @staticmethod
+    def encode_cursor(position):
+        priority, schedule_date_time, session_id = position
+        payload = json.dumps([priority, schedule_date_time.isoformat(), session_id])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            priority, schedule_date_time, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return int(priority), datetime.fromisoformat(schedule_date_time), int(session_id)
+        except (TypeError, ValueError):
+            raise ValidationError("Invalid cursor.")
+
+    def get_ranked_sessions(self):
+        """
+        Ranks every future session sharing a language with the user, used to build the feed.
+        """
         try:
             now = timezone.now()
-            user_stack = self.user.stack
-            user_level = self.user.level
             user_languages = list(self.user.prog_language.all())
 
-            stack_compatible = self.get_stack_compatibility(user_stack)
+            stack_compatible = get_taxonomy().stack_ids(self.get_stack_compatibility(self.user.stack_id))
             sessions = Session.objects.exclude(host=self.user).filter(schedule_date_time__gte=now)
 
             if user_languages:
                 language_filter = Q(languages__in=user_languages)
                 sessions = sessions.filter(language_filter).distinct()
             else:
-                return Session.objects.none()
+                sessions = sessions.none()
 
             sessions = sessions.annotate(
                 priority=Case(
                     When(
-                        Q(level=user_level) & Q(stack__name__in=stack_compatible),
+                        Q(level_id=self.user.level_id) & Q(stack_id__in=stack_compatible),
                         then=1
                     ),
                     When(
-                        Q(stack__name__in=stack_compatible),
+                        Q(stack_id__in=stack_compatible),
                         then=2
                     ),
                     default=3,
@@ -188,23 +778,93 @@ class SessionSuggestionService:
                 )
             )
 
-            sessions = sessions.filter(priority__lte=3)
-            sessions = sessions.order_by('priority', 'schedule_date_time')
-            suggested_sessions = sessions.select_related('level', 'stack').prefetch_related('languages').distinct()[:10]
-
-            return suggested_sessions
+            return sessions.order_by('priority', 'schedule_date_time', 'id')
 
         except Exception as e:
-            raise ValidationError(f"Error retrieving suggested sessions: {str(e)}")
-
-    def get_stack_compatibility(self, user_stack):
-        stack_mapping = {
-            'Fullstack': ['Fullstack', 'Frontend', 'Backend'],
-            'Frontend': ['Frontend', 'Fullstack'],
-            'Backend': ['Backend', 'Fullstack'],
-        }
-        stack_mapping.get(user_stack, [])
-        return stack_mapping.get(user_stack, [])
+            raise ValidationError(f"Error ranking suggested sessions: {str(e)}")
+
+    def get_stack_compatibility(self, user_stack_id):
+        return STACK_COMPATIBILITY.get(get_taxonomy().stack_name(user_stack_id), [])
+
+
+class SuggestedSessionFeedService:
+    """
+    Maintains the SuggestedSession table, one row per (user, future session) pair sharing a
+    language, carrying the same priority SessionSuggestionService ranks sessions by.
+    """
+
+    BATCH_SIZE = 1000
+
+    @classmethod
+    def refresh_user(cls, user):
+        SuggestedSession.objects.filter(user=user).delete()
+        sessions = SessionSuggestionService(user).get_ranked_sessions()
+        SuggestedSession.objects.bulk_create(
+            (
+                SuggestedSession(
+                    user_id=user.id,
+                    session_id=session_id,
+                    priority=priority,
+                    schedule_date_time=schedule_date_time,
+                )
+                for session_id, priority, schedule_date_time
+                in sessions.values_list('id', 'priority', 'schedule_date_time')
+            ),
+            batch_size=cls.BATCH_SIZE,
+        )
+
+    @classmethod
+    def refresh_session(cls, session):
+        SuggestedSession.objects.filter(session_id=session.id).delete()
+        # Re-read the row: a freshly saved instance may still hold unparsed field values.
+        session = Session.objects.filter(id=session.id, schedule_date_time__gte=timezone.now()).first()
+        if session is None:
+            return
+
+        taxonomy = get_taxonomy()
+        stack_name = taxonomy.stack_name(session.stack_id)
+        compatible_stacks = taxonomy.stack_ids(
+            user_stack for user_stack, session_stacks in STACK_COMPATIBILITY.items()
+            if stack_name in session_stacks
+        )
+        level_match = Q(level_id=session.level_id) if session.level_id else Q(level__isnull=True)
+
+        developers = CustomUser.objects.filter(
+            prog_language__in=session.languages.values('id')
+        ).exclude(
+            id=session.host_id
+        ).annotate(
+            priority=Case(
+                When(level_match & Q(stack_id__in=compatible_stacks), then=1),
+                When(Q(stack_id__in=compatible_stacks), then=2),
+                default=3,
+                output_field=IntegerField()
+            )
+        ).values_list('id', 'priority').distinct()
+
+        SuggestedSession.objects.bulk_create(
+            (
+                SuggestedSession(
+                    user_id=user_id,
+                    session_id=session.id,
+                    priority=priority,
+                    schedule_date_time=session.schedule_date_time,
+                )
+                for user_id, priority in developers
+            ),
+            batch_size=cls.BATCH_SIZE,
+        )
+
+    @classmethod
+    def rebuild_all(cls):
+        """
+        Rebuilds the whole table from the future sessions, returning the number of rows written.
+        """
+        SuggestedSession.objects.all().delete()
+        sessions = Session.objects.filter(schedule_date_time__gte=timezone.now()).order_by('id')
+        for session in sessions.only('id').iterator():
+            cls.refresh_session(session)
+        return SuggestedSession.objects.count()
 
 
 class SessionCreationService:
@@ -0,0 +1,229 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from skills.models import Level, ProgLanguage, Stack
+from users.models import CustomUser
+from users.skill_index import saves_skills
+from . import suggestion_cache
+from .models import InterestedParticipant, Project, Session
+from .services import SuggestedSessionFeedService
+
+FEED_FIELDS = ('stack_id', 'level_id')
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def invalidate_suggestions_on_session_change(sender, instance, **kwargs):
+    suggestion_cache.invalidate_session(instance.id)
+
+
+@receiver(m2m_changed, sender=Session.participants.through)
+def invalidate_suggestions_on_participants_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        session_ids = pk_set if action != 'pre_clear' else instance.sessions_joined.values_list('id', flat=True)
+    else:
+        session_ids = [instance.pk]
+    for session_id in session_ids:
+        suggestion_cache.invalidate_session(session_id)
+
+
+@receiver(m2m_changed, sender=Session.languages.through)
+def invalidate_suggestions_on_languages_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        session_ids = pk_set if action != 'pre_clear' else instance.session_set.values_list('id', flat=True)
+    else:
+        session_ids = [instance.pk]
+    for session_id in session_ids:
+        suggestion_cache.invalidate_session(session_id)
+
+
+def refresh_feed_of_sessions(session_ids):
+    """
+    Rebuilds the sessions' feed rows once the transaction commits. A refresh rewrites a row per
+    matching developer, so the write that triggered it does not wait for it.
+    """
+    session_ids = list(session_ids)
+
+    def refresh():
+        for session in Session.objects.filter(id__in=session_ids).only('id'):
+            SuggestedSessionFeedService.refresh_session(session)
+
+    transaction.on_commit(refresh)
+
+
+def refresh_feed_of_users(user_ids):
+    """Rebuilds the users' feed rows once the transaction commits."""
+    user_ids = list(user_ids)
+
+    def refresh():
+        for user in CustomUser.objects.filter(id__in=user_ids).select_related('stack'):
+            SuggestedSessionFeedService.refresh_user(user)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Session)
+def refresh_feed_on_session_save(sender, instance, **kwargs):
+    refresh_feed_of_sessions([instance.id])
+
+
+@receiver(m2m_changed, sender=Session.languages.through)
+def refresh_feed_on_session_languages_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action == 'pre_clear':
+            instance._feed_session_ids = list(instance.session_set.values_list('id', flat=True))
+            return
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        refresh_feed_of_sessions(pk_set if action != 'post_clear' else getattr(instance, '_feed_session_ids', []))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        refresh_feed_of_sessions([instance.id])
+
+
+@receiver(post_save, sender=InterestedParticipant)
+@receiver(post_delete, sender=InterestedParticipant)
+def invalidate_suggestions_on_interest_change(sender, instance, **kwargs):
+    suggestion_cache.invalidate_session(instance.session_id)
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_developer_skills(sender, instance, update_fields=None, **kwargs):
+    """Reads the stored skills only for saves that can change them, rather than on every load."""
+    instance._feed_skills = None
+    if instance._state.adding or not saves_skills(update_fields):
+        return
+    instance._feed_skills = CustomUser.objects.filter(pk=instance.pk).values_list(*FEED_FIELDS).first()
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_feed_on_developer_change(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Suggested developers need no receiver here: their cache keys embed the skill index
+    generation, which users.signals renews when a developer's skills change.
+    """
+    if created or not saves_skills(update_fields):
+        return
+    if tuple(getattr(instance, field) for field in FEED_FIELDS) != getattr(instance, '_feed_skills', None):
+        refresh_feed_of_users([instance.id])
+
+
+@receiver(m2m_changed, sender=CustomUser.prog_language.through)
+def refresh_feed_on_developer_languages_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action == 'pre_clear':
+            instance._feed_user_ids = list(instance.customuser_set.values_list('id', flat=True))
+            return
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        refresh_feed_of_users(pk_set if action != 'post_clear' else getattr(instance, '_feed_user_ids', []))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        refresh_feed_of_users([instance.id])
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def touch_project_on_session_change(sender, instance, **kwargs):
+    Project.objects.filter(id=instance.project_id).touch()
+
+
+@receiver(post_save, sender=Project)
+def touch_sessions_on_project_change(sender, instance, created, **kwargs):
+    """Sessions render their project's name and image."""
+    if not created:
+        Session.objects.filter(project=instance).touch()
+
+
+@receiver(m2m_changed, sender=Session.participants.through)
+@receiver(m2m_changed, sender=Session.languages.through)
+def touch_sessions_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        sessions = Session.objects.filter(id=instance.pk)
+    elif action == 'pre_clear':
+        related = {f'{instance._meta.model_name}_id': instance.pk}
+        sessions = Session.objects.filter(id__in=sender.objects.filter(**related).values('session_id'))
+    else:
+        sessions = Session.objects.filter(id__in=pk_set)
+    sessions.touch()
+
+
+@receiver(m2m_changed, sender=Project.languages.through)
+def touch_projects_on_languages_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        projects = Project.objects.filter(id=instance.pk)
+    elif action == 'pre_clear':
+        projects = Project.objects.filter(languages=instance)
+    else:
+        projects = Project.objects.filter(id__in=pk_set)
+    projects.touch()
+
+
+@receiver(post_save, sender=InterestedParticipant)
+@receiver(post_delete, sender=InterestedParticipant)
+def touch_session_on_interest_change(sender, instance, **kwargs):
+    Session.objects.filter(id=instance.session_id).touch()
+
+
+def touch_developer_content(user):
+    """Sessions and projects render their host, owner and participants nested."""
+    Session.objects.filter(Q(host=user) | Q(participants=user)).touch()
+    Project.objects.filter(owner=user).touch()
+
+
+@receiver(post_save, sender=CustomUser)
+def touch_content_on_developer_change(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    touch_developer_content(instance)
+
+
+@receiver(pre_delete, sender=CustomUser)
+def touch_content_on_developer_delete(sender, instance, **kwargs):
+    """
+    Deleting a user drops their participations and clears hosts without sending signals, so
+    the affected rows are touched while they can still be found.
+    """
+    touch_developer_content(instance)
+
+
+@receiver(m2m_changed, sender=CustomUser.prog_language.through)
+def touch_content_on_developer_languages_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch_developer_content(instance)
+        return
+    users = instance.customuser_set.all() if action == 'pre_clear' else CustomUser.objects.filter(id__in=pk_set)
+    Session.objects.filter(Q(host__in=users) | Q(participants__in=users)).touch()
+    Project.objects.filter(owner__in=users).touch()
+
+
+@receiver(post_save, sender=Stack)
+@receiver(post_save, sender=Level)
+@receiver(post_save, sender=ProgLanguage)
+@receiver(pre_delete, sender=Stack)
+@receiver(pre_delete, sender=Level)
+@receiver(pre_delete, sender=ProgLanguage)
+def touch_content_on_skill_change(sender, instance, created=False, **kwargs):
+    """
+    Projects, sessions and the developers nested in them render skill names. Deletes are
+    handled before the rows referencing the skill are cleared.
+    """
+    if created:
+        return
+    field = 'languages' if sender is ProgLanguage else sender._meta.model_name
+    developer_field = 'prog_language' if sender is ProgLanguage else field
+    developers = CustomUser.objects.filter(**{developer_field: instance}).values('id')
+    Session.objects.filter(
+        Q(**{field: instance}) | Q(host__in=developers) | Q(participants__in=developers)
+    ).touch()
+    Project.objects.filter(Q(**{field: instance}) | Q(owner__in=developers)).touch()
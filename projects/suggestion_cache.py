@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from pair_connect.cache import bump, make_key as make_generation_key
+from users.skill_index import GENERATION as SKILL_INDEX_GENERATION
+from .models import Session
+
+SESSION_GENERATION = 'projects.suggested_developers:{session_id}'
+HITS_KEY = 'suggested_developers:hits'
+MISSES_KEY = 'suggested_developers:misses'
+
+
+def _count(key):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def session_generation(session_id):
+    return SESSION_GENERATION.format(session_id=session_id)
+
+
+def make_key(session_id, limit, engine, available_only):
+    """
+    Builds the cache key for a session's suggestions.
+
+    The key embeds the generation of the session's suggestions and the skill index generation,
+    which changes whenever a developer's indexed skills do, plus the Session generation when
+    availability is checked, so a change to any of them makes older entries unreachable.
+    """
+    generations = [session_generation(session_id), SKILL_INDEX_GENERATION]
+    if available_only:
+        generations.append(Session)
+    return make_generation_key('suggested_developers', generations, session_id, engine, limit)
+
+
+def get_ranking(key):
+    ranking = cache.get(key)
+    _count(MISSES_KEY if ranking is None else HITS_KEY)
+    return ranking
+
+
+def set_ranking(key, ranking):
+    cache.set(key, ranking, timeout=settings.SUGGESTED_DEVELOPERS_CACHE_TIMEOUT)
+
+
+def invalidate_session(session_id):
+    bump(session_generation(session_id))
+
+
+def get_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / lookups, 4) if lookups else None,
+    }
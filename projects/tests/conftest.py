@@ -1,8 +1,25 @@
 import pytest
 from django.core import mail
+from django.core.cache import cache
+
+from users.skill_index import skill_index
 
 
 @pytest.fixture(autouse=True)
 def enable_mail_testing(settings):
     settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
     mail.outbox = []
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_skill_index():
+    skill_index.reset()
+    yield
+    skill_index.reset()
@@ -1,14 +1,32 @@
+import os
+from importlib import import_module
+import random
+import smtplib
+from io import StringIO
 import pytest
 from rest_framework import status
+from rest_framework.response import Response
 from templated_mail import mail
 from django.core import mail
+from django.core.mail.backends import locmem
+from django.apps import apps
+from django.template import engines
+from django.template.loaders import cached
 import json
+from pair_connect.email_templates import find_email_templates
+from pair_connect.pagination import DefaultCursorPagination
 from projects.serializers import ProjectSerializer
 from users.models import CustomUser
-from projects.models import Project, Session, InterestedParticipant
+from projects.models import Project, Session, InterestedParticipant, OutboxEmail, SuggestedSession
+from projects.email_service import EmailService
+from projects.services import DeveloperSuggestionService, SessionSuggestionService, SuggestedSessionFeedService
 from skills.models import Stack, Level, ProgLanguage
 from datetime import datetime, timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.module_loading import import_string
 from datetime import timedelta
 
 
@@ -441,7 +459,8 @@ def test_confirm_participant_success(client):
     Given I am the host of a session
     And a developer is interested in the session
     When I confirm the developer as a participant
-    Then the developer should be added as a participant and receive a confirmation email
+    Then the developer should be added as a participant and a confirmation email queued
+    And the outbox worker sends it
     """
     # Given: I am the host of a session
     host = CustomUser.objects.create_user(
@@ -478,10 +497,15 @@ def test_confirm_participant_success(client):
     data = {'username': developer.username}
     response = client.post(url, data)
 
-    # Then: The developer should be added as a participant and receive a confirmation email
+    # Then: The developer should be added as a participant and a confirmation email queued
     assert response.status_code == status.HTTP_200_OK
     assert 'confirmed' in response.data['message'].lower()
     assert session.participants.filter(id=developer.id).exists()
+    assert OutboxEmail.objects.filter(kind='confirmation', status=OutboxEmail.PENDING).count() == 1
+    assert len(mail.outbox) == 0
+
+    # And: The outbox worker sends it
+    call_command('send_outbox_emails', '--once')
     assert len(mail.outbox) == 1
     email = mail.outbox[0]
     assert developer.email in email.to
@@ -548,7 +572,8 @@ def test_express_interest_in_session(client):
     Given a session exists
     And I am an authenticated user
     When I express interest in the session
-    Then I should receive a success message and an interest notification email should be sent
+    Then I should receive a success message and an interest notification email should be queued
+    And the outbox worker sends it to the host
     """
     # Given: A session exists and I am an authenticated user
     host = CustomUser.objects.create_user(
@@ -583,12 +608,1560 @@ def test_express_interest_in_session(client):
     data = {'session': session.id}
     response = client.post(url, data)
 
-    # Then: I should receive a success message and an interest notification email should be sent
+    # Then: I should receive a success message and an interest notification email should be queued
     assert response.status_code == status.HTTP_201_CREATED
+    assert OutboxEmail.objects.filter(kind='interest_notification').count() == 1
+    assert len(mail.outbox) == 0
+
+    # And: The outbox worker sends it to the host
+    call_command('send_outbox_emails', '--once')
     assert len(mail.outbox) == 1
     email = mail.outbox[0]
     assert host.email in email.to
     assert 'interesadx' in email.subject.lower()
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('seed', [1, 2, 3, 4])
+def test_ranked_developers_match_phased_suggestions(seed):
+    """
+    Scenario: The single-query ranking returns the same candidates as the three-phase lookup
+    Given a randomly generated pool of developers and a session
+    When I compare the ranked engine with the phased engine
+    Then both return developers from the same tiers and the same fully included tiers
+    """
+    # Given: a randomly generated pool of developers and a session
+    rng = random.Random(seed)
+    stacks = [Stack.objects.get_or_create(name=name)[0] for name in ('Backend', 'Frontend', 'Fullstack')]
+    levels = [Level.objects.get_or_create(name=name)[0] for name in ('Junior', 'Senior')]
+    languages = [ProgLanguage.objects.get_or_create(name=name)[0] for name in ('Python', 'JavaScript', 'Go', 'Rust')]
+
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    project = Project.objects.create(owner=host, name='Generated Project', stack=stacks[2], level=levels[0])
+    session = Session.objects.create(
+        project=project,
+        host=host,
+        stack=rng.choice(stacks),
+        level=rng.choice(levels),
+        schedule_date_time=datetime.now(),
+    )
+    session.languages.set(rng.sample(languages, rng.randint(0, 2)))
+
+    for index in range(40):
+        developer = CustomUser.objects.create_user(
+            username=f'dev{index}',
+            email=f'dev{index}@example.com',
+            stack=rng.choice(stacks + [None]),
+            level=rng.choice(levels + [None]),
+            is_staff=rng.random() < 0.1,
+        )
+        developer.prog_language.set(rng.sample(languages, rng.randint(0, 3)))
+        if rng.random() < 0.1:
+            InterestedParticipant.objects.create(user=developer, session=session)
+        elif rng.random() < 0.1:
+            session.participants.add(developer)
+
+    service = DeveloperSuggestionService(session)
+    tiers = {developer.id: developer.match_tier for developer in service.get_ranked_developers(limit=None)}
+
+    # When: I compare the ranked engine with the phased engine
+    phased = [developer.id for developer in service.get_phased_developers()]
+    ranked = [developer.id for developer in service.get_ranked_developers(limit=len(phased))]
+
+    # Then: both return developers from the same tiers and the same fully included tiers
+    assert set(phased) <= set(tiers)
+    assert sorted(tiers[developer_id] for developer_id in ranked) == sorted(tiers[developer_id] for developer_id in phased)
+    boundary_tier = max((tiers[developer_id] for developer_id in phased), default=0)
+    assert {developer_id for developer_id in ranked if tiers[developer_id] < boundary_tier} == \
+        {developer_id for developer_id in phased if tiers[developer_id] < boundary_tier}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('seed', [1, 2, 3, 4])
+def test_indexed_developers_match_ranked_developers(seed):
+    """
+    Scenario: The skill index ranks developers exactly like the SQL engine
+    Given a randomly generated pool of developers and a session
+    When I rank developers with the in-memory skill index
+    Then I should get the same developers, in the same order, as the SQL ranking
+    """
+    # Given: a randomly generated pool of developers and a session
+    rng = random.Random(seed)
+    stacks = [Stack.objects.get_or_create(name=name)[0] for name in ('Backend', 'Frontend', 'Fullstack')]
+    levels = [Level.objects.get_or_create(name=name)[0] for name in ('Junior', 'Senior')]
+    languages = [ProgLanguage.objects.get_or_create(name=name)[0] for name in ('Python', 'JavaScript', 'Go', 'Rust')]
+
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    project = Project.objects.create(owner=host, name='Generated Project', stack=stacks[2], level=levels[0])
+    session = Session.objects.create(
+        project=project,
+        host=host,
+        stack=rng.choice(stacks),
+        level=rng.choice(levels),
+        schedule_date_time=datetime.now(),
+    )
+    session.languages.set(rng.sample(languages, rng.randint(0, 2)))
+
+    for index in range(40):
+        developer = CustomUser.objects.create_user(
+            username=f'dev{index}',
+            email=f'dev{index}@example.com',
+            stack=rng.choice(stacks + [None]),
+            level=rng.choice(levels + [None]),
+            is_staff=rng.random() < 0.1,
+        )
+        developer.prog_language.set(rng.sample(languages, rng.randint(0, 3)))
+        if rng.random() < 0.1:
+            InterestedParticipant.objects.create(user=developer, session=session)
+
+    service = DeveloperSuggestionService(session)
+
+    # When: I rank developers with the in-memory skill index
+    indexed = service.get_indexed_developers(limit=None)
+
+    # Then: I should get the same developers, in the same order, as the SQL ranking
+    ranked = list(service.get_ranked_developers(limit=None))
+    assert [developer.id for developer in indexed] == [developer.id for developer in ranked]
+    assert [developer.match_score for developer in indexed] == [developer.match_score for developer in ranked]
+
+
+@pytest.mark.django_db
+def test_vector_scoring_ranks_best_overlap_first(client):
+    """
+    Scenario: Vectorized scoring ranks developers by language overlap, level and stack
+    Given a session using Python and Go at Junior level
+    And developers with different overlaps with the session
+    When I request suggested developers with the vector engine and a limit
+    Then the developer sharing every language at the same level comes first
+    And every developer carries a score, best first, within the limit
+    """
+    # Given: a session using Python and Go at Junior level
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    fullstack, _ = Stack.objects.get_or_create(name='Fullstack')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    senior, _ = Level.objects.get_or_create(name='Senior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    go, _ = ProgLanguage.objects.get_or_create(name='Go')
+    rust, _ = ProgLanguage.objects.get_or_create(name='Rust')
+
+    project = Project.objects.create(owner=host, name='Vector Project', stack=backend, level=junior)
+    session = Session.objects.create(
+        project=project, host=host, stack=backend, level=junior, schedule_date_time=datetime.now()
+    )
+    session.languages.set([python, go])
+
+    # And: developers with different overlaps with the session
+    def developer(username, stack, level, languages):
+        user = CustomUser.objects.create_user(
+            username=username, email=f'{username}@example.com', stack=stack, level=level
+        )
+        user.prog_language.set(languages)
+        return user
+
+    best = developer('best', backend, junior, [python, go])
+    developer('partial', fullstack, junior, [python, rust])
+    developer('senior', backend, senior, [go])
+    developer('nolanguages', backend, senior, [])
+    frontend_only = developer('frontend', frontend, junior, [python, go])
+
+    # When: I request suggested developers with the vector engine and a limit
+    url = f'/api/projects/sessions/{session.id}/suggested-developers/?engine=vector&limit=3'
+    response = client.get(url)
+
+    # Then: the developer sharing every language at the same level comes first
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data[0]['id'] == best.id
+
+    # And: every developer carries a score, best first, within the limit
+    scores = [developer_data['match_score'] for developer_data in response.data]
+    assert len(response.data) == 3
+    assert scores == sorted(scores, reverse=True)
+    assert frontend_only.id not in [developer_data['id'] for developer_data in response.data]
+    assert client.get(f'/api/projects/sessions/{session.id}/suggested-developers/?limit=0').status_code == \
+        status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('engine', ['index', 'sql', 'vector'])
+def test_suggested_developers_available_only_skips_double_booked(client, engine):
+    """
+    Scenario: Availability-aware suggestions leave out double-booked developers
+    Given a session from 10:00 to 12:00
+    And one developer joined an overlapping session and another hosts one
+    And a third developer only has a session after this one ends
+    When I request suggested developers that are available
+    Then only the developer without an overlapping session is suggested
+    """
+    # Given: a session from 10:00 to 12:00
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    project = Project.objects.create(owner=host, name='Busy Project', stack=stack, level=level)
+    start = datetime(2030, 1, 1, 10, 0)
+    session = Session.objects.create(
+        project=project, host=host, stack=stack, level=level, schedule_date_time=start, duration=timedelta(hours=2)
+    )
+    session.languages.add(python)
+
+    developers = {}
+    for username in ('participant', 'organizer', 'free'):
+        developers[username] = CustomUser.objects.create_user(
+            username=username, email=f'{username}@example.com', stack=stack, level=level
+        )
+        developers[username].prog_language.add(python)
+
+    # And: one developer joined an overlapping session and another hosts one
+    overlapping = Session.objects.create(
+        project=project, host=host, stack=stack, schedule_date_time=start + timedelta(hours=1)
+    )
+    overlapping.participants.add(developers['participant'])
+    Session.objects.create(
+        project=project, host=developers['organizer'], stack=stack, schedule_date_time=start - timedelta(hours=1)
+    )
+
+    # And: a third developer only has a session after this one ends
+    later = Session.objects.create(
+        project=project, host=host, stack=stack, schedule_date_time=start + timedelta(hours=2)
+    )
+    later.participants.add(developers['free'])
+
+    # When: I request suggested developers that are available
+    url = f'/api/projects/sessions/{session.id}/suggested-developers/?engine={engine}'
+    everyone = client.get(url)
+    available = client.get(f'{url}&available_only=true')
+
+    # Then: only the developer without an overlapping session is suggested
+    assert {developer['id'] for developer in everyone.data} == {developer.id for developer in developers.values()}
+    assert [developer['id'] for developer in available.data] == [developers['free'].id]
+
+
+@pytest.mark.django_db
+def test_batch_suggested_developers_for_upcoming_hosted_sessions(client):
+    """
+    Scenario: A host gets suggestions for all upcoming sessions in one call
+    Given I host two upcoming sessions and one past session
+    And there are developers matching the sessions
+    When I request batch suggestions without session ids
+    Then I get suggestions keyed by each upcoming session id
+    And each list matches the single-session suggestions
+    """
+    # Given: I host two upcoming sessions and one past session
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    javascript, _ = ProgLanguage.objects.get_or_create(name='JavaScript')
+    project = Project.objects.create(owner=host, name='Batch Project', stack=backend, level=level)
+
+    upcoming = []
+    for offset, stack, language in ((1, backend, python), (2, frontend, javascript)):
+        session = Session.objects.create(
+            project=project, host=host, stack=stack, level=level,
+            schedule_date_time=datetime.now() + timedelta(days=offset),
+        )
+        session.languages.add(language)
+        upcoming.append(session)
+    Session.objects.create(
+        project=project, host=host, stack=backend, level=level, schedule_date_time=datetime.now() - timedelta(days=1)
+    )
+
+    # And: there are developers matching the sessions
+    for index in range(8):
+        developer = CustomUser.objects.create_user(
+            username=f'dev{index}', email=f'dev{index}@example.com',
+            stack=backend if index % 2 else frontend, level=level,
+        )
+        developer.prog_language.add(python if index % 3 else javascript)
+    InterestedParticipant.objects.create(user=CustomUser.objects.get(username='dev1'), session=upcoming[0])
+
+    # When: I request batch suggestions without session ids
+    response = client.get('/api/projects/sessions/suggested-developers/')
+
+    # Then: I get suggestions keyed by each upcoming session id
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data) == {str(session.id) for session in upcoming}
+
+    # And: each list matches the single-session suggestions
+    for session in upcoming:
+        single = client.get(f'/api/projects/sessions/{session.id}/suggested-developers/')
+        assert response.data[str(session.id)] == single.data
+
+
+@pytest.mark.django_db
+def test_batch_suggested_developers_ignore_other_hosts_sessions(client):
+    """
+    Scenario: Batch suggestions are limited to the sessions I host
+    Given I host a session and another host has a session
+    When I request batch suggestions for both session ids
+    Then I only get suggestions for my session
+    """
+    # Given: I host a session and another host has a session
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    other_host = CustomUser.objects.create_user(username='other', email='other@example.com')
+    _, [mine] = create_listed_sessions(host, 1)
+    _, [theirs] = create_listed_sessions(other_host, 1, participants=0)
+    authenticate_client(client, host)
+
+    # When: I request batch suggestions for both session ids
+    response = client.get(f'/api/projects/sessions/suggested-developers/?session_ids={mine.id},{theirs.id}')
+
+    # Then: I only get suggestions for my session
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data) == {str(mine.id)}
+
+
+@pytest.mark.django_db
+def test_batch_suggested_developers_match_single_session_without_stack(client):
+    """
+    Scenario: A session without a stack gets the same suggestions from both endpoints
+    Given I host an upcoming session without a stack
+    And there are developers with and without a stack
+    When I request batch suggestions
+    Then the session's list matches the single-session suggestions, which accept any stack
+    """
+    # Given: I host an upcoming session without a stack
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    project = Project.objects.create(owner=host, name='Stackless Project', stack=backend, level=level)
+    session = Session.objects.create(
+        project=project, host=host, stack=None, level=level, schedule_date_time=datetime.now() + timedelta(days=1)
+    )
+
+    # And: there are developers with and without a stack
+    for name, stack in (('backend', backend), ('frontend', frontend), ('nostack', None)):
+        CustomUser.objects.create_user(username=name, email=f'{name}@example.com', stack=stack, level=level)
+
+    # When: I request batch suggestions
+    response = client.get('/api/projects/sessions/suggested-developers/')
+
+    # Then: the session's list matches the single-session suggestions, which accept any stack
+    single = client.get(f'/api/projects/sessions/{session.id}/suggested-developers/')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data[str(session.id)] == single.data
+    assert {developer['username'] for developer in single.data} == {'backend', 'frontend'}
+
+
+@pytest.mark.django_db
+def test_suggested_developers_cache_hits_and_invalidation(client, django_capture_on_commit_callbacks):
+    """
+    Scenario: Suggested developers are cached per session and invalidated precisely
+    Given a session with two matching developers
+    When I request the suggestions twice
+    Then the second request is served from the cache
+    When one developer shows interest in the session
+    Then the next suggestions no longer include that developer
+    When the other developer changes stack
+    Then the next suggestions reflect the new developer pool
+    """
+    # Given: a session with two matching developers
+    host = CustomUser.objects.create_user(
+        username='host', email='host@example.com', password='password123', is_staff=True
+    )
+    authenticate_client(client, host)
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    project = Project.objects.create(owner=host, name='Cached Project', stack=backend, level=level)
+    session = Session.objects.create(
+        project=project, host=host, stack=backend, level=level, schedule_date_time=datetime.now()
+    )
+    session.languages.add(python)
+    interested, switcher = [
+        CustomUser.objects.create_user(username=name, email=f'{name}@example.com', stack=backend, level=level)
+        for name in ('interested', 'switcher')
+    ]
+    url = f'/api/projects/sessions/{session.id}/suggested-developers/?engine=sql'
+
+    # When: I request the suggestions twice
+    first = client.get(url)
+    second = client.get(url)
+
+    # Then: the second request is served from the cache
+    assert first.data == second.data
+    stats = client.get('/api/projects/sessions/suggested-developers/cache-stats/').data
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+    # When: one developer shows interest in the session
+    InterestedParticipant.objects.create(user=interested, session=session)
+
+    # Then: the next suggestions no longer include that developer
+    assert [developer['id'] for developer in client.get(url).data] == [switcher.id]
+
+    # When: the other developer changes stack
+    with django_capture_on_commit_callbacks(execute=True):
+        switcher.stack = frontend
+        switcher.save()
+
+    # Then: the next suggestions reflect the new developer pool
+    assert client.get(url).data == []
+
+
+@pytest.mark.django_db
+def test_suggested_developers_cached_before_commit_are_not_served_after(client, django_capture_on_commit_callbacks):
+    """
+    Scenario: Suggestions ranked before a developer change commits are not served once it has
+    Given a session with a matching developer, whose suggestions have been requested
+    When the developer changes stack and suggestions are ranked before the change commits
+    Then the ranking still comes from the skill index as it was
+    And once the change commits the next suggestions reflect it
+    """
+    # Given: a session with a matching developer, whose suggestions have been requested
+    host = CustomUser.objects.create_user(
+        username='host', email='host@example.com', password='password123', is_staff=True
+    )
+    authenticate_client(client, host)
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    project = Project.objects.create(owner=host, name='Racy Project', stack=backend, level=level)
+    session = Session.objects.create(
+        project=project, host=host, stack=backend, level=level, schedule_date_time=datetime.now()
+    )
+    developer = CustomUser.objects.create_user(username='dev', email='dev@example.com', stack=backend, level=level)
+    url = f'/api/projects/sessions/{session.id}/suggested-developers/?engine=index'
+    client.get(url)
+
+    # When: the developer changes stack and suggestions are ranked before the change commits
+    with django_capture_on_commit_callbacks(execute=True):
+        developer.stack = frontend
+        developer.save()
+        ranked_before_commit = client.get(url).data
+
+    # Then: the ranking still comes from the skill index as it was
+    assert [suggested['id'] for suggested in ranked_before_commit] == [developer.id]
+
+    # And: once the change commits the next suggestions reflect it
+    assert client.get(url).data == []
+
+
+@pytest.mark.django_db
+def test_suggested_sessions_feed_follows_sessions_and_profiles(client, django_capture_on_commit_callbacks):
+    """
+    Scenario: The materialized suggested sessions feed stays in step with the live ranking
+    Given a developer and sessions with different stacks and levels
+    When I request my suggested sessions
+    Then they are ordered like the live ranking
+    When I change my stack and a session drops my language
+    Then the feed reflects both changes
+    When the feed table is rebuilt from scratch
+    Then the suggestions are unchanged
+    When the backfill migration fills an emptied feed table
+    Then the suggestions are unchanged
+    """
+    # Given: a developer and sessions with different stacks and levels
+    with django_capture_on_commit_callbacks(execute=True):
+        backend, _ = Stack.objects.get_or_create(name='Backend')
+        frontend, _ = Stack.objects.get_or_create(name='Frontend')
+        junior, _ = Level.objects.get_or_create(name='Junior')
+        senior, _ = Level.objects.get_or_create(name='Senior')
+        python, _ = ProgLanguage.objects.get_or_create(name='Python')
+        host = CustomUser.objects.create_user(username='host', email='host@example.com')
+        developer = CustomUser.objects.create_user(
+            username='developer', email='developer@example.com', password='password123', stack=backend, level=junior
+        )
+        developer.prog_language.add(python)
+        authenticate_client(client, developer)
+        project = Project.objects.create(owner=host, name='Feed Project', stack=backend, level=junior)
+        start = datetime.now() + timedelta(days=1)
+        sessions = []
+        for offset, (stack, level) in enumerate([
+            (frontend, junior), (backend, senior), (backend, junior), (frontend, senior), (None, junior)
+        ]):
+            session = Session.objects.create(
+                project=project, host=host, stack=stack, level=level,
+                schedule_date_time=start + timedelta(hours=offset)
+            )
+            session.languages.add(python)
+            sessions.append(session)
+        Session.objects.create(project=project, host=host, stack=backend, level=junior,
+                               schedule_date_time=start - timedelta(days=2)).languages.add(python)
+
+    def feed_ids():
+        response = client.get(reverse('suggested_sessions'))
+        assert response.status_code == status.HTTP_200_OK
+        return [session['id'] for session in response.data]
+
+    def live_ids():
+        ranked = SessionSuggestionService(CustomUser.objects.get(id=developer.id)).get_ranked_sessions()
+        return list(ranked.values_list('id', flat=True)[:SessionSuggestionService.FEED_LIMIT])
+
+    # When: I request my suggested sessions
+    # Then: they are ordered like the live ranking
+    assert feed_ids() == live_ids() == [sessions[2].id, sessions[1].id, sessions[0].id, sessions[3].id, sessions[4].id]
+
+    # When: I change my stack and a session drops my language
+    with django_capture_on_commit_callbacks(execute=True):
+        developer.stack = frontend
+        developer.save()
+        sessions[3].languages.remove(python)
+
+    # Then: the feed reflects both changes
+    assert feed_ids() == live_ids() == [sessions[0].id, sessions[1].id, sessions[2].id, sessions[4].id]
+
+    # When: the feed table is rebuilt from scratch
+    call_command('rebuild_suggested_sessions', stdout=open(os.devnull, 'w'))
+
+    # Then: the suggestions are unchanged
+    assert feed_ids() == live_ids()
+
+    # When: the backfill migration fills an emptied feed table
+    SuggestedSession.objects.all().delete()
+    backfill = import_module('projects.migrations.0019_backfill_suggested_sessions')
+    backfill.backfill_suggested_sessions(apps, None)
+
+    # Then: the suggestions are unchanged
+    assert feed_ids() == live_ids()
+
+
+@pytest.mark.django_db
+def test_suggested_sessions_feed_is_refreshed_after_commit(django_capture_on_commit_callbacks):
+    """
+    Scenario: Session writes do not rebuild the feed inside their transaction
+    Given a developer who knows Python
+    When a Python session is created
+    Then no feed row is written before the transaction commits
+    And the developer's feed row is written once it does
+    """
+    # Given: a developer who knows Python
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    host = CustomUser.objects.create_user(username='host', email='host@example.com')
+    developer = CustomUser.objects.create_user(
+        username='developer', email='developer@example.com', stack=backend, level=junior
+    )
+    developer.prog_language.add(python)
+    project = Project.objects.create(owner=host, name='Deferred Project', stack=backend, level=junior)
+
+    # When: a Python session is created
+    with django_capture_on_commit_callbacks() as callbacks:
+        session = Session.objects.create(
+            project=project, host=host, stack=backend, level=junior,
+            schedule_date_time=datetime.now() + timedelta(days=1)
+        )
+        session.languages.add(python)
+
+    # Then: no feed row is written before the transaction commits
+    assert not SuggestedSession.objects.exists()
+
+    # And: the developer's feed row is written once it does
+    for callback in callbacks:
+        callback()
+    assert list(SuggestedSession.objects.values_list('user_id', 'session_id', 'priority')) == [
+        (developer.id, session.id, 1)
+    ]
+
+
+@pytest.mark.django_db
+def test_suggested_sessions_cursor_pages_through_whole_feed(client, django_capture_on_commit_callbacks):
+    """
+    Scenario: Scrolling the suggested sessions feed with a cursor
+    Given a developer matching more sessions than fit on one page
+    When I follow the next cursor page by page
+    Then I get every suggested session exactly once, in feed order
+    And an invalid cursor is rejected
+    """
+    # Given: a developer matching more sessions than fit on one page
+    with django_capture_on_commit_callbacks(execute=True):
+        backend, _ = Stack.objects.get_or_create(name='Backend')
+        frontend, _ = Stack.objects.get_or_create(name='Frontend')
+        junior, _ = Level.objects.get_or_create(name='Junior')
+        python, _ = ProgLanguage.objects.get_or_create(name='Python')
+        host = CustomUser.objects.create_user(username='host', email='host@example.com')
+        developer = CustomUser.objects.create_user(
+            username='developer', email='developer@example.com', password='password123', stack=backend, level=junior
+        )
+        developer.prog_language.add(python)
+        authenticate_client(client, developer)
+        project = Project.objects.create(owner=host, name='Paged Project', stack=backend, level=junior)
+        start = datetime.now() + timedelta(days=1)
+        for offset in range(12):
+            session = Session.objects.create(
+                project=project, host=host, stack=(backend, frontend)[offset % 2], level=junior,
+                schedule_date_time=start + timedelta(hours=offset // 3)
+            )
+            session.languages.add(python)
+    expected = list(SessionSuggestionService(developer).get_ranked_sessions().values_list('id', flat=True))
+
+    # When: I follow the next cursor page by page
+    url, pages, seen = reverse('suggested_sessions') + '?page_size=5', 0, []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        seen += [session['id'] for session in response.data['results']]
+        url, pages = response.data['next'], pages + 1
+
+    # Then: I get every suggested session exactly once, in feed order
+    assert pages == 3
+    assert seen == expected
+
+    # And: an invalid cursor is rejected
+    response = client.get(reverse('suggested_sessions') + '?cursor=not-a-cursor')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_suggested_sessions_cursor_seeks_through_the_feed_index():
+    """
+    Scenario: Later feed pages seek to the cursor instead of filtering earlier rows
+    Given a developer whose feed has more sessions than fit on one page
+    When I request the page after a cursor
+    Then the cursor is compared as one row value on the feed columns
+    And PostgreSQL uses it as a condition of the feed index
+    """
+    # Given: a developer whose feed has more sessions than fit on one page
+    host = CustomUser.objects.create_user(username='host', email='host@example.com')
+    developer = CustomUser.objects.create_user(
+        username='developer', email='developer@example.com', password='password123'
+    )
+    developer.prog_language.add(ProgLanguage.objects.get_or_create(name='Python')[0])
+    create_listed_sessions(host, 4, participants=0)
+    SuggestedSessionFeedService.rebuild_all()
+    service = SessionSuggestionService(developer)
+    _, cursor = service.get_suggested_sessions_page(page_size=2, prefetch=False)
+
+    # When: I request the page after a cursor
+    with CaptureQueriesContext(connection) as queries:
+        sessions, _ = service.get_suggested_sessions_page(cursor=cursor, page_size=2, prefetch=False)
+    sql = queries[0]['sql']
+
+    # Then: the cursor is compared as one row value on the feed columns
+    assert len(sessions) == 2
+    row = '("projects_suggestedsession"."priority", "projects_suggestedsession"."schedule_date_time", ' \
+          '"projects_suggestedsession"."session_id")'
+    assert f'{row} > (' in sql
+    assert ' OR ' not in sql
+
+    # And: PostgreSQL uses it as a condition of the feed index
+    with connection.cursor() as db:
+        db.execute('SET LOCAL enable_seqscan = off')
+        db.execute(f'EXPLAIN {sql}')
+        plan = [line for line, in db.fetchall()]
+    feed_scan = next(number for number, line in enumerate(plan) if 'using suggested_session_feed_idx' in line)
+    assert 'ROW(priority, schedule_date_time, session_id) > ROW(' in plan[feed_scan + 1]
+
+
+@pytest.mark.django_db
+def test_suggested_sessions_skip_full_and_joined_sessions(client, django_capture_on_commit_callbacks,
+                                                         django_assert_num_queries):
+    """
+    Scenario: Suggested sessions account for capacity and membership
+    Given sessions that are open, full, joined by me and awaiting my confirmation
+    When I request my suggested sessions
+    Then only the open session is suggested, loaded in one statement plus prefetches
+    When I ask to include unavailable sessions
+    Then every session is suggested and flagged accordingly
+    """
+    # Given: sessions that are open, full, joined by me and awaiting my confirmation
+    with django_capture_on_commit_callbacks(execute=True):
+        backend, _ = Stack.objects.get_or_create(name='Backend')
+        junior, _ = Level.objects.get_or_create(name='Junior')
+        python, _ = ProgLanguage.objects.get_or_create(name='Python')
+        host = CustomUser.objects.create_user(username='host', email='host@example.com')
+        other = CustomUser.objects.create_user(username='other', email='other@example.com')
+        developer = CustomUser.objects.create_user(
+            username='developer', email='developer@example.com', password='password123', stack=backend, level=junior
+        )
+        developer.prog_language.add(python)
+        authenticate_client(client, developer)
+        project = Project.objects.create(owner=host, name='Capacity Project', stack=backend, level=junior)
+        start = datetime.now() + timedelta(days=1)
+        open_session, full, joined, interested = [
+            Session.objects.create(
+                project=project, host=host, stack=backend, level=junior, participant_limit=1,
+                schedule_date_time=start + timedelta(hours=offset)
+            )
+            for offset in range(4)
+        ]
+        for session in (open_session, full, joined, interested):
+            session.languages.add(python)
+        full.participants.add(other)
+        joined.participants.add(developer)
+        InterestedParticipant.objects.create(user=developer, session=interested)
+
+    # When: I request my suggested sessions
+    with django_assert_num_queries(3):
+        suggested = list(SessionSuggestionService(developer).get_suggested_sessions())
+
+    # Then: only the open session is suggested
+    assert [session.id for session in suggested] == [open_session.id]
+    response = client.get(reverse('suggested_sessions'))
+    assert [session['id'] for session in response.data] == [open_session.id]
+
+    # When: I ask to include unavailable sessions
+    response = client.get(reverse('suggested_sessions') + '?include_unavailable=true')
+
+    # Then: every session is suggested and flagged accordingly
+    flags = {
+        session['id']: (session['participant_count'], session['is_full'], session['is_participant'], session['is_interested'])
+        for session in response.data
+    }
+    assert flags == {
+        open_session.id: (0, False, False, False),
+        full.id: (1, True, False, False),
+        joined.id: (1, True, True, False),
+        interested.id: (0, False, False, True),
+    }
+
+
+def create_listed_sessions(host, count, participants=2):
+    """Creates `count` future sessions hosted by `host`, each with languages and skilled participants."""
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    project = Project.objects.create(owner=host, name=f'Listed Project {count}', stack=backend, level=junior)
+    project.languages.add(python)
+    sessions = []
+    for number in range(count):
+        session = Session.objects.create(
+            project=project, host=host, stack=backend, level=junior,
+            schedule_date_time=datetime.now() + timedelta(days=1, hours=number)
+        )
+        session.languages.add(python)
+        for position in range(participants):
+            participant = CustomUser.objects.create_user(
+                username=f'participant-{count}-{number}-{position}',
+                email=f'participant-{count}-{number}-{position}@example.com',
+                stack=backend, level=junior,
+            )
+            participant.prog_language.add(python)
+            session.participants.add(participant)
+        InterestedParticipant.objects.create(user=host, session=session)
+        sessions.append(session)
+    return project, sessions
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast', [False, True], ids=['serializer', 'fast'])
+@pytest.mark.parametrize('url_name, expected_queries', [
+    ('session-list', {False: 6, True: 5}),
+    ('sessions_by_project', {False: 6, True: 5}),
+    ('user_hosted_sessions', {False: 6, True: 5}),
+    ('user_interested_sessions', {False: 6, True: 5}),
+    ('user_sessions', {False: 5, True: 5}),
+])
+def test_session_lists_use_constant_queries(client, django_assert_num_queries, settings, url_name,
+                                            expected_queries, fast):
+    """
+    Scenario: Session list endpoints do not query per listed session
+    Given I host a few sessions with participants
+    When I list them, and list again after hosting many more
+    Then both requests run the same fixed number of queries
+    """
+    # Given: I host a few sessions with participants
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    project, _ = create_listed_sessions(host, 2)
+    kwargs = {'project_id': project.id} if url_name == 'sessions_by_project' else {}
+
+    settings.FAST_READ_SERIALIZATION = fast
+    expected_queries = expected_queries[fast]
+
+    # When: I list them, and list again after hosting many more
+    with django_assert_num_queries(expected_queries):
+        small = client.get(reverse(url_name, kwargs=kwargs))
+    project, _ = create_listed_sessions(host, 8)
+    kwargs = {'project_id': project.id} if url_name == 'sessions_by_project' else {}
+    with django_assert_num_queries(expected_queries):
+        large = client.get(reverse(url_name, kwargs=kwargs))
+
+    # Then: both requests run the same fixed number of queries
+    assert small.status_code == large.status_code == status.HTTP_200_OK
+    assert len(json.dumps(large.data, default=str)) > len(json.dumps(small.data, default=str))
+
+
+@pytest.mark.django_db
+def test_participating_sessions_use_constant_queries(client, django_assert_num_queries):
+    """
+    Scenario: Listing the sessions I participate in does not query per session
+    Given I participate in a few sessions, then in many more
+    When I list my participating sessions each time
+    Then both requests run the same fixed number of queries
+    """
+    # Given: I participate in a few sessions, then in many more
+    developer = CustomUser.objects.create_user(
+        username='developer', email='developer@example.com', password='password123'
+    )
+    authenticate_client(client, developer)
+    host = CustomUser.objects.create_user(username='host', email='host@example.com')
+    counts = []
+    for count in (2, 8):
+        _, sessions = create_listed_sessions(host, count)
+        for session in sessions:
+            session.participants.add(developer)
+
+        # When: I list my participating sessions each time
+        with django_assert_num_queries(5):
+            response = client.get(reverse('user_participating_sessions'))
+        counts.append(len(response.data['results']))
+
+    # Then: both requests run the same fixed number of queries
+    assert counts == [2, 10]
+
+
+@pytest.mark.django_db
+def test_project_list_includes_sessions_on_request(client, django_assert_num_queries):
+    """
+    Scenario: Listing projects with and without their nested sessions
+    Given projects with sessions and participants
+    When I list projects
+    Then the sessions are left out and the query count is fixed
+    When I list projects with ?include=sessions
+    Then every project carries its sessions, still with a fixed query count
+    And a single project still carries its sessions
+    """
+    # Given: projects with sessions and participants
+    host = CustomUser.objects.create_user(username='host', email='host@example.com')
+    project, sessions = create_listed_sessions(host, 2)
+    create_listed_sessions(host, 5)
+    url = '/api/projects/projects/'
+
+    # When: I list projects
+    with django_assert_num_queries(3):
+        response = client.get(url)
+
+    # Then: the sessions are left out and the query count is fixed
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data['results']) == 2
+    assert all('sessions' not in listed for listed in response.data['results'])
+
+    # When: I list projects with ?include=sessions
+    with django_assert_num_queries(7):
+        response = client.get(url + '?include=sessions')
+
+    # Then: every project carries its sessions, still with a fixed query count
+    listed = {listed['id']: listed for listed in response.data['results']}
+    assert {session['id'] for session in listed[project.id]['sessions']} == {session.id for session in sessions}
+    assert all(len(session['participants']) == 2 for session in listed[project.id]['sessions'])
+
+    # And: a single project still carries its sessions
+    response = client.get(f'{url}{project.id}/')
+    assert len(response.data['sessions']) == 2
+
+
+@pytest.mark.django_db
+def test_sparse_fieldsets_trim_payload_and_queries(client, django_assert_num_queries):
+    """
+    Scenario: Clients pick the fields they need from session and project lists
+    Given I host sessions with participants
+    When I list my sessions asking only for id, name, schedule_date_time and stack_name
+    Then each session has only those fields and no prefetch query runs
+    When I list my sessions omitting participants
+    Then the participants are left out and not loaded
+    When I list projects asking only for id and sessions
+    Then the nested sessions keep all their fields
+    """
+    # Given: I host sessions with participants
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    create_listed_sessions(host, 3)
+    url = reverse('user_hosted_sessions')
+
+    # When: I list my sessions asking only for id, name, schedule_date_time and stack_name
+    with django_assert_num_queries(3):
+        response = client.get(url + '?fields=id,name,schedule_date_time,stack_name')
+
+    # Then: each session has only those fields and no prefetch query runs
+    assert response.status_code == status.HTTP_200_OK
+    sessions = response.data['results']
+    assert [set(session) for session in sessions] == [{'id', 'name', 'schedule_date_time', 'stack_name'}] * 3
+    assert {session['stack_name'] for session in sessions} == {'Backend'}
+
+    # When: I list my sessions omitting participants
+    with django_assert_num_queries(4):
+        response = client.get(url + '?omit=participants')
+
+    # Then: the participants are left out and not loaded
+    assert all(
+        'participants' not in session and session['language_names'] == ['Python']
+        for session in response.data['results']
+    )
+
+    # When: I list projects asking only for id and sessions
+    response = client.get('/api/projects/projects/?include=sessions&fields=id,sessions')
+
+    # Then: the nested sessions keep all their fields
+    project = response.data['results'][0]
+    assert set(project) == {'id', 'sessions'}
+    assert {'owner_name', 'participants'} <= set(project['sessions'][0])
+
+
+@pytest.mark.django_db
+def test_list_endpoints_use_cursor_pagination(client, monkeypatch):
+    """
+    Scenario: List endpoints are cursor paginated in a stable order
+    Given I host more sessions than fit on a page
+    When I follow the next links of my hosted sessions
+    Then I see every session once, latest first
+    And the requested page size is capped
+    And lookup tables are returned whole
+    """
+    # Given: I host more sessions than fit on a page
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    _, sessions = create_listed_sessions(host, 5, participants=0)
+
+    # When: I follow the next links of my hosted sessions
+    url, seen = reverse('user_hosted_sessions') + '?page_size=2', []
+    while url:
+        response = client.get(url)
+        assert len(response.data['results']) <= 2
+        seen += [session['id'] for session in response.data['results']]
+        url = response.data['next']
+
+    # Then: I see every session once, latest first
+    assert seen == [session.id for session in reversed(sessions)]
+
+    # And: the requested page size is capped
+    monkeypatch.setattr(DefaultCursorPagination, 'max_page_size', 3)
+    response = client.get(reverse('user_hosted_sessions') + '?page_size=50')
+    assert len(response.data['results']) == 3
+
+    # And: lookup tables are returned whole
+    response = client.get('/api/skills/stacks/')
+    assert isinstance(response.data, list)
+
+
+@pytest.mark.django_db
+def test_user_sessions_dashboard_serializes_each_session_once(client, django_assert_num_queries):
+    """
+    Scenario: The sessions dashboard groups my sessions by role without duplicates
+    Given I host a session I also joined, joined another and showed interest in a third
+    When I request my sessions dashboard
+    Then each session is serialized once in the session map
+    And the role lists reference the sessions by id
+    """
+    # Given: I host a session I also joined, joined another and showed interest in a third
+    developer = CustomUser.objects.create_user(
+        username='developer', email='developer@example.com', password='password123'
+    )
+    authenticate_client(client, developer)
+    host = CustomUser.objects.create_user(username='host', email='host@example.com')
+    _, (own, joined, interested, unrelated) = create_listed_sessions(host, 4, participants=1)
+    own.host = developer
+    own.save()
+    own.participants.add(developer)
+    joined.participants.add(developer)
+    InterestedParticipant.objects.create(user=developer, session=interested)
+
+    # When: I request my sessions dashboard
+    with django_assert_num_queries(5):
+        response = client.get(reverse('user_sessions'))
+
+    # Then: each session is serialized once in the session map
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data['sessions']) == {str(own.id), str(joined.id), str(interested.id)}
+    assert response.data['sessions'][str(own.id)]['is_host'] is True
+
+    # And: the role lists reference the sessions by id
+    assert response.data['roles'] == {
+        'hosted': [own.id],
+        'participating': [joined.id, own.id],
+        'interested': [interested.id],
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name, expected_queries', [
+    ('session-list', 4),
+    ('user_hosted_sessions', 4),
+    ('user_sessions', 3),
+])
+def test_session_summary_view_counts_instead_of_nesting(client, django_assert_num_queries, url_name,
+                                                        expected_queries):
+    """
+    Scenario: Session lists offer a summary with annotated counts
+    Given I host sessions with participants and interested developers
+    When I list them with ?view=summary
+    Then each session carries participant and interested counts instead of participants
+    And no participant is loaded
+    """
+    # Given: I host sessions with participants and interested developers
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    _, sessions = create_listed_sessions(host, 3, participants=2)
+    InterestedParticipant.objects.create(
+        user=CustomUser.objects.create_user(username='curious', email='curious@example.com'), session=sessions[0]
+    )
+
+    # When: I list them with ?view=summary
+    with django_assert_num_queries(expected_queries):
+        response = client.get(reverse(url_name) + '?view=summary')
+
+    # Then: each session carries participant and interested counts instead of participants
+    assert response.status_code == status.HTTP_200_OK
+    if url_name == 'user_sessions':
+        listed = list(response.data['sessions'].values())
+    else:
+        listed = response.data['results']
+    counts = {session['id']: (session['participant_count'], session['interested_count']) for session in listed}
+    assert counts == {sessions[0].id: (2, 2), sessions[1].id: (2, 1), sessions[2].id: (2, 1)}
+    assert all('participants' not in session for session in listed)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('query', ['?view=summary', '?view=summary&page_size=2'])
+def test_suggested_sessions_summary_view_counts_instead_of_nesting(client, django_capture_on_commit_callbacks,
+                                                                   django_assert_num_queries, query):
+    """
+    Scenario: The suggested sessions feed offers the summary view too
+    Given sessions with participants and interested developers are suggested to me
+    When I list my suggested sessions with ?view=summary
+    Then each session carries participant and interested counts instead of participants
+    And no participant is loaded
+    """
+    # Given: sessions with participants and interested developers are suggested to me
+    with django_capture_on_commit_callbacks(execute=True):
+        host = CustomUser.objects.create_user(username='host', email='host@example.com')
+        _, sessions = create_listed_sessions(host, 2, participants=2)
+        developer = CustomUser.objects.create_user(
+            username='developer', email='developer@example.com', password='password123'
+        )
+        developer.prog_language.add(ProgLanguage.objects.get(name='Python'))
+    authenticate_client(client, developer)
+
+    # When: I list my suggested sessions with ?view=summary
+    with django_assert_num_queries(3):
+        response = client.get(reverse('suggested_sessions') + query + '&include_unavailable=true')
+
+    # Then: each session carries participant and interested counts instead of participants
+    assert response.status_code == status.HTTP_200_OK
+    listed = response.data['results'] if 'page_size' in query else response.data
+    counts = {session['id']: (session['participant_count'], session['interested_count']) for session in listed}
+    assert counts == {session.id: (2, 1) for session in sessions}
+    assert all('participants' not in session and session['is_interested'] is False for session in listed)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', [
+    '/api/projects/sessions/',
+    '/api/projects/sessions/?page_size=2',
+    '/api/projects/projects/',
+    '/api/projects/projects/?include=sessions',
+    '/api/projects/users/suggested-sessions/',
+    '/api/projects/users/suggested-sessions/?include_unavailable=true&page_size=3',
+])
+def test_fast_serialization_matches_serializers_byte_for_byte(client, django_capture_on_commit_callbacks, settings,
+                                                            url):
+    """
+    Scenario: The values-based fast path renders exactly what the serializers render
+    Given sessions with and without stack, level, host, description and participants
+    When I request a hot list endpoint through the fast path and through the serializers
+    Then both responses are byte-identical
+    """
+    # Given: sessions with and without stack, level, host, description and participants
+    with django_capture_on_commit_callbacks(execute=True):
+        developer = CustomUser.objects.create_user(
+            username='developer', email='developer@example.com', password='password123'
+        )
+        python, _ = ProgLanguage.objects.get_or_create(name='Python')
+        rust, _ = ProgLanguage.objects.get_or_create(name='Rust')
+        developer.prog_language.add(rust, python)
+        authenticate_client(client, developer)
+        host = CustomUser.objects.create_user(username='host', email='host@example.com')
+        project, sessions = create_listed_sessions(host, 3)
+        project.description = 'Listed with a description'
+        project.save()
+        project.languages.add(rust)
+        bare = Session.objects.create(
+            project=project, host=None, stack=None, level=None, description=None,
+            schedule_date_time=datetime.now() + timedelta(days=2), participant_limit=4, public=False
+        )
+        bare.languages.add(rust, python)
+        bare.participants.add(developer)
+        no_photo = CustomUser.objects.create_user(username='nophoto', email='nophoto@example.com', photo=None)
+        sessions[0].participants.add(no_photo)
+
+    # When: I request a hot list endpoint through the fast path and through the serializers
+    settings.FAST_READ_SERIALIZATION = True
+    fast = client.get(url)
+    settings.FAST_READ_SERIALIZATION = False
+    slow = client.get(url)
+
+    # Then: both responses are byte-identical
+    assert fast.status_code == slow.status_code == status.HTTP_200_OK
+    assert fast.content == slow.content
+    assert len(fast.content) > 100
+
+
+@pytest.mark.django_db
+def test_fast_path_is_skipped_on_databases_other_than_postgresql(client, settings, monkeypatch):
+    """
+    Scenario: Databases without ArraySubquery fall back to the serializers
+    Given fast serialization is enabled, and the database is not PostgreSQL
+    When I list sessions and projects
+    Then they are rendered by the serializers
+    """
+    # Given: fast serialization is enabled, and the database is not PostgreSQL
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    create_listed_sessions(host, 2)
+    authenticate_client(client, host)
+    settings.FAST_READ_SERIALIZATION = True
+    monkeypatch.setattr(connection, 'vendor', 'sqlite')
+    for name in ('serialize_sessions', 'serialize_projects'):
+        monkeypatch.setattr(f'projects.mixins.{name}', pytest.fail)
+
+    # When: I list sessions and projects
+    responses = [client.get('/api/projects/sessions/'), client.get('/api/projects/projects/')]
+
+    # Then: they are rendered by the serializers
+    assert [response.status_code for response in responses] == [status.HTTP_200_OK] * 2
+    assert len(responses[0].data['results']) == 2
+
+
+@pytest.mark.django_db
+def test_conditional_get_answers_not_modified_until_sessions_change(client, django_assert_num_queries):
+    """
+    Scenario: Polling clients revalidate session and project reads with ETags
+    Given I host sessions with participants
+    When I fetch my hosted sessions, a session and its project
+    Then each response carries an ETag and Last-Modified
+    When I fetch them again with If-None-Match
+    Then I get 304 Not Modified after a single probe query, without the rows being loaded
+    When a developer joins a session
+    Then the session list, the session and its project are served fresh with new ETags
+    """
+    # Given: I host sessions with participants
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    project, sessions = create_listed_sessions(host, 3)
+    urls = [
+        reverse('user_hosted_sessions'),
+        f'/api/projects/sessions/{sessions[0].id}/',
+        f'/api/projects/projects/{project.id}/',
+    ]
+
+    # When: I fetch my hosted sessions, a session and its project
+    responses = [client.get(url) for url in urls]
+
+    # Then: each response carries an ETag and Last-Modified
+    assert all(response.status_code == status.HTTP_200_OK for response in responses)
+    etags = [response['ETag'] for response in responses]
+    assert all(etag.startswith('W/"') for etag in etags)
+    assert all(response.has_header('Last-Modified') for response in responses)
+
+    # When: I fetch them again with If-None-Match
+    for url, etag in zip(urls, etags):
+        with django_assert_num_queries(2):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Then: I get 304 Not Modified after a single probe query, without the rows being loaded
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+    # When: a developer joins a session
+    sessions[0].participants.add(CustomUser.objects.create_user(username='late', email='late@example.com'))
+
+    # Then: the session list, the session and its project are served fresh with new ETags
+    for url, etag in zip(urls, etags):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast', [False, True])
+def test_conditional_get_follows_project_and_skill_renames(client, settings, fast):
+    """
+    Scenario: Session and project ETags change when something they render is renamed
+    Given I host sessions in a project, and have fetched them
+    When the project is renamed
+    Then the sessions are served fresh with the new project name
+    When a stack, a level or a language they render is renamed
+    Then the sessions and the project are served fresh with the new name
+    """
+    # Given: I host sessions in a project, and have fetched them
+    settings.FAST_READ_SERIALIZATION = fast
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    project, sessions = create_listed_sessions(host, 2)
+    urls = ['/api/projects/sessions/', f'/api/projects/sessions/{sessions[0].id}/']
+    etags = [client.get(url)['ETag'] for url in urls]
+
+    # When: the project is renamed
+    project.name = 'Renamed Project'
+    project.save()
+
+    # Then: the sessions are served fresh with the new project name
+    for url, etag in zip(urls, etags):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert b'Renamed Project' in response.content
+
+    urls.append(f'/api/projects/projects/{project.id}/')
+    for skill in (project.stack, project.level, project.languages.get()):
+        etags = [client.get(url)['ETag'] for url in urls]
+
+        # When: a stack, a level or a language they render is renamed
+        skill.name = f'Renamed {type(skill).__name__}'
+        skill.save()
+
+        # Then: the sessions and the project are served fresh with the new name
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert skill.name.encode() in response.content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast', [False, True])
+def test_conditional_get_follows_participant_deletion(client, settings, fast):
+    """
+    Scenario: Session ETags change when a participant's account is deleted
+    Given I host sessions with participants, and have fetched them
+    When a participant deletes their account
+    Then the sessions are served fresh without them
+    """
+    # Given: I host sessions with participants, and have fetched them
+    settings.FAST_READ_SERIALIZATION = fast
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    authenticate_client(client, host)
+    project, sessions = create_listed_sessions(host, 2)
+    urls = [
+        '/api/projects/sessions/', f'/api/projects/sessions/{sessions[0].id}/', f'/api/projects/projects/{project.id}/'
+    ]
+    etags = [client.get(url)['ETag'] for url in urls]
+    participant = sessions[0].participants.first()
+
+    # When: a participant deletes their account
+    participant.delete()
+
+    # Then: the sessions are served fresh without them
+    for url, etag in zip(urls, etags):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert participant.username.encode() not in response.content
+
+
+@pytest.mark.django_db
+def test_anonymous_reads_are_cached_until_a_write(client, django_assert_num_queries):
+    """
+    Scenario: Anonymous reads of public projects and sessions are served from a shared cache
+    Given public sessions in a project
+    When an anonymous visitor lists sessions and views the project twice
+    Then the second requests run no query at all, and revalidation still answers 304
+    When a developer joins a session
+    Then the next read is rendered fresh
+    When a private session is added to the project
+    Then responses rendering it are never cached
+    """
+    # Given: public sessions in a project
+    host = CustomUser.objects.create_user(username='host', email='host@example.com')
+    project, sessions = create_listed_sessions(host, 2)
+    urls = ['/api/projects/sessions/', f'/api/projects/projects/{project.id}/']
+
+    # When: an anonymous visitor lists sessions and views the project twice
+    first = [client.get(url) for url in urls]
+
+    # Then: the second requests run no query at all, and revalidation still answers 304
+    for url, response in zip(urls, first):
+        with django_assert_num_queries(0):
+            cached = client.get(url)
+            not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert cached.status_code == status.HTTP_200_OK
+        assert cached.content == response.content
+        assert cached['ETag'] == response['ETag']
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # When: a developer joins a session
+    sessions[0].participants.add(CustomUser.objects.create_user(username='late', email='late@example.com'))
+
+    # Then: the next read is rendered fresh
+    for url, response in zip(urls, first):
+        fresh = client.get(url)
+        assert b'"late"' in fresh.content and fresh.content != response.content
+
+    # When: a private session is added to the project
+    private = Session.objects.create(
+        project=project, host=host, schedule_date_time=datetime.now() + timedelta(days=3), public=False
+    )
+
+    # Then: responses rendering it are never cached
+    for url in urls + [f'/api/projects/sessions/{private.id}/']:
+        client.get(url)
+        response = client.get(url)
+        assert b'"is_private":true' in response.content
+        assert isinstance(response, Response)
+
+
+@pytest.mark.django_db
+def test_outbox_worker_retries_failed_emails_with_backoff(client, settings):
+    """
+    Scenario: Emails that cannot be delivered are retried later, then given up on
+    Given an invitation queued while the mail server is unreachable
+    When the outbox worker runs
+    Then the email stays queued with a backed-off retry time and shows in the metrics
+    When the worker runs out of attempts
+    Then the email is marked failed
+    When the mail server is back and a new invitation is queued
+    Then the worker sends it
+    """
+    # Given: an invitation queued while the mail server is unreachable
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST, settings.EMAIL_PORT, settings.EMAIL_USE_TLS = 'localhost', 1, False
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    developer = CustomUser.objects.create_user(username='developer', email='developer@example.com')
+    project, sessions = create_listed_sessions(host, 1)
+    authenticate_client(client, host)
+    response = client.post(f'/api/projects/sessions/{sessions[0].id}/developers/{developer.id}/invite/')
+    assert response.status_code == status.HTTP_200_OK
+    queued = OutboxEmail.objects.get()
+
+    # When: the outbox worker runs
+    call_command('send_outbox_emails', '--once')
+
+    # Then: the email stays queued with a backed-off retry time and shows in the metrics
+    queued.refresh_from_db()
+    assert (queued.status, queued.attempts) == (OutboxEmail.PENDING, 1)
+    assert queued.last_error
+    assert queued.available_at >= queued.created_at + timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_SECONDS)
+    host.is_staff = True
+    host.save()
+    metrics = client.get(reverse('email_outbox_metrics')).data
+    assert (metrics['queue_depth'], metrics['retrying'], metrics['failed']) == (1, 1, 0)
+    assert metrics['oldest_pending_age_seconds'] >= 0
+
+    # When: the worker runs out of attempts
+    OutboxEmail.objects.update(available_at=queued.created_at)
+    call_command('send_outbox_emails', '--once')
+
+    # Then: the email is marked failed
+    queued.refresh_from_db()
+    assert (queued.status, queued.attempts) == (OutboxEmail.FAILED, 2)
+
+    # When: the mail server is back and a new invitation is queued
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    client.post(f'/api/projects/sessions/{sessions[0].id}/developers/{developer.id}/invite/')
+
+    # Then: the worker sends it
+    call_command('send_outbox_emails', '--once')
+    assert [email.to for email in mail.outbox] == [[developer.email]]
+    assert OutboxEmail.objects.metrics()['queue_depth'] == 0
+    assert OutboxEmail.objects.filter(status=OutboxEmail.SENT, sent_at__isnull=False).count() == 1
+
+
+class FlakyEmailBackend(locmem.EmailBackend):
+    """Locmem backend that rejects one recipient and counts the connections opened."""
+
+    opened = 0
+
+    def open(self):
+        type(self).opened += 1
+
+    def send_messages(self, messages):
+        if any('rejected@example.com' in message.to for message in messages):
+            raise smtplib.SMTPRecipientsRefused({'rejected@example.com': (550, b'No such user')})
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db
+def test_email_delivery_reuses_one_connection_and_reconnects_after_failures(settings):
+    """
+    Scenario: Queued emails share a mail server connection
+    Given five queued emails, one of them to an address the server rejects
+    When the outbox worker sends them with a single thread
+    Then the other four are sent
+    And only the rejected one is retried
+    And one connection was opened, plus one reconnection after the failure
+    """
+    # Given: five queued emails, one of them to an address the server rejects
+    settings.EMAIL_BACKEND = 'projects.tests.tests.FlakyEmailBackend'
+    backend = import_string(settings.EMAIL_BACKEND)
+    backend.opened = 0
+    recipients = ['a@example.com', 'b@example.com', 'rejected@example.com', 'c@example.com', 'd@example.com']
+    for recipient in recipients:
+        OutboxEmail.objects.enqueue(
+            EmailService.build_email('confirmation_email', 'Confirmed', {}, [recipient]), 'confirmation'
+        )
+
+    # When: the outbox worker sends them with a single thread
+    call_command('send_outbox_emails', '--once', '--workers', '1')
+
+    # Then: the other four are sent
+    assert [email.to[0] for email in mail.outbox] == [r for r in recipients if r != 'rejected@example.com']
+
+    # And: only the rejected one is retried
+    retried = OutboxEmail.objects.get(status=OutboxEmail.PENDING)
+    assert retried.to == ['rejected@example.com']
+    assert 'No such user' in retried.last_error
+
+    # And: one connection was opened, plus one reconnection after the failure
+    assert backend.opened == 2
+
+
+@pytest.mark.django_db
+def test_bulk_invite_queues_one_email_per_developer(client, django_assert_num_queries):
+    """
+    Scenario: A host invites several suggested developers at once
+    Given I host a session, and developers to invite
+    When I invite them, along with a participant and an unknown developer
+    Then each developer gets a result, and only the new developers are invited
+    And the number of queries does not depend on how many developers are invited
+    And the outbox worker sends each invited developer a personalised email
+    When I send something other than a list of ids
+    Then the request is rejected
+    When another user tries to invite developers to my session
+    Then they are forbidden, and nothing is queued
+    """
+    # Given: I host a session, and developers to invite
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    project, sessions = create_listed_sessions(host, 1, participants=1)
+    participant = sessions[0].participants.get()
+    developers = [
+        CustomUser.objects.create_user(
+            username=f'invitee-{number}', email=f'invitee-{number}@example.com', password='password123'
+        )
+        for number in range(5)
+    ]
+    authenticate_client(client, host)
+    url = reverse('invite_developers', args=[sessions[0].id])
+    missing_id = developers[-1].id + 100
+
+    # When: I invite them, along with a participant and an unknown developer
+    response = client.post(
+        url,
+        {'developer_ids': [developers[0].id, participant.id, missing_id, developers[1].id, developers[0].id]},
+        content_type='application/json',
+    )
+
+    # Then: each developer gets a result, and only the new developers are invited
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['invited'] == 2
+    assert response.data['results'] == [
+        {'developer_id': developers[0].id, 'status': 'invited'},
+        {'developer_id': participant.id, 'status': 'failed', 'error': 'Developer is already a participant'},
+        {'developer_id': missing_id, 'status': 'failed', 'error': 'Developer not found'},
+        {'developer_id': developers[1].id, 'status': 'invited'},
+    ]
+
+    # And: the number of queries does not depend on how many developers are invited
+    with django_assert_num_queries(4):
+        client.post(url, {'developer_ids': [developers[2].id]}, content_type='application/json')
+    with django_assert_num_queries(4):
+        client.post(url, {'developer_ids': [d.id for d in developers[2:]]}, content_type='application/json')
+
+    # And: the outbox worker sends each invited developer a personalised email
+    call_command('send_outbox_emails', '--once')
+    assert len(mail.outbox) == 6
+    assert sorted(email.to[0] for email in mail.outbox) == sorted(
+        [developers[0].email, developers[1].email, developers[2].email] + [d.email for d in developers[2:]]
+    )
+    invite = next(email for email in mail.outbox if email.to == [developers[1].email])
+    assert 'invitee-1' in invite.body and 'host' in invite.subject
+
+    # When: I send something other than a list of ids
+    for developer_ids in ('all', [1.9], [True], ['1.5']):
+        response = client.post(url, {'developer_ids': developer_ids}, content_type='application/json')
+
+        # Then: the request is rejected
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # When: another user tries to invite developers to my session
+    authenticate_client(client, developers[4])
+    response = client.post(url, {'developer_ids': [developers[3].id]}, content_type='application/json')
+
+    # Then: they are forbidden, and nothing is queued
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert OutboxEmail.objects.count() == 6
+
+
+def test_email_templates_are_compiled_at_startup():
+    """
+    Scenario: Email templates are compiled before the first email is sent
+    Given the project and user apps are loaded
+    Then every email template is already in the cached template loader
+    And the render benchmark renders every email type
+    """
+    # Given: the project and user apps are loaded
+    loader = engines['django'].engine.template_loaders[0]
+    names = [
+        name
+        for app in ('projects', 'users')
+        for name in find_email_templates(os.path.join(apps.get_app_config(app).path, 'templates'))
+    ]
+
+    # Then: every email template is already in the cached template loader
+    assert isinstance(loader, cached.Loader)
+    assert 'emails/confirmation_email.html' in names and 'emails/activation_email.txt' in names
+    assert set(names) <= set(loader.get_template_cache)
+
+    # And: the render benchmark renders every email type
+    out = StringIO()
+    call_command('benchmark_email_rendering', '--renders', '2', stdout=out)
+    assert [line.split(':')[0] for line in out.getvalue().splitlines()] == [
+        'invite', 'interest_notification', 'interest_digest', 'confirmation', 'activation'
+    ]
+
+
+@pytest.mark.django_db
+def test_interest_digest_groups_interests_per_host(client):
+    """
+    Scenario: A host who opted into digests gets one email for many interested users
+    Given I host two sessions and opt into interest digests
+    When three developers express interest in them
+    Then no email is queued yet
+    When the digest is sent
+    Then I get one email listing the interested users of each session
+    And a second run sends nothing
+    When I opt out and another developer expresses interest
+    Then I am notified immediately
+    """
+    # Given: I host two sessions and opt into interest digests
+    host = CustomUser.objects.create_user(username='host', email='host@example.com', password='password123')
+    project, sessions = create_listed_sessions(host, 2, participants=0)
+    developers = [
+        CustomUser.objects.create_user(
+            username=f'interested-{number}', email=f'interested-{number}@example.com', password='password123'
+        )
+        for number in range(4)
+    ]
+    authenticate_client(client, host)
+    response = client.patch('/api/auth/users/me/', {'interest_digest': True}, content_type='application/json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['interest_digest'] is True
+
+    # When: three developers express interest in them
+    for developer, session in zip(developers, [sessions[0], sessions[0], sessions[1]]):
+        authenticate_client(client, developer)
+        response = client.post('/api/projects/interested-participants/', {'session': session.id})
+        assert response.status_code == status.HTTP_201_CREATED
+
+    # Then: no email is queued yet
+    assert not OutboxEmail.objects.exists()
+
+    # When: the digest is sent
+    call_command('send_interest_digests', '--once')
+    call_command('send_outbox_emails', '--once')
+
+    # Then: I get one email listing the interested users of each session
+    assert len(mail.outbox) == 1
+    digest = mail.outbox[0]
+    assert digest.to == [host.email]
+    first_session, second_session = digest.body.split(f'/sessions/{sessions[0].id}/')
+    assert 'interested-0, interested-1' in first_session and 'interested-2' in second_session
+    assert not InterestedParticipant.objects.filter(pending_digest=True).exists()
+
+    # And: a second run sends nothing
+    call_command('send_interest_digests', '--once')
+    assert OutboxEmail.objects.count() == 1
+
+    # When: I opt out and another developer expresses interest
+    authenticate_client(client, host)
+    client.patch('/api/auth/users/me/', {'interest_digest': False}, content_type='application/json')
+    authenticate_client(client, developers[3])
+    client.post('/api/projects/interested-participants/', {'session': sessions[1].id})
 
+    # Then: I am notified immediately
+    assert OutboxEmail.objects.filter(kind='interest_notification', to=[host.email]).count() == 1
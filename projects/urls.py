@@ -12,9 +12,13 @@ from .views import (
     UserInterestedSessionsView,
     UserParticipatingSessionsView,
     UserSessionsView,
+    get_batch_suggested_developers,
+    get_email_outbox_metrics,
     get_suggested_developers,
     get_suggested_sessions_for_user,
+    get_suggestion_cache_stats,
     invite_developer_to_session,
+    invite_developers_to_session,
 )
 
 router = DefaultRouter()
@@ -28,6 +32,21 @@ urlpatterns = [
         SessionsByProjectView.as_view(),
         name="sessions_by_project",
     ),
+    path(
+        "sessions/suggested-developers/",
+        get_batch_suggested_developers,
+        name="batch_suggested_developers",
+    ),
+    path(
+        "sessions/suggested-developers/cache-stats/",
+        get_suggestion_cache_stats,
+        name="suggestion_cache_stats",
+    ),
+    path(
+        "emails/outbox/metrics/",
+        get_email_outbox_metrics,
+        name="email_outbox_metrics",
+    ),
     path(
         "sessions/<int:session_id>/suggested-developers/",
         get_suggested_developers,
@@ -43,6 +62,11 @@ urlpatterns = [
         SessionsByProjectView.as_view(),
         name="sessions_by_project",
     ),
+    path(
+        "sessions/<int:session_id>/invite/",
+        invite_developers_to_session,
+        name="invite_developers",
+    ),
     path(
         "sessions/<int:session_id>/developers/<int:developer_id>/invite/",
         invite_developer_to_session,
@@ -1,22 +1,46 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, serializers, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from users.models import CustomUser
+from pair_connect.conditional import ConditionalGetMixin
+from pair_connect.fieldsets import requested_fields
 from users.serializers import CustomUserSerializer
+from . import outbox, suggestion_cache
 from .email_service import EmailService
+from .fast_serializers import SUGGESTION_FIELDS, can_use_fast_path, serialize_sessions
+from .mixins import (
+    AnonymousResponseCacheMixin,
+    ProjectListMixin,
+    SessionListMixin,
+    is_summary_request,
+    session_fields_for,
+    session_queryset_for,
+)
 from .models import InterestedParticipant, Project, Session
 from .serializers import (
     InterestedParticipantSerializer,
+    ProjectListSerializer,
     ProjectSerializer,
     SessionDetailSerializer,
     SessionParticipantSerializer,
     SessionSerializer,
+    SuggestedDeveloperSerializer,
+    SuggestedSessionSerializer,
+    SuggestedSessionSummarySerializer,
+    UserSessionSerializer,
+    UserSessionSummarySerializer,
 )
 from .services import (
+    BatchDeveloperSuggestionService,
+    BulkInvitationService,
     DeveloperSuggestionService,
     InvitationService,
     SessionCreationService,
@@ -26,10 +50,33 @@ from .services import (
 )
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(AnonymousResponseCacheMixin, ConditionalGetMixin, ProjectListMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    cursor_ordering = ("-date_created", "id")
+
+    def include_sessions(self):
+        """Lists leave the nested sessions out unless ?include=sessions is given."""
+        if self.action != "list":
+            return True
+        return "sessions" in self.request.query_params.get("include", "").split(",")
+
+    def get_queryset(self):
+        return Project.objects.for_serializer(
+            include_sessions=self.include_sessions(),
+            fields=requested_fields(self.request, self.get_serializer_class()),
+        )
+
+    def get_serializer_class(self):
+        if not self.include_sessions():
+            return ProjectListSerializer
+        return ProjectSerializer
+
+    def contains_private_sessions(self, object_ids):
+        if not self.include_sessions():
+            return False
+        return Session.objects.filter(project_id__in=object_ids, public=False).exists()
 
 
 class ProjectCreateView(generics.CreateAPIView):
@@ -41,10 +88,17 @@ class ProjectCreateView(generics.CreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class SessionViewSet(viewsets.ModelViewSet):
+class SessionViewSet(AnonymousResponseCacheMixin, ConditionalGetMixin, SessionListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = Session.objects.all()
     serializer_class = SessionSerializer
+    cursor_ordering = ("-schedule_date_time", "id")
+
+    def get_sessions(self):
+        return Session.objects.all()
+
+    def contains_private_sessions(self, object_ids):
+        return Session.objects.filter(id__in=object_ids, public=False).exists()
 
     def perform_create(self, serializer):
         project_id = self.request.data.get("project")
@@ -70,10 +124,11 @@ class SessionViewSet(viewsets.ModelViewSet):
         return response
 
 
-class SessionsByProjectView(generics.ListAPIView):
+class SessionsByProjectView(ConditionalGetMixin, SessionListMixin, generics.ListAPIView):
     serializer_class = SessionSerializer
+    cursor_ordering = ("-schedule_date_time", "id")
 
-    def get_queryset(self):
+    def get_sessions(self):
         project_id = self.kwargs["project_id"]
         return Session.objects.filter(project__id=project_id)
 
@@ -97,10 +152,11 @@ class ConfirmParticipantView(APIView):
             if session.participants.count() >= session.participant_limit > 0:
                 raise ValueError("Participant limit reached.")
 
-            session.participants.add(developer)
+            with transaction.atomic():
+                session.participants.add(developer)
 
-            confirmation_service = ConfirmationNotificationService(session, developer)
-            confirmation_service.send_confirmation()
+                confirmation_service = ConfirmationNotificationService(session, developer)
+                confirmation_service.send_confirmation()
 
             return Response(
                 {
@@ -126,6 +182,7 @@ class InterestedParticipantViewSet(viewsets.ModelViewSet):
     queryset = InterestedParticipant.objects.all()
     serializer_class = InterestedParticipantSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-date_created_interested", "id")
 
     def perform_create(self, serializer):
         try:
@@ -140,10 +197,11 @@ class InterestedParticipantViewSet(viewsets.ModelViewSet):
             ).exists():
                 raise ValidationError("You are already interested in this session.")
 
-            interested_participant = serializer.save(user=self.request.user)
+            with transaction.atomic():
+                interested_participant = serializer.save(user=self.request.user)
 
-            notification_service = InterestNotificationService(session, self.request.user)
-            notification_service.send_notification()
+                notification_service = InterestNotificationService(session, self.request.user)
+                notification_service.send_notification()
 
             return Response(
                 {
@@ -191,20 +249,177 @@ class CheckUserInterestView(generics.GenericAPIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+def parse_suggestion_limit(value):
+    if value is None:
+        return DeveloperSuggestionService.SUGGESTION_LIMIT
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be a positive integer.")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer.")
+    return min(limit, settings.SUGGESTED_DEVELOPERS_MAX_LIMIT)
+
+
+def parse_flag(value):
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def parse_suggestion_engine(value):
+    if value is not None and value not in DeveloperSuggestionService.ENGINES:
+        raise ValueError(
+            f"engine must be one of: {', '.join(DeveloperSuggestionService.ENGINES)}."
+        )
+    return value
+
+
 @api_view(["GET"])
 def get_suggested_developers(request, session_id):
     try:
-        session = Session.objects.get(id=session_id)
+        limit = parse_suggestion_limit(request.query_params.get("limit"))
+        engine = parse_suggestion_engine(request.query_params.get("engine"))
+        session = Session.objects.select_related("stack", "level").get(id=session_id)
         suggestion_service = DeveloperSuggestionService(session)
-        suggested_developers = suggestion_service.get_suggested_developers()
-        serializer = CustomUserSerializer(suggested_developers, many=True)
+        suggested_developers = suggestion_service.get_suggested_developers(
+            limit=limit,
+            engine=engine,
+            available_only=parse_flag(request.query_params.get("available_only")),
+        )
+        serializer = SuggestedDeveloperSerializer(
+            suggested_developers, many=True, context={"request": request}
+        )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Session.DoesNotExist:
+        return Response(
+            {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def parse_session_ids(value):
+    if value is None:
+        return None
+    try:
+        session_ids = [int(session_id) for session_id in value.split(",") if session_id.strip()]
+    except ValueError:
+        raise ValueError("session_ids must be a comma-separated list of ids.")
+    if len(session_ids) > settings.SUGGESTION_BATCH_MAX_SESSIONS:
+        raise ValueError(
+            f"At most {settings.SUGGESTION_BATCH_MAX_SESSIONS} sessions can be requested at once."
+        )
+    return session_ids
+
+
+@api_view(["GET"])
+def get_batch_suggested_developers(request):
+    try:
+        limit = parse_suggestion_limit(request.query_params.get("limit"))
+        engine = parse_suggestion_engine(request.query_params.get("engine"))
+        session_ids = parse_session_ids(request.query_params.get("session_ids"))
+
+        batch_service = BatchDeveloperSuggestionService.for_host(request.user, session_ids)
+        rankings = batch_service.get_suggested_developers(
+            limit=limit,
+            engine=engine,
+            available_only=parse_flag(request.query_params.get("available_only")),
+        )
+
+        developer_ids = {
+            developer_id for ranking in rankings.values() for developer_id, _ in ranking
+        }
+        fields = requested_fields(request, SuggestedDeveloperSerializer)
+        developers = CustomUser.objects.for_serializer(fields).in_bulk(developer_ids)
+        serialized_developers = {
+            developer_id: CustomUserSerializer(developer, context={"request": request}).data
+            for developer_id, developer in developers.items()
+        }
+        include_score = fields is None or "match_score" in fields
+
+        return Response(
+            {
+                str(session_id): [
+                    {
+                        **serialized_developers[developer_id],
+                        **({"match_score": annotations["match_score"]} if include_score else {}),
+                    }
+                    for developer_id, annotations in ranking
+                    if developer_id in serialized_developers
+                ]
+                for session_id, ranking in rankings.items()
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_suggestion_cache_stats(request):
+    return Response(suggestion_cache.get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_email_outbox_metrics(request):
+    return Response(outbox.get_metrics(), status=status.HTTP_200_OK)
+
+
+def parse_developer_id(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    raise ValueError("developer_ids must be a non-empty list of ids.")
+
+
+def parse_developer_ids(value):
+    if not isinstance(value, list) or not value:
+        raise ValueError("developer_ids must be a non-empty list of ids.")
+    developer_ids = list(dict.fromkeys(parse_developer_id(developer_id) for developer_id in value))
+    if len(developer_ids) > settings.SESSION_INVITE_MAX_DEVELOPERS:
+        raise ValueError(
+            f"At most {settings.SESSION_INVITE_MAX_DEVELOPERS} developers can be invited at once."
+        )
+    return developer_ids
+
+
+@api_view(["POST"])
+def invite_developers_to_session(request, session_id):
+    try:
+        developer_ids = parse_developer_ids(request.data.get("developer_ids"))
+        session = Session.objects.select_related("project__owner").get(id=session_id)
+        if request.user.id not in (session.host_id, session.project.owner_id):
+            raise PermissionError("Only the host or the project owner can invite developers.")
+        invitation_service = BulkInvitationService(session, developer_ids)
+        results = invitation_service.send_invitations()
+
+        return Response(
+            {
+                "invited": sum(result["status"] == BulkInvitationService.INVITED for result in results),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
     except Session.DoesNotExist:
         return Response(
             {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
         )
+    except PermissionError as e:
+        return Response({"error": str(e)}, status=status.HTTP_403_FORBIDDEN)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except ValidationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -267,45 +482,104 @@ class CheckUserParticipationView(generics.GenericAPIView):
             )
 
 
+def parse_page_size(value):
+    if value is None:
+        return SessionSuggestionService.FEED_LIMIT
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("page_size must be a positive integer.")
+    if page_size < 1:
+        raise ValueError("page_size must be a positive integer.")
+    return min(page_size, settings.SUGGESTED_SESSIONS_MAX_PAGE_SIZE)
+
+
+def serialize_suggested_sessions(request, sessions, serializer_class):
+    if not can_use_fast_path(request):
+        return serializer_class(sessions, many=True, context={"request": request}).data
+    return serialize_sessions(
+        [session.id for session in sessions],
+        extra_fields={
+            session.id: {field: getattr(session, field) for field in SUGGESTION_FIELDS}
+            for session in sessions
+        },
+    )
+
+
 @api_view(["GET"])
 def get_suggested_sessions_for_user(request):
     try:
         user = request.user
         session_suggestion_service = SessionSuggestionService(user)
-        suggested_sessions = session_suggestion_service.get_suggested_sessions()
-        serializer = SessionSerializer(suggested_sessions, many=True)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        include_unavailable = parse_flag(request.query_params.get("include_unavailable"))
+        prefetch = not can_use_fast_path(request)
+        summary = is_summary_request(request)
+        serializer_class = SuggestedSessionSummarySerializer if summary else SuggestedSessionSerializer
+        fields = session_fields_for(request, serializer_class, summary)
+        cursor = request.query_params.get("cursor")
+        page_size = request.query_params.get("page_size")
+        if cursor is None and page_size is None:
+            suggested_sessions = list(
+                session_suggestion_service.get_suggested_sessions(include_unavailable, prefetch, fields)
+            )
+            return Response(
+                serialize_suggested_sessions(request, suggested_sessions, serializer_class),
+                status=status.HTTP_200_OK,
+            )
 
-    except ValidationError as e:
+        suggested_sessions, next_cursor = session_suggestion_service.get_suggested_sessions_page(
+            cursor=cursor,
+            page_size=parse_page_size(page_size),
+            include_unavailable=include_unavailable,
+            prefetch=prefetch,
+            fields=fields,
+        )
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+
+        return Response(
+            {
+                "next": next_url,
+                "cursor": next_cursor,
+                "results": serialize_suggested_sessions(request, suggested_sessions, serializer_class),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except (ValidationError, ValueError) as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class UserHostedSessionsView(generics.ListAPIView):
+class UserHostedSessionsView(ConditionalGetMixin, SessionListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = SessionSerializer
+    cursor_ordering = ("-schedule_date_time", "id")
 
-    def get_queryset(self):
+    def get_sessions(self):
         user = self.request.user
         return Session.objects.filter(host=user)
 
 
-class UserParticipatingSessionsView(generics.ListAPIView):
+class UserParticipatingSessionsView(ConditionalGetMixin, SessionListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = SessionSerializer
+    cursor_ordering = ("-schedule_date_time", "id")
 
-    def get_queryset(self):
+    def get_sessions(self):
         user = self.request.user
         return Session.objects.filter(participants=user)
 
 
-class UserInterestedSessionsView(generics.ListAPIView):
+class UserInterestedSessionsView(ConditionalGetMixin, SessionListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = SessionSerializer
+    cursor_ordering = ("-schedule_date_time", "id")
 
-    def get_queryset(self):
+    def get_sessions(self):
         user = self.request.user
         interested_sessions_ids = InterestedParticipant.objects.filter(
             user=user
@@ -317,23 +591,30 @@ class UserSessionsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
+        """
+        Returns every session the user hosts, joined or showed interest in, each serialized
+        once, along with the session ids grouped by role.
+        """
         user = request.user
-
-        hosted_sessions = Session.objects.filter(host=user)
-        participating_sessions = Session.objects.filter(participants=user)
-        interested_sessions_ids = InterestedParticipant.objects.filter(
-            user=user
-        ).values_list("session_id", flat=True)
-        interested_sessions = Session.objects.filter(id__in=interested_sessions_ids)
-
-        hosted_serializer = SessionSerializer(hosted_sessions, many=True)
-        participating_serializer = SessionSerializer(participating_sessions, many=True)
-        interested_serializer = SessionSerializer(interested_sessions, many=True)
-
-        return Response(
-            {
-                "hosted_sessions": hosted_serializer.data,
-                "participating_sessions": participating_serializer.data,
-                "interested_sessions": interested_serializer.data,
-            }
-        )
+        summary = is_summary_request(request)
+        serializer_class = UserSessionSummarySerializer if summary else UserSessionSerializer
+
+        sessions = Session.objects.with_roles(user).filter(
+            Q(is_host=True) | Q(is_participant=True) | Q(is_interested=True)
+        ).order_by("-schedule_date_time", "id")
+        sessions = list(session_queryset_for(request, sessions, serializer_class, summary=summary))
+        serializer = serializer_class(sessions, many=True, context={"request": request})
+
+        roles = {"hosted": [], "participating": [], "interested": []}
+        for session in sessions:
+            if session.is_host:
+                roles["hosted"].append(session.id)
+            if session.is_participant:
+                roles["participating"].append(session.id)
+            if session.is_interested:
+                roles["interested"].append(session.id)
+        serialized_sessions = {
+            str(session.id): data for session, data in zip(sessions, serializer.data)
+        }
+
+        return Response({"sessions": serialized_sessions, "roles": roles})
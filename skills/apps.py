@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class SkillsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'skills'
+
+    def ready(self):
+        from pair_connect.cache import track
+        from .models import Level, ProgLanguage, Stack
+
+        track(Stack, Level, ProgLanguage)
@@ -26,3 +26,8 @@ class ProgLanguage(models.Model):
 
     def __str__(self):
         return self.name
+
+
+def languages_by_id(lookup):
+    """Prefetches the languages behind `lookup` in id order, so they always render the same way."""
+    return models.Prefetch(lookup, queryset=ProgLanguage.objects.order_by('id'))
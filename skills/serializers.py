@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Stack, Level, ProgLanguage
+from .taxonomy import Taxonomy, get_taxonomy
 
 
 class StackSerializer(serializers.ModelSerializer):
@@ -18,3 +19,27 @@ class ProgLanguageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProgLanguage
         fields = ['id', 'name']
+
+
+class TaxonomyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for stacks, levels and languages that resolves ids from the in-process
+    taxonomy instead of querying for each submitted id.
+    """
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        kwargs.setdefault('queryset', Taxonomy.MODELS[kind].objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        instance = get_taxonomy().get(self.kind, pk)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+
+from pair_connect.cache import get_generations
+
+from .models import Level, ProgLanguage, Stack
+
+
+class Taxonomy:
+    """
+    Immutable snapshot of the stacks, levels and languages tables.
+
+    `version` is a hash of the contents, so two processes holding the same rows report the
+    same version and clients can use it as a cache key.
+    """
+
+    MODELS = {'stacks': Stack, 'levels': Level, 'languages': ProgLanguage}
+
+    def __init__(self, rows):
+        """
+        :param rows: {'stacks' | 'levels' | 'languages': iterable of (id, name)}
+        """
+        self._names = {kind: dict(sorted(rows.get(kind, ()))) for kind in self.MODELS}
+        self.payload = {
+            kind: [{'id': pk, 'name': name} for pk, name in names.items()]
+            for kind, names in self._names.items()
+        }
+        content = json.dumps(self.payload, sort_keys=True, separators=(',', ':'))
+        self.version = hashlib.sha256(content.encode()).hexdigest()[:16]
+
+    @classmethod
+    def load(cls):
+        return cls({
+            kind: model.objects.values_list('id', 'name')
+            for kind, model in cls.MODELS.items()
+        })
+
+    def name(self, kind, pk):
+        return self._names[kind].get(pk)
+
+    def stack_name(self, pk):
+        return self.name('stacks', pk)
+
+    def level_name(self, pk):
+        return self.name('levels', pk)
+
+    def stack_ids(self, names):
+        names = set(names)
+        return [pk for pk, name in self._names['stacks'].items() if name in names]
+
+    def get(self, kind, pk):
+        """Returns a model instance for the row, as if loaded from the database, or None."""
+        name = self.name(kind, pk)
+        if name is None:
+            return None
+        return self.MODELS[kind].from_db('default', ['id', 'name'], [pk, name])
+
+    def as_dict(self):
+        return {'version': self.version, **self.payload}
+
+
+_lock = threading.Lock()
+_taxonomy = None
+_generation = None
+_loaded_at = None
+
+
+def _is_current(generation):
+    max_age = getattr(settings, 'SKILLS_TAXONOMY_MAX_AGE', None)
+    return (
+        _taxonomy is not None
+        and _generation == generation
+        and (max_age is None or time.monotonic() - _loaded_at <= max_age)
+    )
+
+
+def get_taxonomy():
+    """
+    Returns the process-wide snapshot, reloading it when any of the three models changed
+    since it was built, or when it is older than SKILLS_TAXONOMY_MAX_AGE seconds. The age
+    limit covers cache backends that do not share generations between processes, such as
+    the per-process LocMemCache.
+    """
+    global _taxonomy, _generation, _loaded_at
+    generation = get_generations(*Taxonomy.MODELS.values())
+    if _is_current(generation):
+        return _taxonomy
+    with _lock:
+        if not _is_current(generation):
+            _taxonomy = Taxonomy.load()
+            _generation = generation
+            _loaded_at = time.monotonic()
+        return _taxonomy
@@ -1,3 +1,125 @@
-from django.test import TestCase
+import pytest
+from rest_framework import status
 
-# Create your tests here.
+from skills.models import Level, ProgLanguage, Stack
+from users.models import CustomUser
+
+TAXONOMY_URL = '/api/skills/taxonomy/'
+
+
+@pytest.mark.django_db
+def test_taxonomy_is_served_from_the_in_process_cache(client, django_assert_num_queries):
+    """
+    Scenario: Clients load every stack, level and language in one cached response
+    Given stacks, levels and languages
+    When I fetch the taxonomy twice
+    Then the second response runs no query and carries the same content-hash version and ETag
+    And revalidating with the ETag answers 304
+    And the versioned URL is cacheable forever
+    When an admin renames a language
+    Then the taxonomy is served with the new name under a new version
+    """
+    # Given: stacks, levels and languages
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    expected = {
+        kind: [{'id': pk, 'name': name} for pk, name in model.objects.order_by('id').values_list('id', 'name')]
+        for kind, model in (('stacks', Stack), ('levels', Level), ('languages', ProgLanguage))
+    }
+
+    # When: I fetch the taxonomy twice
+    first = client.get(TAXONOMY_URL)
+    with django_assert_num_queries(0):
+        second = client.get(TAXONOMY_URL)
+        stacks = client.get('/api/skills/stacks/')
+
+    # Then: the second response runs no query and carries the same content-hash version and ETag
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert second.data == first.data == {'version': first.data['version'], **expected}
+    assert second['ETag'] == f'"{first.data["version"]}"'
+    assert stacks.data == expected['stacks']
+
+    # And: revalidating with the ETag answers 304
+    response = client.get(TAXONOMY_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # And: the versioned URL is cacheable forever
+    response = client.get(f'{TAXONOMY_URL}?version={first.data["version"]}')
+    assert 'immutable' in response['Cache-Control']
+    assert 'immutable' not in first['Cache-Control']
+
+    # When: an admin renames a language
+    python.name = 'Python 3'
+    python.save()
+
+    # Then: the taxonomy is served with the new name under a new version
+    response = client.get(TAXONOMY_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+    assert response.status_code == status.HTTP_200_OK
+    assert {'id': python.id, 'name': 'Python 3'} in response.data['languages']
+    assert response.data['version'] != first.data['version']
+
+
+@pytest.mark.django_db
+def test_profile_skills_are_resolved_from_the_taxonomy(client):
+    """
+    Scenario: Submitted stack, level and language ids are checked against the taxonomy
+    Given I am a developer, and stacks, levels and languages exist
+    When I update my profile with a stack, level and languages
+    Then my profile has them
+    When I update my profile with a language that does not exist
+    Then the update is rejected
+    """
+    # Given: I am a developer, and stacks, levels and languages exist
+    CustomUser.objects.create_user(username='developer', email='developer@example.com', password='password123')
+    token = client.post(
+        '/api/auth/jwt/create/', {'email': 'developer@example.com', 'password': 'password123'}
+    ).data['access']
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    rust, _ = ProgLanguage.objects.get_or_create(name='Rust')
+
+    # When: I update my profile with a stack, level and languages
+    response = client.patch(
+        '/api/auth/users/me/',
+        {'stack': backend.id, 'level': junior.id, 'prog_language': [python.id, rust.id]},
+        content_type='application/json',
+    )
+
+    # Then: my profile has them
+    assert response.status_code == status.HTTP_200_OK
+    assert (response.data['stack_name'], response.data['level_name']) == ('Backend', 'Junior')
+    developer = CustomUser.objects.get(username='developer')
+    assert (developer.stack_id, developer.level_id) == (backend.id, junior.id)
+    assert set(developer.prog_language.values_list('id', flat=True)) == {python.id, rust.id}
+
+    # When: I update my profile with a language that does not exist
+    missing_language_id = ProgLanguage.objects.order_by('-id').first().id + 1
+    response = client.patch(
+        '/api/auth/users/me/', {'prog_language': [missing_language_id]}, content_type='application/json'
+    )
+
+    # Then: the update is rejected
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'prog_language' in response.data
+
+
+@pytest.mark.django_db
+def test_taxonomy_snapshot_expires_without_a_shared_generation(client, settings):
+    """
+    Scenario: Processes that miss a change notification still pick it up after the max age
+    Given the taxonomy has been served
+    When a language is renamed without the change reaching this process
+    Then the old name is served until the snapshot is older than SKILLS_TAXONOMY_MAX_AGE
+    """
+    # Given: the taxonomy has been served
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    client.get(TAXONOMY_URL)
+
+    # When: a language is renamed without the change reaching this process
+    ProgLanguage.objects.filter(id=python.id).update(name='Python 3')
+
+    # Then: the old name is served until the snapshot is older than SKILLS_TAXONOMY_MAX_AGE
+    assert {'id': python.id, 'name': 'Python'} in client.get(TAXONOMY_URL).data['languages']
+    settings.SKILLS_TAXONOMY_MAX_AGE = 0
+    assert {'id': python.id, 'name': 'Python 3'} in client.get(TAXONOMY_URL).data['languages']
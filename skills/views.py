@@ -1,22 +1,66 @@
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Stack, Level, ProgLanguage
 from .serializers import StackSerializer, LevelSerializer, ProgLanguageSerializer
+from .taxonomy import get_taxonomy
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
 
-class StackViewSet(viewsets.ReadOnlyModelViewSet):
+
+class TaxonomyListMixin:
+    """Lists are served from the in-process taxonomy instead of querying the table."""
+
+    taxonomy_kind = None
+
+    def list(self, request, *args, **kwargs):
+        return Response(get_taxonomy().payload[self.taxonomy_kind])
+
+
+class StackViewSet(TaxonomyListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Stack.objects.all()
     serializer_class = StackSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    taxonomy_kind = 'stacks'
 
 
-class LevelViewSet(viewsets.ReadOnlyModelViewSet):
+class LevelViewSet(TaxonomyListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Level.objects.all()
     serializer_class = LevelSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    taxonomy_kind = 'levels'
 
 
-class ProgLanguageViewSet(viewsets.ReadOnlyModelViewSet):
+class ProgLanguageViewSet(TaxonomyListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ProgLanguage.objects.all()
     serializer_class = ProgLanguageSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    taxonomy_kind = 'languages'
+
+
+class TaxonomyView(APIView):
+    """
+    Stacks, levels and languages in one response, tagged with a content-hash version.
+
+    Requests for ?version=<current version> are immutable and cached for a year; the plain
+    URL is cached for SKILLS_TAXONOMY_MAX_AGE and revalidated with its ETag.
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request):
+        taxonomy = get_taxonomy()
+        etag = f'"{taxonomy.version}"'
+        response = get_conditional_response(request, etag=etag) or Response(taxonomy.as_dict())
+        response['ETag'] = etag
+        if request.query_params.get('version') == taxonomy.version:
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=settings.SKILLS_TAXONOMY_MAX_AGE)
+        return response
@@ -16,6 +16,7 @@ class CustomUserAdmin(UserAdmin):
             'stack',
             'level',
             'prog_language',
+            'interest_digest',
         )}),
     )
     add_fieldsets = UserAdmin.add_fieldsets + (
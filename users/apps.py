@@ -0,0 +1,17 @@
+import os
+
+from django.apps import AppConfig
+
+
+class UsersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'users'
+
+    def ready(self):
+        from pair_connect.cache import track
+        from pair_connect.email_templates import warm_email_templates
+        from . import signals  # noqa: F401
+        from .models import CustomUser
+
+        track(CustomUser, ignore_update_fields=('last_login',))
+        warm_email_templates(os.path.join(self.path, 'templates'))
@@ -0,0 +1,70 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.scoring import SkillMatrix
+from users.skill_index import DeveloperSkillIndex
+
+
+class Command(BaseCommand):
+    help = "Builds the developer skill index and reports its memory use and rebuild time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            default=None,
+            help="Build from N generated developers instead of the database (e.g. 100000).",
+        )
+        parser.add_argument('--languages', type=int, default=30, help="Languages in the synthetic taxonomy.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--score',
+            type=int,
+            default=0,
+            metavar='RUNS',
+            help="Also time vectorized scoring of a session against every developer, averaged over RUNS.",
+        )
+
+    def handle(self, *args, **options):
+        index = DeveloperSkillIndex()
+
+        if options['synthetic']:
+            rng = random.Random(options['seed'])
+            count = options['synthetic']
+            users = [(user_id, rng.randint(1, 3), rng.randint(1, 3)) for user_id in range(1, count + 1)]
+            languages = [
+                (user_id, language_id)
+                for user_id, _, _ in users
+                for language_id in rng.sample(range(1, options['languages'] + 1), rng.randint(1, 4))
+            ]
+            started = time.perf_counter()
+            index.load(
+                users,
+                languages,
+                stacks=[('Backend', 1), ('Frontend', 2), ('Fullstack', 3)],
+                levels=[('Junior', 1), ('Mid', 2), ('Senior', 3)],
+            )
+            index.build_seconds = time.perf_counter() - started
+        else:
+            index.build()
+
+        stats = index.stats()
+        self.stdout.write(f"Developers indexed: {stats['developers']}")
+        self.stdout.write(f"Languages indexed: {stats['languages']}")
+        self.stdout.write(f"Memory: {stats['memory_bytes'] / (1024 * 1024):.1f} MiB")
+        self.stdout.write(f"Rebuild time: {stats['build_seconds'] * 1000:.0f} ms")
+
+        if options['score']:
+            started = time.perf_counter()
+            matrix = SkillMatrix(index)
+            self.stdout.write(f"Score matrix build: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            language_ids = list(matrix.columns)[:2]
+            started = time.perf_counter()
+            for _ in range(options['score']):
+                scores, _ = matrix.score(language_ids, 1, index.stack_ids(['Backend', 'Fullstack']), {1})
+                matrix.top(scores, 50)
+            elapsed = (time.perf_counter() - started) / options['score']
+            self.stdout.write(f"Vector scoring: {elapsed * 1000:.2f} ms for {matrix.size} developers")
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_alter_customuser_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='interest_digest',
+            field=models.BooleanField(default=False),
+        ),
+    ]
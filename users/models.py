@@ -1,13 +1,31 @@
 from django.db import models
-from skills.models import Stack, Level, ProgLanguage
+from skills.models import Stack, Level, ProgLanguage, languages_by_id
 from cloudinary.models import CloudinaryField
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from pair_connect.fieldsets import only_serialized
 
 
 class CustomUserManager(BaseUserManager):
 
     use_in_migrations = True
 
+    SERIALIZER_COLUMNS = {
+        'id': ('id',),
+        'username': ('username',),
+        'email': ('email',),
+        'name': ('name',),
+        'photo': ('photo',),
+        'about_me': ('about_me',),
+        'telephone': ('telephone',),
+        'linkedin_link': ('linkedin_link',),
+        'github_link': ('github_link',),
+        'discord_link': ('discord_link',),
+        'stack': ('stack',),
+        'level': ('level',),
+        'stack_name': ('stack__name',),
+        'level_name': ('level__name',),
+    }
+
     def _create_user(self, email, password, **extra_fields):
         if not email:
             raise ValueError('El campo email debe ser proporcionado')
@@ -32,6 +50,19 @@ class CustomUserManager(BaseUserManager):
         extra_fields.setdefault('is_superuser', True)
         return self._create_user(email, password, **extra_fields)
 
+    def for_serializer(self, fields=None):
+        """
+        Loads what the developer serializers render. With `fields`, only the columns, joins
+        and prefetches those serializer fields read are loaded.
+        """
+        users = self.get_queryset()
+        if fields is None:
+            return users.select_related('stack', 'level').prefetch_related(languages_by_id('prog_language'))
+        users = only_serialized(users, fields, self.SERIALIZER_COLUMNS, required=('id', 'photo'))
+        if {'prog_language', 'language_names'} & set(fields):
+            users = users.prefetch_related(languages_by_id('prog_language'))
+        return users
+
 
 class CustomUser(AbstractUser):
     name = models.CharField(max_length=255, null=False, blank=False)
@@ -45,6 +76,7 @@ class CustomUser(AbstractUser):
     linkedin_link = models.URLField(max_length=255, null=True, blank=True)
     github_link = models.URLField(max_length=255, null=True, blank=True)
     discord_link = models.URLField(max_length=255, null=True, blank=True)
+    interest_digest = models.BooleanField(default=False)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'name']
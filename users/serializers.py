@@ -1,7 +1,9 @@
 from djoser.serializers import UserCreateSerializer, UserSerializer
 from rest_framework import serializers
 
+from pair_connect.fieldsets import DynamicFieldsMixin
 from skills.models import Level, ProgLanguage, Stack
+from skills.serializers import TaxonomyRelatedField
 
 from .models import CustomUser
 
@@ -50,17 +52,11 @@ class CustomUserCreateSerializer(UserCreateSerializer):
         return user
 
 
-class CustomUserSerializer(UserSerializer):
+class CustomUserSerializer(DynamicFieldsMixin, UserSerializer):
     photo_url = serializers.CharField(source="image.url", read_only=True)
-    stack = serializers.PrimaryKeyRelatedField(
-        queryset=Stack.objects.all(), allow_null=True
-    )
-    level = serializers.PrimaryKeyRelatedField(
-        queryset=Level.objects.all(), allow_null=True
-    )
-    prog_language = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=ProgLanguage.objects.all()
-    )
+    stack = TaxonomyRelatedField("stacks", allow_null=True)
+    level = TaxonomyRelatedField("levels", allow_null=True)
+    prog_language = TaxonomyRelatedField("languages", many=True)
     stack_name = serializers.CharField(source="stack.name", read_only=True)
     level_name = serializers.CharField(source="level.name", read_only=True)
     language_names = serializers.SlugRelatedField(
@@ -138,7 +134,7 @@ class CustomUserSerializer(UserSerializer):
         return representation
 
 
-class PublicDeveloperSerializer(serializers.ModelSerializer):
+class PublicDeveloperSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     stack_name = serializers.CharField(source="stack.name", read_only=True)
     level_name = serializers.CharField(source="level.name", read_only=True)
     language_names = serializers.SlugRelatedField(
@@ -173,7 +169,14 @@ class PublicDeveloperSerializer(serializers.ModelSerializer):
         return representation
 
 
-class PrivateDeveloperSerializer(serializers.ModelSerializer):
+class CurrentUserSerializer(CustomUserSerializer):
+    """The signed-in user's own profile, with their notification preferences."""
+
+    class Meta(CustomUserSerializer.Meta):
+        fields = CustomUserSerializer.Meta.fields + ("interest_digest",)
+
+
+class PrivateDeveloperSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     stack_name = serializers.CharField(source="stack.name", read_only=True)
     level_name = serializers.CharField(source="level.name", read_only=True)
     language_names = serializers.SlugRelatedField(
@@ -1,9 +1,20 @@
 from rest_framework.exceptions import ValidationError
+from pair_connect.cache import memoize
 from projects.models import InterestedParticipant, Session
+from skills.models import Level, ProgLanguage, Stack
 from users.serializers import PrivateDeveloperSerializer, PublicDeveloperSerializer
 from .models import CustomUser
 
 
+def profile_key(service, session=None, fields=None, omit=None):
+    return (
+        str(service.user_id),
+        session.id if session else None,
+        None if fields is None else sorted(fields),
+        None if omit is None else sorted(omit),
+    )
+
+
 class UserProfileService:
     def __init__(self, viewer, user_id):
         """
@@ -13,21 +24,25 @@ class UserProfileService:
         self.viewer = viewer
         self.user_id = user_id
 
-    def get_profile_data(self, session=None):
+    @memoize(CustomUser, InterestedParticipant, Stack, Level, ProgLanguage, key=profile_key)
+    def get_profile_data(self, session=None, fields=None, omit=None):
         """
             Retrieves a user's profile data based on the provided session.
+        The result is cached until a developer, an interest or a skill changes.
         Args:
             session (Session, optional): The session for which the user's interest is checked. Defaults to None.
+            fields (set, optional): Profile fields to return. Defaults to all of them.
+            omit (set, optional): Profile fields to leave out.
         Returns:
             dict: The user's profile data.
         Raises:
             ValidationError: If the user is not found or an error occurs while retrieving the profile data.
         """
         try:
-            user = CustomUser.objects.get(id=self.user_id)
+            user = CustomUser.objects.for_serializer().get(id=self.user_id)
             if not session:
                 return {
-                    "profile_data": PublicDeveloperSerializer(user).data,
+                    "profile_data": PublicDeveloperSerializer(user, fields=fields, omit=omit).data,
                     "has_permission": False,
                 }
 
@@ -41,12 +56,12 @@ class UserProfileService:
 
             if is_interested:
                 return {
-                    "profile_data": PrivateDeveloperSerializer(user).data,
+                    "profile_data": PrivateDeveloperSerializer(user, fields=fields, omit=omit).data,
                     "has_permission": True,
                 }
 
             return {
-                "profile_data": PublicDeveloperSerializer(user).data,
+                "profile_data": PublicDeveloperSerializer(user, fields=fields, omit=omit).data,
                 "has_permission": False,
             }
 
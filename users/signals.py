@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CustomUser
+from .skill_index import saves_skills, skill_index
+
+
+@receiver(post_save, sender=CustomUser)
+def update_skill_index_on_save(sender, instance, update_fields=None, **kwargs):
+    if not saves_skills(update_fields):
+        return
+    transaction.on_commit(
+        lambda: skill_index.update_user(instance.id, instance.stack_id, instance.level_id, instance.is_staff)
+    )
+
+
+@receiver(post_delete, sender=CustomUser)
+def update_skill_index_on_delete(sender, instance, **kwargs):
+    user_id = instance.id
+    transaction.on_commit(lambda: skill_index.remove_user(user_id))
+
+
+@receiver(m2m_changed, sender=CustomUser.prog_language.through)
+def update_skill_index_on_languages_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        if action == 'post_clear':
+            transaction.on_commit(skill_index.invalidate)
+            return
+        language_ids = {instance.pk}
+        user_ids = set(pk_set)
+    else:
+        language_ids = set(pk_set or ())
+        user_ids = {instance.pk}
+
+    def apply():
+        for user_id in user_ids:
+            if action == 'post_add':
+                skill_index.add_languages(user_id, language_ids)
+            elif action == 'post_remove':
+                skill_index.remove_languages(user_id, language_ids)
+            else:
+                skill_index.set_languages(user_id, ())
+
+    transaction.on_commit(apply)
@@ -0,0 +1,299 @@
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from pair_connect.cache import get_generations, renew
+from skills.taxonomy import get_taxonomy
+from .models import CustomUser
+
+GENERATION = 'users.skill_index'
+SKILL_UPDATE_FIELDS = {'stack', 'stack_id', 'level', 'level_id', 'is_staff'}
+
+
+class DeveloperSkillIndex:
+    """
+    In-process index of non-staff developers keyed by stack, level and language id.
+
+    The index is built once per worker from two flat queries and the skills taxonomy, and
+    kept current through the signals in users.signals. Each change also renews the shared
+    GENERATION, so workers that did not apply it rebuild on their next lookup. Lookups intersect sets of user ids
+    instead of joining users_customuser_prog_language on every request. Each developer's
+    languages are stored as an integer bitmask indexed by language id.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._built = False
+            self.built_at = None
+            self.generation = None
+            self.build_seconds = None
+            self.version = 0
+            self._profiles = {}
+            self._by_stack = defaultdict(set)
+            self._by_level = defaultdict(set)
+            self._by_language = defaultdict(set)
+            self._with_languages = set()
+            self._stack_ids_by_name = {}
+            self._level_ids_by_name = defaultdict(set)
+
+    @property
+    def is_built(self):
+        return self._built
+
+    def is_stale(self):
+        """
+        True when the index was never built, missed a change applied by another worker, or is
+        older than SKILL_INDEX_MAX_AGE seconds. The age limit covers cache backends that do
+        not share generations between processes, such as the per-process LocMemCache.
+        """
+        max_age = getattr(settings, 'SKILL_INDEX_MAX_AGE', None)
+        if not self._built or self.generation != get_generations(GENERATION)[0]:
+            return True
+        return max_age is not None and time.monotonic() - self.built_at > max_age
+
+    def ensure_built(self):
+        if self.is_stale():
+            self.build()
+        return self
+
+    def build(self):
+        started = time.perf_counter()
+        generation = get_generations(GENERATION)[0]
+        taxonomy = get_taxonomy()
+        users = CustomUser.objects.filter(is_staff=False).values_list('id', 'stack_id', 'level_id')
+        languages = CustomUser.prog_language.through.objects.filter(
+            customuser__is_staff=False
+        ).values_list('customuser_id', 'proglanguage_id')
+        self.load(
+            users,
+            languages,
+            stacks=[(stack['name'], stack['id']) for stack in taxonomy.payload['stacks']],
+            levels=[(level['name'], level['id']) for level in taxonomy.payload['levels']],
+        )
+        self.generation = generation
+        self.build_seconds = time.perf_counter() - started
+        return self
+
+    def load(self, users, languages, stacks=(), levels=()):
+        """
+        Replaces the index contents with the given rows.
+
+        :param users: iterable of (user_id, stack_id, level_id)
+        :param languages: iterable of (user_id, language_id)
+        :param stacks: iterable of (stack_name, stack_id)
+        :param levels: iterable of (level_name, level_id)
+        """
+        user_languages = defaultdict(set)
+        for user_id, language_id in languages:
+            user_languages[user_id].add(language_id)
+
+        with self._lock:
+            self.reset()
+            for user_id, stack_id, level_id in users:
+                self._add(user_id, stack_id, level_id, language_mask(user_languages.get(user_id, ())))
+            self._stack_ids_by_name = dict(stacks)
+            for name, level_id in levels:
+                self._level_ids_by_name[name].add(level_id)
+            self._built = True
+            self.built_at = time.monotonic()
+
+    def _add(self, user_id, stack_id, level_id, languages):
+        self._profiles[user_id] = (stack_id, level_id, languages)
+        self._by_stack[stack_id].add(user_id)
+        self._by_level[level_id].add(user_id)
+        for language_id in language_ids(languages):
+            self._by_language[language_id].add(user_id)
+        if languages:
+            self._with_languages.add(user_id)
+
+    def _discard(self, user_id):
+        profile = self._profiles.pop(user_id, None)
+        if profile is None:
+            return None
+        stack_id, level_id, languages = profile
+        self._by_stack[stack_id].discard(user_id)
+        self._by_level[level_id].discard(user_id)
+        for language_id in language_ids(languages):
+            self._by_language[language_id].discard(user_id)
+        self._with_languages.discard(user_id)
+        return profile
+
+    def update_user(self, user_id, stack_id, level_id, is_staff=False):
+        if not self._built:
+            renew(GENERATION)
+            return
+        languages = None
+        if not is_staff and user_id not in self._profiles:
+            # New to the index, e.g. a staff user made a developer: their languages were never indexed
+            languages = language_mask(
+                CustomUser.prog_language.through.objects.filter(customuser_id=user_id)
+                .values_list('proglanguage_id', flat=True)
+            )
+        with self._lock:
+            profile = self._discard(user_id)
+            if not is_staff:
+                if profile is not None:
+                    languages = profile[2]
+                self._add(user_id, stack_id, level_id, languages or 0)
+            self._changed(profile, self._profiles.get(user_id))
+
+    def set_languages(self, user_id, ids):
+        self._set_language_mask(user_id, lambda current: language_mask(ids))
+
+    def add_languages(self, user_id, ids):
+        self._set_language_mask(user_id, lambda current: current | language_mask(ids))
+
+    def remove_languages(self, user_id, ids):
+        self._set_language_mask(user_id, lambda current: current & ~language_mask(ids))
+
+    def _set_language_mask(self, user_id, change):
+        if not self._built:
+            renew(GENERATION)
+            return
+        with self._lock:
+            profile = self._discard(user_id)
+            if profile is not None:
+                self._add(user_id, profile[0], profile[1], change(profile[2]))
+            self._changed(profile, self._profiles.get(user_id))
+
+    def remove_user(self, user_id):
+        if not self._built:
+            renew(GENERATION)
+            return
+        with self._lock:
+            self._changed(self._discard(user_id), None)
+
+    def _changed(self, before, after):
+        """
+        Bumps `version` and renews the shared generation when a developer's indexed skills
+        changed.
+        Saves that leave the stack, level and languages alone keep them, so structures derived
+        from the index, such as the scoring matrix, are not rebuilt for them.
+
+        This index adopts the new generation only if it held the previous one; otherwise it
+        missed another worker's change and is rebuilt on the next lookup.
+        """
+        if before == after:
+            return
+        self.version += 1
+        current = self.generation == get_generations(GENERATION)[0]
+        generation = renew(GENERATION)[0]
+        self.generation = generation if current else None
+
+    def invalidate(self):
+        with self._lock:
+            self._built = False
+        renew(GENERATION)
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def __contains__(self, user_id):
+        return user_id in self._profiles
+
+    def profiles(self):
+        """Returns a snapshot list of (user_id, (stack_id, level_id, language_mask))."""
+        with self._lock:
+            return list(self._profiles.items())
+
+    def profile(self, user_id):
+        """Returns (stack_id, level_id, language_mask) for an indexed developer, or None."""
+        return self._profiles.get(user_id)
+
+    def stack_ids(self, stack_names):
+        return {self._stack_ids_by_name[name] for name in stack_names if name in self._stack_ids_by_name}
+
+    def level_ids(self, level_name):
+        if level_name is None:
+            return {None}
+        return set(self._level_ids_by_name.get(level_name, ()))
+
+    def developers(self, stack_ids=None, level_ids=None, language_ids=None, match_all_languages=False):
+        """
+        Returns the ids of developers matching every given criterion.
+
+        :param stack_ids: developers using any of these stacks, None for any stack
+        :param level_ids: developers at any of these levels, None for any level
+        :param language_ids: developers knowing any (or all) of these languages, None for any
+        :param match_all_languages: require every language instead of at least one
+        """
+        with self._lock:
+            groups = []
+            if stack_ids is not None:
+                groups.append(self._union(self._by_stack, stack_ids))
+            if level_ids is not None:
+                groups.append(self._union(self._by_level, level_ids))
+            if language_ids is not None:
+                if match_all_languages:
+                    groups.extend(self._by_language.get(language_id, set()) for language_id in language_ids)
+                else:
+                    groups.append(self._union(self._by_language, language_ids))
+            if not groups:
+                return set(self._profiles)
+            groups.sort(key=len)
+            return set(groups[0]).intersection(*groups[1:])
+
+    def developers_with_languages(self):
+        with self._lock:
+            return set(self._with_languages)
+
+    @staticmethod
+    def _union(buckets, keys):
+        result = set()
+        for key in keys:
+            result |= buckets.get(key, set())
+        return result
+
+    def stats(self):
+        """
+        Reports the number of indexed developers, an estimate of the memory held by
+        the index in bytes and the duration of the last build in seconds.
+        """
+        with self._lock:
+            size = sys.getsizeof(self._profiles) + sys.getsizeof(self._with_languages)
+            for user_id, profile in self._profiles.items():
+                size += sys.getsizeof(user_id) + sys.getsizeof(profile) + sys.getsizeof(profile[2])
+            for buckets in (self._by_stack, self._by_level, self._by_language):
+                size += sys.getsizeof(buckets)
+                size += sum(sys.getsizeof(bucket) for bucket in buckets.values())
+            return {
+                'developers': len(self._profiles),
+                'languages': len(self._by_language),
+                'memory_bytes': size,
+                'build_seconds': self.build_seconds,
+                'version': self.version,
+            }
+
+
+def saves_skills(update_fields):
+    return update_fields is None or bool(SKILL_UPDATE_FIELDS & set(update_fields))
+
+
+def language_mask(ids):
+    mask = 0
+    for language_id in ids:
+        mask |= 1 << language_id
+    return mask
+
+
+def language_ids(mask):
+    ids = []
+    while mask:
+        lowest = mask & -mask
+        ids.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return ids
+
+
+skill_index = DeveloperSkillIndex()
+
+
+def get_skill_index():
+    return skill_index.ensure_built()
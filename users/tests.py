@@ -1,4 +1,10 @@
+from datetime import datetime, timedelta
+
+from projects.models import InterestedParticipant, Project, Session
+from projects.scoring import get_skill_matrix
 from users.models import CustomUser
+from users.skill_index import DeveloperSkillIndex, skill_index
+from skills.models import Level, ProgLanguage, Stack
 import pytest
 from rest_framework import status
 
@@ -319,3 +325,186 @@ def test_user_activation_success(client):
     # Then: The user should be able to log in and receive a JWT token
     assert response.status_code == status.HTTP_200_OK
     assert 'access' in response.data
+
+
+@pytest.mark.django_db
+def test_skill_index_follows_profile_changes(django_capture_on_commit_callbacks):
+    """
+    Scenario: The developer skill index stays current when profiles change
+    Given the skill index has been built
+    When a developer changes their stack, level and languages
+    Then the index answers lookups with the new skills without being rebuilt
+    """
+    # Given: the skill index has been built
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    react, _ = ProgLanguage.objects.get_or_create(name='React')
+    developer = CustomUser.objects.create_user(
+        username='nevillelongbottom', email='neville@email.com', name='Neville Longbottom', stack=backend
+    )
+    index = skill_index.build()
+
+    # When: a developer changes their stack, level and languages
+    with django_capture_on_commit_callbacks(execute=True):
+        developer.stack = frontend
+        developer.level = junior
+        developer.save()
+        developer.prog_language.set([python, react])
+
+    # Then: the index answers lookups with the new skills without being rebuilt
+    assert developer.id in index.developers(
+        stack_ids=index.stack_ids(['Frontend', 'Fullstack']),
+        level_ids=index.level_ids('Junior'),
+        language_ids=[python.id, react.id],
+        match_all_languages=True,
+    )
+    assert developer.id not in index.developers(stack_ids=index.stack_ids(['Backend']))
+    skill_index.reset()
+
+
+@pytest.mark.django_db
+def test_skill_index_keeps_languages_of_staff_made_developers(django_capture_on_commit_callbacks):
+    """
+    Scenario: A staff user who becomes a developer is indexed with their languages
+    Given a staff user who knows Python, and the skill index has been built
+    When they stop being staff
+    Then the index finds them by their languages
+    """
+    # Given: a staff user who knows Python, and the skill index has been built
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    staff = CustomUser.objects.create_user(username='minerva', email='minerva@email.com', is_staff=True)
+    staff.prog_language.add(python)
+    index = skill_index.build()
+    assert staff.id not in index
+
+    # When: they stop being staff
+    with django_capture_on_commit_callbacks(execute=True):
+        staff.is_staff = False
+        staff.save()
+
+    # Then: the index finds them by their languages
+    assert staff.id in index.developers(language_ids=[python.id])
+    skill_index.reset()
+
+
+@pytest.mark.django_db
+def test_skill_index_follows_changes_applied_by_other_workers(django_capture_on_commit_callbacks):
+    """
+    Scenario: Workers rebuild their skill index after another worker applied a change
+    Given two workers have built the skill index
+    When a developer changes their stack through the first worker
+    Then the first worker's index stays current without a rebuild
+    And the second worker's index is stale, and finds the developer by their new stack once rebuilt
+    """
+    # Given: two workers have built the skill index
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    developer = CustomUser.objects.create_user(username='ginny', email='ginny@email.com', stack=backend)
+    index = skill_index.build()
+    other_worker = DeveloperSkillIndex().build()
+
+    # When: a developer changes their stack through the first worker
+    with django_capture_on_commit_callbacks(execute=True):
+        developer.stack = frontend
+        developer.save()
+
+    # Then: the first worker's index stays current without a rebuild
+    assert not index.is_stale()
+    assert developer.id in index.developers(stack_ids=index.stack_ids(['Frontend']))
+
+    # And: the second worker's index is stale, and finds the developer by their new stack once rebuilt
+    assert other_worker.is_stale()
+    other_worker.ensure_built()
+    assert developer.id in other_worker.developers(stack_ids=other_worker.stack_ids(['Frontend']))
+    skill_index.reset()
+
+
+@pytest.mark.django_db
+def test_profile_data_is_cached_until_the_developer_or_an_interest_changes(client, django_assert_num_queries):
+    """
+    Scenario: Profiles are served from the cache until what they render changes
+    Given a developer's profile has been viewed
+    When I view it again
+    Then only my authentication is queried
+    When the developer edits their profile
+    Then I see the change
+    When the developer shows interest in my session
+    Then I see their private profile for that session
+    """
+    # Given: a developer's profile has been viewed
+    viewer = CustomUser.objects.create_user(username='host', email='host@email.com', password='password123')
+    developer = CustomUser.objects.create_user(
+        username='lunalovegood', email='luna@email.com', name='Luna Lovegood', about_me='Quibbler editor'
+    )
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    project = Project.objects.create(owner=viewer, name='Quidditch stats', stack=backend, level=junior)
+    session = Session.objects.create(
+        project=project, host=viewer, stack=backend, level=junior, schedule_date_time=datetime.now() + timedelta(days=1)
+    )
+    token = client.post('/api/auth/jwt/create/', {'email': viewer.email, 'password': 'password123'}).data['access']
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    url = f'/api/users/{developer.id}/profile/'
+    client.get(url)
+
+    # When: I view it again
+    with django_assert_num_queries(1):
+        response = client.get(url)
+
+    # Then: only my authentication is queried
+    assert response.data['profile_data']['about_me'] == 'Quibbler editor'
+
+    # When: the developer edits their profile
+    developer.about_me = 'Naturalist'
+    developer.save()
+
+    # Then: I see the change
+    assert client.get(url).data['profile_data']['about_me'] == 'Naturalist'
+
+    # When: the developer shows interest in my session
+    session_url = f'/api/users/{developer.id}/profile/{session.id}/'
+    assert client.get(session_url).data['has_permission'] is False
+    InterestedParticipant.objects.create(user=developer, session=session)
+
+    # Then: I see their private profile for that session
+    assert client.get(session_url).data['has_permission'] is True
+
+
+@pytest.mark.django_db
+def test_skill_matrix_is_rebuilt_only_when_skills_change(django_capture_on_commit_callbacks):
+    """
+    Scenario: Profile edits that keep a developer's skills do not rebuild the scoring matrix
+    Given the skill index and its scoring matrix have been built
+    When a developer edits their about me and saves their languages unchanged
+    Then the same matrix is reused
+    When the developer changes their stack
+    Then the matrix is rebuilt
+    """
+    # Given: the skill index and its scoring matrix have been built
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    developer = CustomUser.objects.create_user(username='hermione', email='hermione@email.com', stack=backend)
+    developer.prog_language.add(python)
+    index = skill_index.build()
+    matrix = get_skill_matrix(index)
+
+    # When: a developer edits their about me and saves their languages unchanged
+    with django_capture_on_commit_callbacks(execute=True):
+        developer.about_me = 'Top of the class'
+        developer.save()
+        developer.prog_language.add(python)
+
+    # Then: the same matrix is reused
+    assert get_skill_matrix(index) is matrix
+
+    # When: the developer changes their stack
+    with django_capture_on_commit_callbacks(execute=True):
+        developer.stack = frontend
+        developer.save()
+
+    # Then: the matrix is rebuilt
+    assert get_skill_matrix(index) is not matrix
+    skill_index.reset()
@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
+from pair_connect.fieldsets import parse_field_names
 from projects.models import Session
 from .services import UserProfileService
 
@@ -61,7 +62,11 @@ class UserProfileView(APIView):
                 session = Session.objects.get(id=session_id)
 
             profile_service = UserProfileService(request.user, user_id)
-            result = profile_service.get_profile_data(session)
+            result = profile_service.get_profile_data(
+                session,
+                fields=parse_field_names(request.query_params.get("fields")),
+                omit=parse_field_names(request.query_params.get("omit")),
+            )
 
             return Response(result, status=status.HTTP_200_OK)
 